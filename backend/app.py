@@ -33,6 +33,10 @@ def create_app(config_class=active_config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Serialize JSON responses with orjson instead of the stdlib encoder
+    from utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # Configure logging
     from utils.logging_config import setup_logging, add_request_logging
     setup_logging(
@@ -105,6 +109,14 @@ def create_app(config_class=active_config):
     app.register_blueprint(cardano_bp)  # Cardano routes have their own url_prefix
     app.register_blueprint(blockchain_bp, url_prefix='/api')
 
+    # Per-worker receipt poller and contract event listener
+    if not app.config.get('TESTING') and os.environ.get('BLOCKCHAIN_BACKGROUND_TASKS', 'true').lower() == 'true':
+        try:
+            from services.blockchain_service import start_background_tasks
+            start_background_tasks()
+        except Exception as e:
+            app.logger.warning(f"Blockchain background tasks not started: {e}")
+
     # Enhanced error handlers
     @app.errorhandler(400)
     def bad_request(e):
@@ -338,4 +350,4 @@ def create_app(config_class=active_config):
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)
\ No newline at end of file
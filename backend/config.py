@@ -9,6 +9,10 @@ class Config:
     # Core Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-please-change-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        # Compiled SQL cache; sized for the repeated query shapes of hot routes
+        'query_cache_size': int(os.environ.get('SQLALCHEMY_QUERY_CACHE_SIZE', 1200))
+    }
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-dev-key-change-in-production')
@@ -41,6 +45,11 @@ class Config:
     MAX_LOG_SIZE = int(os.environ.get('MAX_LOG_SIZE', 10 * 1024 * 1024))  # 10MB
     LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
     
+    # User IDs allowed to use admin endpoints (e.g. batch identity creation)
+    ADMIN_USER_IDS = frozenset(
+        int(user_id) for user_id in os.environ.get('ADMIN_USER_IDS', '').split(',') if user_id.strip()
+    )
+    
     # Feature Flags
     FEATURE_WALLET_AUTH = os.environ.get('FEATURE_WALLET_AUTH', 'true').lower() == 'true'
     FEATURE_METTA_INTEGRATION = os.environ.get('FEATURE_METTA_INTEGRATION', 'true').lower() == 'true'
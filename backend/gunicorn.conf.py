@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for the Nimo backend.
+
+Gunicorn picks this file up automatically when started from the backend
+directory:
+
+    gunicorn run:app
+
+Identity and verification endpoints spend most of their time waiting on
+MeTTa and RPC calls, so each worker runs a thread pool (``gthread``) and
+requests no longer head-of-line block each other behind a single thread.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:5000')
+
+# One worker per core, each serving requests from its own thread pool.
+# Set GUNICORN_WORKER_CLASS=gevent (requires ``pip install gevent``) to
+# serve I/O-bound traffic from greenlets instead: RPC, HTTP and MeTTa
+# subprocess waits then yield cooperatively, so a worker can hold
+# GUNICORN_WORKER_CONNECTIONS in-flight requests without any handler
+# being rewritten as async.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Verification requests can wait on slow MeTTa/RPC backends
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+keepalive = 5
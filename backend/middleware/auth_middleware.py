@@ -127,6 +127,16 @@ def get_current_user():
     """
     return getattr(g, 'current_user', None)
 
+def current_uid():
+    """
+    Helper function to get the authenticated user's ID as an int.
+    The JWT identity is parsed once per request and kept on g.
+    """
+    uid = g.get('_uid')
+    if uid is None:
+        uid = g._uid = int(get_jwt_identity())
+    return uid
+
 def is_authenticated():
     """
     Helper function to check if a user is currently authenticated.
@@ -33,4 +33,20 @@ def get_contract_addresses():
     else:
         return jsonify({'error': f'Unknown network: {network}'}), 400
 
-    return jsonify(contracts)
\ No newline at end of file
+    return jsonify(contracts)
+
+
+@blockchain_bp.route('/blockchain/health', methods=['GET'])
+def get_blockchain_health():
+    """Report RPC connectivity and connection pool usage"""
+    try:
+        from services.blockchain_service import get_blockchain_service
+        service = get_blockchain_service()
+        return jsonify({
+            'network': service.network,
+            'connected': service.is_connected(),
+            'connection_pool': service.get_connection_pool_stats()
+        })
+    except Exception as e:
+        current_app.logger.error("Blockchain health check failed: %s", e)
+        return jsonify({'error': 'Blockchain service unavailable'}), 503
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import asyncio
 import datetime
+import functools
+import hashlib
 
 from app import db
 from models.contribution import Contribution, Verification
@@ -9,14 +11,22 @@ from models.user import User, Token, TokenTransaction
 from models.bond import BlockchainTransaction
 from services.token_service import award_tokens_for_verification
 from services.metta_integration_enhanced import get_metta_service
+from utils.cache import TTLCache
+from utils.serialization import dumps_bytes
 
 # Create blueprint
 contribution_bp = Blueprint('contribution', __name__, url_prefix='/api/contributions')
 
+# Eager-load verifications for handlers that serialize them
+_WITH_VERIFICATIONS = [db.selectinload(Contribution.verifications)]
+
+# Encoded analytics payloads keyed on (user_id, period), stored with their ETag
+_ANALYTICS_CACHE = TTLCache(maxsize=256, ttl=60)
+
 # Optional blockchain imports - if not available, skip blockchain features
 try:
-    from services.blockchain_service import BlockchainService
-    from services.metta_blockchain_bridge import MeTTaBlockchainBridge
+    from services.blockchain_service import get_blockchain_service
+    from services.metta_blockchain_bridge import get_metta_blockchain_bridge
     BLOCKCHAIN_AVAILABLE = True
 except ImportError:
     BLOCKCHAIN_AVAILABLE = False
@@ -140,7 +150,7 @@ def get_contributions():
         return response, 200
         
     except Exception as e:
-        current_app.logger.error(f"Error getting contributions: {e}")
+        current_app.logger.error("Error getting contributions: %s", e)
         return jsonify({"error": "Failed to retrieve contributions"}), 500
 
 
@@ -189,7 +199,7 @@ def add_contribution():
         return jsonify({"error": "Validation failed", "details": validation_errors}), 400
     
     # Rate limiting check (simple implementation)
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if user and _check_rate_limit(user, 'contribution_creation'):
         return jsonify({"error": "Rate limit exceeded. Please wait before creating another contribution"}), 429
     
@@ -213,13 +223,13 @@ def add_contribution():
         db.session.add(new_contribution)
         db.session.commit()
         
-        current_app.logger.info(f"New contribution created by user {current_user_id}: {title}")
+        current_app.logger.info("New contribution created by user %s: %s", current_user_id, title)
         
         return jsonify(new_contribution.to_dict()), 201
     
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Error creating contribution: {e}")
+        current_app.logger.error("Error creating contribution: %s", e)
         return jsonify({"error": "Failed to create contribution"}), 500
 
 
@@ -258,7 +268,7 @@ def _check_rate_limit(user, action_type):
 @contribution_bp.route('/<int:contrib_id>', methods=['GET'])
 @jwt_required()
 def get_contribution(contrib_id):
-    contribution = Contribution.query.get(contrib_id)
+    contribution = db.session.get(Contribution, contrib_id, options=_WITH_VERIFICATIONS)
     
     if not contribution:
         return jsonify({"error": "Contribution not found"}), 404
@@ -273,13 +283,13 @@ def explain_verification(contrib_id):
     current_user_id = int(get_jwt_identity())  # Convert string to int
     
     # Get contribution
-    contribution = Contribution.query.get(contrib_id)
+    contribution = db.session.get(Contribution, contrib_id, options=_WITH_VERIFICATIONS)
     if not contribution:
         return jsonify({"error": "Contribution not found"}), 404
     
     # Check if user has permission to view the explanation
     if contribution.user_id != current_user_id:
-        user = User.query.get(current_user_id)
+        user = db.session.get(User, current_user_id)
         if not user or not getattr(user, 'has_verification_permission', lambda: True)():
             return jsonify({"error": "Unauthorized"}), 403
     
@@ -369,12 +379,12 @@ async def verify_contribution(contrib_id):
     data = request.get_json()
     
     # Check if user has permission to verify contributions
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user or not getattr(user, 'has_verification_permission', lambda: True)():
         return jsonify({"error": "Unauthorized"}), 403
     
     # Get contribution
-    contribution = Contribution.query.get(contrib_id)
+    contribution = db.session.get(Contribution, contrib_id)
     if not contribution:
         return jsonify({"error": "Contribution not found"}), 404
     
@@ -388,15 +398,12 @@ async def verify_contribution(contrib_id):
             metta_integration = get_metta_service()
             
             # Initialize blockchain services if available
-            blockchain_service = None
             bridge = None
             if BLOCKCHAIN_AVAILABLE:
                 try:
-                    blockchain_service = BlockchainService()
-                    metta_service = get_metta_service()
-                    bridge = MeTTaBlockchainBridge(blockchain_service, metta_service)
+                    bridge = get_metta_blockchain_bridge()
                 except Exception as e:
-                    current_app.logger.warning(f"Blockchain service initialization failed: {e}")
+                    current_app.logger.warning("Blockchain service initialization failed: %s", e)
             
             # First use the new integration to validate the contribution
             evidence_dict = contribution.evidence_dict or {}
@@ -432,7 +439,7 @@ async def verify_contribution(contrib_id):
                     # Merge blockchain results with MeTTa results
                     result.update(blockchain_result)
                 except Exception as e:
-                    current_app.logger.warning(f"Blockchain verification failed: {e}")
+                    current_app.logger.warning("Blockchain verification failed: %s", e)
                     # Continue with MeTTa-only results
             
             # Merge the results
@@ -551,7 +558,7 @@ async def batch_verify_contributions():
     data = request.get_json()
     
     # Check if user has permission to verify contributions
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user or not getattr(user, 'has_verification_permission', lambda: True)():
         return jsonify({"error": "Unauthorized"}), 403
     
@@ -575,11 +582,9 @@ async def batch_verify_contributions():
             bridge = None
             if BLOCKCHAIN_AVAILABLE:
                 try:
-                    metta_service = get_metta_service()
-                    blockchain_service = BlockchainService()
-                    bridge = MeTTaBlockchainBridge(blockchain_service, metta_service)
+                    bridge = get_metta_blockchain_bridge()
                 except Exception as e:
-                    current_app.logger.warning(f"Blockchain services not available for batch processing: {e}")
+                    current_app.logger.warning("Blockchain services not available for batch processing: %s", e)
             
             if not bridge:
                 return jsonify({"error": "Blockchain integration required for batch verification"}), 400
@@ -587,9 +592,9 @@ async def batch_verify_contributions():
             # Prepare batch data
             verification_batch = []
             for contrib_id in contribution_ids:
-                contribution = Contribution.query.get(contrib_id)
+                contribution = db.session.get(Contribution, contrib_id)
                 if contribution:
-                    user = User.query.get(contribution.user_id)
+                    user = db.session.get(User, contribution.user_id)
                     verification_batch.append({
                         'user_id': contribution.user_id,
                         'contribution_id': contrib_id,
@@ -637,7 +642,7 @@ async def batch_verify_contributions():
     
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Batch verification error: {e}")
+        current_app.logger.error("Batch verification error: %s", e)
         return jsonify({"error": "Batch verification failed"}), 500
 
 
@@ -652,7 +657,7 @@ def get_contribution_analytics():
     user_filter = request.args.get('user_id')
     
     # Check if user has permission to view analytics
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
@@ -661,85 +666,115 @@ def get_contribution_analytics():
         if not getattr(user, 'has_admin_permission', lambda: False)():
             return jsonify({"error": "Unauthorized"}), 403
     
+    target_user_id = int(user_filter) if user_filter else current_user_id
+    
     try:
-        # Base query for contributions
-        query = Contribution.query
-        if user_filter:
-            query = query.filter_by(user_id=user_filter)
-        else:
-            query = query.filter_by(user_id=current_user_id)
-        
-        # Apply time filter
-        if time_period != 'all':
-            import datetime
-            days_map = {'7d': 7, '30d': 30, '90d': 90}
-            days = days_map.get(time_period, 30)
-            cutoff_date = datetime.datetime.utcnow() - datetime.timedelta(days=days)
-            query = query.filter(Contribution.created_at >= cutoff_date)
-        
-        # Calculate analytics
-        contributions = query.all()
-        total_contributions = len(contributions)
-        verified_contributions = len([c for c in contributions if c.verifications])
-        verification_rate = (verified_contributions / total_contributions) if total_contributions > 0 else 0
-        
-        # Calculate by type
-        by_type = {}
-        for contrib in contributions:
-            contrib_type = getattr(contrib, 'contribution_type', 'other') or 'other'
-            by_type[contrib_type] = by_type.get(contrib_type, 0) + 1
-        
-        # Calculate by impact
-        by_impact = {}
-        for contrib in contributions:
-            impact_level = getattr(contrib, 'impact_level', 'moderate') or 'moderate'
-            by_impact[impact_level] = by_impact.get(impact_level, 0) + 1
-        
-        # Get MeTTa analytics if enabled
-        metta_analytics = None
-        if current_app.config.get('USE_METTA_REASONING', False):
-            try:
-                metta_service = get_metta_service()
-                
-                analytics = {}
-                if hasattr(metta_service, 'get_verification_stats'):
-                    analytics['verification_stats'] = metta_service.get_verification_stats()
-                
-                if BLOCKCHAIN_AVAILABLE:
-                    try:
-                        blockchain_service = BlockchainService()
-                        if hasattr(blockchain_service, 'get_network_info'):
-                            analytics['network_info'] = blockchain_service.get_network_info()
-                    except Exception:
-                        pass
-                
-                metta_analytics = analytics if analytics else None
-            except Exception as e:
-                current_app.logger.warning(f"Could not get MeTTa analytics: {e}")
-        
-        analytics_data = {
-            'summary': {
-                'total_contributions': total_contributions,
-                'verified_contributions': verified_contributions,
-                'verification_rate': round(verification_rate, 3),
-                'time_period': time_period
-            },
-            'by_type': by_type,
-            'by_impact': by_impact,
-            'metta_analytics': metta_analytics,
-            'generated_at': datetime.datetime.utcnow().isoformat()
-        }
+        # Serve the encoded payload from cache when this user/period was just computed
+        cache_key = (target_user_id, time_period)
+        cached = _ANALYTICS_CACHE.get(cache_key)
+        if cached is None:
+            payload = dumps_bytes(_compute_contribution_analytics(target_user_id, time_period))
+            cached = (hashlib.sha1(payload).hexdigest(), payload)
+            _ANALYTICS_CACHE[cache_key] = cached
         
-        # Add cache headers
-        response = jsonify(analytics_data)
+        etag, payload = cached
+        response = current_app.response_class(payload, mimetype='application/json')
+        response.set_etag(etag)
         response.headers['Cache-Control'] = 'private, max-age=600'  # 10 minutes cache
-        return response, 200
+        return response.make_conditional(request)
     
     except Exception as e:
-        current_app.logger.error(f"Analytics error: {e}")
+        current_app.logger.error("Analytics error: %s", e)
         return jsonify({"error": "Failed to generate analytics"}), 500
 
 
+@functools.lru_cache(maxsize=None)
+def _analytics_statement():
+    """
+    Build the analytics aggregate once; user_id and cutoff are bound per call.
+    
+    Counts contributions per (type, impact) and how many of them have at
+    least one verification, all in a single GROUP BY query.
+    """
+    is_verified = db.case((Contribution.verifications.any(), 1), else_=0)
+    return db.select(
+        Contribution.contribution_type,
+        Contribution.impact_level,
+        db.func.count(Contribution.id),
+        db.func.sum(is_verified)
+    ).where(
+        Contribution.user_id == db.bindparam('user_id'),
+        Contribution.created_at >= db.bindparam('cutoff')
+    ).group_by(Contribution.contribution_type, Contribution.impact_level)
+
+
+def _compute_contribution_analytics(user_id, time_period):
+    """Aggregate contribution analytics for a user over a time period"""
+    # Resolve the time window; "all" counts from the beginning of time
+    if time_period != 'all':
+        days_map = {'7d': 7, '30d': 30, '90d': 90}
+        days = days_map.get(time_period, 30)
+        cutoff_date = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    else:
+        cutoff_date = datetime.datetime.min
+    
+    rows = db.session.execute(
+        _analytics_statement(), {'user_id': user_id, 'cutoff': cutoff_date}
+    ).all()
+    
+    # Fold the grouped counts into the summary and breakdowns
+    total_contributions = 0
+    verified_contributions = 0
+    by_type = {}
+    by_impact = {}
+    for contrib_type, impact_level, count, verified_count in rows:
+        total_contributions += count
+        verified_contributions += verified_count or 0
+        contrib_type = contrib_type or 'other'
+        impact_level = impact_level or 'moderate'
+        by_type[contrib_type] = by_type.get(contrib_type, 0) + count
+        by_impact[impact_level] = by_impact.get(impact_level, 0) + count
+    
+    verification_rate = (verified_contributions / total_contributions) if total_contributions > 0 else 0
+    
+    # Get MeTTa analytics if enabled
+    metta_analytics = None
+    if current_app.config.get('USE_METTA_REASONING', False):
+        try:
+            metta_service = get_metta_service()
+            
+            analytics = {}
+            if hasattr(metta_service, 'get_verification_stats'):
+                analytics['verification_stats'] = metta_service.get_verification_stats()
+            
+            if BLOCKCHAIN_AVAILABLE:
+                try:
+                    blockchain_service = get_blockchain_service()
+                    if hasattr(blockchain_service, 'get_network_info'):
+                        analytics['network_info'] = blockchain_service.get_network_info()
+                except Exception:
+                    pass
+            
+            metta_analytics = analytics if analytics else None
+        except Exception as e:
+            current_app.logger.warning("Could not get MeTTa analytics: %s", e)
+    
+    analytics_data = {
+        'summary': {
+            'total_contributions': total_contributions,
+            'verified_contributions': verified_contributions,
+            'verification_rate': round(verification_rate, 3),
+            'time_period': time_period
+        },
+        'by_type': by_type,
+        'by_impact': by_impact,
+        'metta_analytics': metta_analytics,
+        'generated_at': datetime.datetime.utcnow().isoformat()
+    }
+    
+    return analytics_data
+
+
 @contribution_bp.route('/verification-report/<int:contrib_id>', methods=['GET'])
 @jwt_required() 
 def get_verification_report(contrib_id):
@@ -747,22 +782,29 @@ def get_verification_report(contrib_id):
     current_user_id = int(get_jwt_identity())  # Convert string to int
     
     # Get contribution
-    contribution = Contribution.query.get(contrib_id)
+    contribution = db.session.get(Contribution, contrib_id, options=_WITH_VERIFICATIONS)
     if not contribution:
         return jsonify({"error": "Contribution not found"}), 404
     
-    # Check permissions
-    user = User.query.get(current_user_id)
-    if contribution.user_id != current_user_id and not getattr(user, 'has_verification_permission', lambda: False)():
-        return jsonify({"error": "Unauthorized"}), 403
+    # Check permissions - owners can always see their own report, so the
+    # user row is only loaded when someone else is asking
+    if contribution.user_id != current_user_id:
+        user = db.session.get(User, current_user_id)
+        if not getattr(user, 'has_verification_permission', lambda: False)():
+            return jsonify({"error": "Unauthorized"}), 403
+    
+    # A client holding the current ETag gets a 304 without the report being
+    # regenerated (and without touching the MeTTa bridge)
+    etag = _verification_report_etag(contribution)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
     
     try:
         # Generate comprehensive report
         if current_app.config.get('USE_METTA_REASONING', False):
-            metta_service = get_metta_service()
-            blockchain_service = BlockchainService()
-            bridge = MeTTaBlockchainBridge(blockchain_service, metta_service)
-            
+            bridge = get_metta_blockchain_bridge()
             report = bridge.generate_verification_report(contrib_id)
         else:
             # Generate basic report without MeTTa
@@ -786,8 +828,18 @@ def get_verification_report(contrib_id):
                 'generated_at': datetime.datetime.utcnow().isoformat()
             }
         
-        return jsonify(report), 200
+        response = jsonify(report)
+        response.set_etag(etag)
+        return response, 200
     
     except Exception as e:
-        current_app.logger.error(f"Report generation error: {e}")
-        return jsonify({"error": "Failed to generate verification report"}), 500
\ No newline at end of file
+        current_app.logger.error("Report generation error: %s", e)
+        return jsonify({"error": "Failed to generate verification report"}), 500
+
+
+def _verification_report_etag(contribution):
+    """Build a report ETag from the contribution's modification stamps"""
+    stamps = [contribution.created_at] + [v.verified_at for v in contribution.verifications]
+    latest = max((stamp for stamp in stamps if stamp), default=None)
+    latest_ts = int(latest.timestamp()) if latest else 0
+    return f"{contribution.id}-{len(contribution.verifications)}-{latest_ts}"
@@ -5,16 +5,27 @@ These endpoints handle DID (Decentralized Identifier) verification,
 identity linking, and enhanced contribution verification with identity trust.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from typing import Dict, Any
+import hashlib
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from services.metta_integration_enhanced import get_metta_service
-from services.did_verification import DIDVerificationError
+from services.did_verification import DIDVerifier, DIDVerificationError, MemoizedResolver
 from services.metta_security import MeTTaSecurityError
-from services.blockchain_service import BlockchainService
+from services.metta_runner import prepare_query, run_metta_query_prepared
+from services.blockchain_service import get_blockchain_service
+from utils.background import get_job, submit_job
+from utils.cache import TTLCache, ValidationCache
+from utils.serialization import json_response, dumps_bytes
 from app import db
+from middleware.auth_middleware import current_uid
+from models.contribution import Contribution
+from models.user import User
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -28,9 +39,127 @@ metta_integration = get_metta_service()
 # Initialize blockchain service with error handling
 blockchain_service = None
 try:
-    blockchain_service = BlockchainService()
+    blockchain_service = get_blockchain_service()
 except Exception as e:
-    logger.warning(f"Blockchain service initialization failed: {e}. NFT minting will be disabled.")
+    logger.warning("Blockchain service initialization failed: %s. NFT minting will be disabled.", e)
+
+# MeTTa query templates for identity trust scoring, bound to a user ID
+prepare_query('identity_has_did', '!(HasVerifiedDID $uid)', ['uid'])
+prepare_query('identity_trust_score', '!(IdentityTrustScore $uid)', ['uid'])
+prepare_query('identity_reputation_bonus', '!(IdentityReputationBonus $uid)', ['uid'])
+prepare_query('identity_did_method', '!(DIDVerification $uid $_ $method)', ['uid'])
+
+# Worker pool for running independent MeTTa queries concurrently; each query
+# is a separate REPL subprocess, so threads overlap their wall time
+_metta_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='metta-query')
+_METTA_QUERY_TIMEOUT = 10
+_USER_ID_PATTERN = re.compile(r'[\w:.-]{1,128}')
+
+# Seconds clients may reuse an identity record before revalidating
+_IDENTITY_MAX_AGE = 30
+
+# User IDs known to have no verified DID; cleared for a user once they verify one
+_NO_DID_CACHE = TTLCache(maxsize=100_000, ttl=600)
+
+# Recent trust-score query results per user ID:
+# (has_did, trust_score, reputation_bonus, identity_method)
+_TRUST_CACHE = TTLCache(maxsize=10_000, ttl=60)
+
+# Striped locks so concurrent misses for one user run the MeTTa queries once
+# (a fixed set, so the lock table doesn't grow with the number of users)
+_TRUST_LOCKS = [threading.Lock() for _ in range(64)]
+
+# Successful ENS verifications keyed by lowercased name; ENS records change
+# rarely, so repeat lookups are served without an Ethereum RPC round trip
+_ENS_CACHE = TTLCache(maxsize=50_000, ttl=300)
+_ens_stats_lock = threading.Lock()
+_ens_stats = {"hits": 0, "misses": 0}
+
+# Identities minted per batchCreateIdentity transaction
+_IDENTITY_MINT_BATCH_SIZE = 50
+
+# The supported-methods payload is static for the process lifetime,
+# so encode it once instead of rebuilding it on every request
+_SUPPORTED_METHODS_BODY = dumps_bytes({
+    "success": True,
+    "data": {
+        "supported_methods": DIDVerifier.SUPPORTED_METHODS,
+        "did_resolvers": DIDVerifier.DID_RESOLVERS,
+        "features": [
+            "DID document resolution",
+            "ENS name resolution",
+            "Cryptographic proof validation",
+            "MeTTa reasoning integration",
+            "Identity trust scoring"
+        ]
+    }
+})
+_SUPPORTED_METHODS_ETAG = hashlib.blake2b(_SUPPORTED_METHODS_BODY, digest_size=8).hexdigest()
+_SUPPORTED_METHODS_HEADERS = {
+    'ETag': f'"{_SUPPORTED_METHODS_ETAG}"',
+    # Only changes on deploy, so let browsers and proxies keep it for a day
+    'Cache-Control': 'public, max-age=86400, immutable'
+}
+
+
+@identity_bp.before_request
+def _create_validation_cache():
+    """Give each request its own small cache of MeTTa validation results"""
+    g.validation_cache = ValidationCache(maxsize=16)
+
+
+def _ok(data: Any, status: int = 200):
+    """Build a successful ``{"success": true, "data": ...}`` response"""
+    return json_response({"success": True, "data": data}, status)
+
+
+def _err(message: str, status: int):
+    """Build a failed ``{"success": false, "error": ...}`` response"""
+    return json_response({"success": False, "error": message}, status)
+
+
+def _identity_etag(user_id: int, updated_at) -> str:
+    """ETag for a user's identity record, derived from its modification stamp"""
+    stamp = updated_at.timestamp() if updated_at else 0
+    return hashlib.blake2b(f"{user_id}:{stamp}".encode(), digest_size=8).hexdigest()
+
+
+def _cacheable(response, etag: str, max_age: int):
+    """Mark a per-user GET response as privately cacheable and revalidatable"""
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+def _not_modified(etag: str, max_age: int):
+    """Build an empty 304 response for a matching If-None-Match"""
+    return _cacheable(current_app.response_class(status=304), etag, max_age)
+
+def _contribution_exists(contribution_id: Any) -> bool:
+    """Check for a contribution with a single-column EXISTS query"""
+    try:
+        contribution_pk = int(contribution_id)
+    except (TypeError, ValueError):
+        return False
+    
+    return db.session.query(
+        db.session.query(Contribution.id).filter_by(id=contribution_pk).exists()
+    ).scalar()
+
+
+def _mint_identity_nft(username: str, metadata_uri: str, wallet_address: str) -> Dict[str, Any]:
+    """Background job: mint the identity NFT and return its transaction hash"""
+    nft_tx_hash = blockchain_service.create_identity_on_chain(
+        username=username,
+        metadata_uri=metadata_uri,
+        user_address=wallet_address
+    )
+    if not nft_tx_hash:
+        raise RuntimeError("Failed to create NFT identity on blockchain")
+    
+    logger.info("NFT identity created with tx hash: %s", nft_tx_hash)
+    return {"nft_tx_hash": nft_tx_hash}
 
 
 @identity_bp.route('/create', methods=['POST'])
@@ -54,48 +183,44 @@ def create_identity():
             "identity_id": 123,
             "did": "did:nimo:...",
             "created_at": "2023-...",
+            "nft_mint_status": "pending",
+            "nft_job_id": "9f1c...",
             "metta_atoms": [...]
         }
     }
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        data = request.get_json()
+        current_user_id = current_uid()
+        data = request.get_json(silent=True) or {}
 
         # Validate required fields
         required_fields = ['username', 'metadata_uri', 'did']
         for field in required_fields:
             if not data.get(field):
-                return jsonify({
-                    "success": False,
-                    "error": f"Missing required field: {field}"
-                }), 400
+                return _err(f"Missing required field: {field}", 400)
 
         username = data['username']
         metadata_uri = data['metadata_uri']
         did = data['did']
         wallet_address = data.get('wallet_address')
 
-        # Check if username or DID already exists
-        from models.user import User
-        existing_user = User.query.filter(
-            (User.name == username) |
-            (User.wallet_address == wallet_address if wallet_address else False)
-        ).first()
+        # Check if username or wallet address already belongs to someone else.
+        # Only probe the wallet column when an address was supplied, and
+        # select just the ID so no full User row is hydrated.
+        conditions = [User.name == username]
+        if wallet_address:
+            conditions.append(User.wallet_address == wallet_address)
+        existing_user_id = db.session.query(User.id).filter(
+            db.or_(*conditions), User.id != current_user_id
+        ).limit(1).scalar()
 
-        if existing_user and existing_user.id != current_user_id:
-            return jsonify({
-                "success": False,
-                "error": "Username or wallet address already exists"
-            }), 409
+        if existing_user_id is not None:
+            return _err("Username or wallet address already exists", 409)
 
         # Update user with identity information
-        user = User.query.get(current_user_id)
+        user = db.session.get(User, current_user_id)
         if not user:
-            return jsonify({
-                "success": False,
-                "error": "User not found"
-            }), 404
+            return _err("User not found", 404)
 
         user.name = username
         user.wallet_address = wallet_address
@@ -104,25 +229,15 @@ def create_identity():
         user.identity_verified = True
 
         db.session.commit()
+        _invalidate_identity_trust(current_user_id)
 
-        # Create NFT identity on blockchain
-        nft_tx_hash = None
+        # Mint the identity NFT in the background; the client polls
+        # /mint-status/<job_id> for the transaction hash
+        nft_job_id = None
         if blockchain_service and blockchain_service.is_connected() and wallet_address:
-            try:
-                logger.info(f"Creating identity NFT on blockchain for {username}")
-                nft_tx_hash = blockchain_service.create_identity_on_chain(
-                    username=username,
-                    metadata_uri=metadata_uri,
-                    user_address=wallet_address
-                )
-                
-                if nft_tx_hash:
-                    logger.info(f"NFT identity created with tx hash: {nft_tx_hash}")
-                else:
-                    logger.warning("Failed to create NFT identity on blockchain")
-                    
-            except Exception as e:
-                logger.error(f"Blockchain NFT creation failed: {e}")
+            nft_job_id = submit_job(_mint_identity_nft, username, metadata_uri, wallet_address,
+                                    job_owner=current_user_id)
+            logger.info("Queued identity NFT mint %s for %s", nft_job_id, username)
 
         # Create MeTTa atoms for the new identity
         metta_atoms = []
@@ -133,32 +248,201 @@ def create_identity():
                     did=did,
                     username=username,
                     metadata_uri=metadata_uri,
-                    nft_tx_hash=nft_tx_hash
+                    nft_tx_hash=None
                 )
                 metta_atoms = identity_atoms
             except Exception as e:
-                logger.warning(f"Failed to create MeTTa atoms: {e}")
-
-        return jsonify({
-            "success": True,
-            "data": {
-                "identity_id": current_user_id,
-                "did": did,
-                "username": username,
-                "metadata_uri": metadata_uri,
-                "nft_tx_hash": nft_tx_hash,
-                "nft_minted": nft_tx_hash is not None,
-                "created_at": user.created_at.isoformat(),
-                "metta_atoms": metta_atoms
-            }
-        }), 201
+                logger.warning("Failed to create MeTTa atoms: %s", e)
+
+        return _ok({
+            "identity_id": current_user_id,
+            "did": did,
+            "username": username,
+            "metadata_uri": metadata_uri,
+            "nft_mint_status": "pending" if nft_job_id else "skipped",
+            "nft_job_id": nft_job_id,
+            "created_at": user.created_at,
+            "metta_atoms": metta_atoms
+        }, 201)
 
     except Exception as e:
-        logger.error(f"Identity creation failed: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to create identity"
-        }), 500
+        logger.error("Identity creation failed: %s", e)
+        return _err("Failed to create identity", 500)
+
+
+def _mint_identity_nfts(usernames: list, metadata_uris: list, wallet_addresses: list) -> Dict[str, Any]:
+    """Background job: mint identity NFTs in batchCreateIdentity chunks"""
+    tx_hashes = []
+    for start in range(0, len(usernames), _IDENTITY_MINT_BATCH_SIZE):
+        end = start + _IDENTITY_MINT_BATCH_SIZE
+        tx_hash = blockchain_service.batch_create_identity(
+            usernames[start:end], metadata_uris[start:end], wallet_addresses[start:end]
+        )
+        if not tx_hash:
+            raise RuntimeError("Failed to batch create NFT identities on blockchain")
+        tx_hashes.append(tx_hash)
+    
+    logger.info("Batch minted %d identity NFTs in %d transactions", len(usernames), len(tx_hashes))
+    return {"nft_tx_hashes": tx_hashes}
+
+
+@identity_bp.route('/create/batch', methods=['POST'])
+@jwt_required()
+def create_identities_batch():
+    """
+    Create decentralized identities for several users at once (admin only)
+    
+    Identity NFTs for all items with a wallet address are minted together
+    through the contract's batchCreateIdentity, in chunks of 50.
+    
+    Request Body:
+    {
+        "identities": [
+            {
+                "user_id": 123,
+                "username": "johndoe",
+                "metadata_uri": "ipfs://...",
+                "did": "did:nimo:...",
+                "wallet_address": "0x..."
+            }
+        ]
+    }
+    
+    Response:
+    {
+        "success": true,
+        "data": {
+            "results": [{"index": 0, "success": true, "user_id": 123}],
+            "nft_mint_status": "pending",
+            "nft_job_id": "9f1c..."
+        }
+    }
+    """
+    try:
+        current_user_id = current_uid()
+        if current_user_id not in current_app.config.get('ADMIN_USER_IDS', ()):
+            return _err("Unauthorized", 403)
+        
+        data = request.get_json(silent=True) or {}
+        items = data.get('identities')
+        if not isinstance(items, list) or not items:
+            return _err("identities must be a non-empty list", 400)
+        if len(items) > 500:
+            return _err("Maximum 500 identities per batch", 400)
+        
+        # Validate every item up front; invalid items are reported, not fatal
+        results = []
+        valid_items = []
+        for index, item in enumerate(items):
+            try:
+                user_id = int(item['user_id'])
+            except (KeyError, TypeError, ValueError):
+                results.append({"index": index, "success": False, "error": "A numeric user_id is required"})
+                continue
+            
+            missing = next((field for field in ('username', 'metadata_uri', 'did')
+                            if not item.get(field)), None)
+            if missing:
+                results.append({"index": index, "success": False,
+                                "error": f"Missing required field: {missing}"})
+                continue
+            
+            valid_items.append((index, user_id, item))
+        
+        # Load every target user and every conflicting name/wallet in two queries
+        users = {user.id: user for user in User.query.filter(
+            User.id.in_({user_id for _, user_id, _ in valid_items})
+        )}
+        names = {item['username'] for _, _, item in valid_items}
+        wallets = {item['wallet_address'] for _, _, item in valid_items if item.get('wallet_address')}
+        conditions = [User.name.in_(names)]
+        if wallets:
+            conditions.append(User.wallet_address.in_(wallets))
+        taken = db.session.query(User.id, User.name, User.wallet_address) \
+            .filter(db.or_(*conditions)).all()
+        name_owner = {row.name: row.id for row in taken}
+        wallet_owner = {row.wallet_address: row.id for row in taken if row.wallet_address}
+        
+        usernames, metadata_uris, wallet_addresses = [], [], []
+        for index, user_id, item in valid_items:
+            user = users.get(user_id)
+            username = item['username']
+            wallet_address = item.get('wallet_address')
+            if user is None:
+                results.append({"index": index, "success": False, "error": "User not found"})
+                continue
+            if name_owner.setdefault(username, user_id) != user_id or \
+                    (wallet_address and wallet_owner.setdefault(wallet_address, user_id) != user_id):
+                results.append({"index": index, "success": False,
+                                "error": "Username or wallet address already exists"})
+                continue
+            
+            user.name = username
+            user.wallet_address = wallet_address
+            user.did = item['did']
+            user.metadata_uri = item['metadata_uri']
+            user.identity_verified = True
+            results.append({"index": index, "success": True, "user_id": user_id})
+            
+            if wallet_address:
+                usernames.append(username)
+                metadata_uris.append(item['metadata_uri'])
+                wallet_addresses.append(wallet_address)
+        
+        db.session.commit()
+        for result in results:
+            if result["success"]:
+                _invalidate_identity_trust(result["user_id"])
+        
+        # Coalesce all on-chain work into as few transactions as possible
+        nft_job_id = None
+        if usernames and blockchain_service and blockchain_service.is_connected():
+            nft_job_id = submit_job(_mint_identity_nfts, usernames, metadata_uris, wallet_addresses,
+                                    job_owner=current_user_id)
+            logger.info("Queued batch identity NFT mint %s for %d users", nft_job_id, len(usernames))
+        
+        results.sort(key=lambda result: result["index"])
+        return _ok({
+            "results": results,
+            "nft_mint_status": "pending" if nft_job_id else "skipped",
+            "nft_job_id": nft_job_id
+        }, 201)
+    
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Batch identity creation failed: %s", e)
+        return _err("Failed to create identities", 500)
+
+
+@identity_bp.route('/mint-status/<job_id>', methods=['GET'])
+@jwt_required()
+def get_mint_status(job_id):
+    """
+    Get the state of a background identity NFT mint
+    
+    Response:
+    {
+        "success": true,
+        "data": {
+            "job_id": "9f1c...",
+            "state": "succeeded",  // pending, running, succeeded or failed
+            "nft_tx_hash": "0x...",     // single mint
+            "nft_tx_hashes": ["0x..."], // batch mint
+            "error": null
+        }
+    }
+    """
+    job = get_job(job_id)
+    if job is None or job["owner"] != current_uid():
+        return _err("Mint job not found", 404)
+    
+    return _ok({
+        "job_id": job_id,
+        "state": job["state"],
+        "nft_tx_hash": (job["result"] or {}).get("nft_tx_hash"),
+        "nft_tx_hashes": (job["result"] or {}).get("nft_tx_hashes"),
+        "error": job["error"]
+    })
 
 
 @identity_bp.route('/', methods=['GET'])
@@ -182,34 +466,31 @@ def get_identity():
     }
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        current_user_id = current_uid()
 
+        # Revalidate against the row's modification stamp before loading it
+        updated_at = db.session.query(User.updated_at).filter_by(id=current_user_id).scalar()
+        etag = _identity_etag(current_user_id, updated_at)
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag, _IDENTITY_MAX_AGE)
+
+        user = db.session.get(User, current_user_id)
         if not user:
-            return jsonify({
-                "success": False,
-                "error": "User not found"
-            }), 404
-
-        return jsonify({
-            "success": True,
-            "data": {
-                "user_id": user.id,
-                "username": user.name,
-                "did": user.did,
-                "wallet_address": user.wallet_address,
-                "metadata_uri": user.metadata_uri,
-                "identity_verified": user.identity_verified,
-                "created_at": user.created_at.isoformat() if user.created_at else None
-            }
-        }), 200
+            return _err("User not found", 404)
+
+        return _cacheable(_ok({
+            "user_id": user.id,
+            "username": user.name,
+            "did": user.did,
+            "wallet_address": user.wallet_address,
+            "metadata_uri": user.metadata_uri,
+            "identity_verified": user.identity_verified,
+            "created_at": user.created_at
+        }), etag, _IDENTITY_MAX_AGE)
 
     except Exception as e:
-        logger.error(f"Failed to get identity: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to retrieve identity"
-        }), 500
+        logger.error("Failed to get identity: %s", e)
+        return _err("Failed to retrieve identity", 500)
 
 
 @identity_bp.route('/verify-did', methods=['POST'])
@@ -246,53 +527,39 @@ def verify_did():
         current_user = get_jwt_identity()
         
         # Parse request data
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required", 400)
         
         did = data.get('did')
         proof = data.get('proof')  # Optional
         
         if not did:
-            return jsonify({
-                "success": False,
-                "error": "DID is required"
-            }), 400
+            return _err("DID is required", 400)
         
-        # Verify DID and integrate with MeTTa
-        result = metta_integration.verify_user_did(current_user, did, proof)
+        # Verify DID and integrate with MeTTa, fetching each DID document at
+        # most once for this request
+        resolver = MemoizedResolver(metta_integration.did_integration.did_verifier)
+        result = metta_integration.verify_user_did(current_user, did, proof, resolver=resolver)
+        if result.get('identity_verified'):
+            _invalidate_identity_trust(current_user)
         
         # Log verification attempt
-        logger.info(f"DID verification for user {current_user}: {result.get('identity_verified', False)}")
+        logger.info("DID verification for user %s: %s", current_user, result.get('identity_verified', False))
         
-        return jsonify({
-            "success": True,
-            "data": result
-        }), 200
+        return _ok(result)
         
     except DIDVerificationError as e:
-        logger.warning(f"DID verification failed for user {current_user}: {e}")
-        return jsonify({
-            "success": False,
-            "error": f"DID verification failed: {str(e)}"
-        }), 400
+        logger.warning("DID verification failed for user %s: %s", current_user, e)
+        return _err(f"DID verification failed: {str(e)}", 400)
         
     except MeTTaSecurityError as e:
-        logger.error(f"Security error in DID verification for user {current_user}: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Security validation failed"
-        }), 400
+        logger.error("Security error in DID verification for user %s: %s", current_user, e)
+        return _err("Security validation failed", 400)
         
     except Exception as e:
-        logger.error(f"Unexpected error in DID verification: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        logger.error("Unexpected error in DID verification: %s", e)
+        return _err("Internal server error", 500)
 
 
 @identity_bp.route('/verify-ens', methods=['POST'])
@@ -301,6 +568,9 @@ def verify_ens():
     """
     Verify an ENS (Ethereum Name Service) name
     
+    Successful verifications are cached for five minutes; pass ``?fresh=1``
+    to bypass the cache and re-check the name.
+    
     Request Body:
     {
         "ens_name": "vitalik.eth"
@@ -323,45 +593,63 @@ def verify_ens():
         current_user = get_jwt_identity()
         
         # Parse request data
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required", 400)
         
         ens_name = data.get('ens_name')
         
         if not ens_name:
-            return jsonify({
-                "success": False,
-                "error": "ENS name is required"
-            }), 400
+            return _err("ENS name is required", 400)
         
-        # Verify ENS name
-        result = metta_integration.did_integration.did_verifier.verify_ens_name(ens_name)
+        # Serve repeat lookups from the cache unless a fresh check is requested
+        cache_key = ens_name.strip().lower()
+        fresh = request.args.get('fresh') == '1'
+        result = None if fresh else _ENS_CACHE.get(cache_key)
+        with _ens_stats_lock:
+            _ens_stats["hits" if result is not None else "misses"] += 1
+        
+        if result is None:
+            result = metta_integration.did_integration.did_verifier.verify_ens_name(ens_name)
+            if result.get('verified'):
+                _ENS_CACHE[cache_key] = result
         
         # Log verification attempt
-        logger.info(f"ENS verification for user {current_user}: {ens_name} -> {result.get('verified', False)}")
+        logger.info("ENS verification for user %s: %s -> %s", current_user, ens_name, result.get('verified', False))
         
-        return jsonify({
-            "success": True,
-            "data": result
-        }), 200
+        return _ok(result)
         
     except DIDVerificationError as e:
-        logger.warning(f"ENS verification failed: {e}")
-        return jsonify({
-            "success": False,
-            "error": f"ENS verification failed: {str(e)}"
-        }), 400
+        logger.warning("ENS verification failed: %s", e)
+        return _err(f"ENS verification failed: {str(e)}", 400)
         
     except Exception as e:
-        logger.error(f"Unexpected error in ENS verification: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        logger.error("Unexpected error in ENS verification: %s", e)
+        return _err("Internal server error", 500)
+
+
+@identity_bp.route('/ens-cache/stats', methods=['GET'])
+@jwt_required()
+def get_ens_cache_stats():
+    """
+    Get ENS verification cache statistics for monitoring
+    
+    Response:
+    {
+        "success": true,
+        "data": {
+            "hits": 120,
+            "misses": 8,
+            "size": 8,
+            "maxsize": 50000,
+            "ttl": 300
+        }
+    }
+    """
+    with _ens_stats_lock:
+        stats = dict(_ens_stats)
+    stats.update(size=len(_ENS_CACHE), maxsize=_ENS_CACHE.maxsize, ttl=_ENS_CACHE.ttl)
+    return _ok(stats)
 
 
 @identity_bp.route('/contribution/verify-with-identity', methods=['POST'])
@@ -401,49 +689,46 @@ def verify_contribution_with_identity():
         current_user = get_jwt_identity()
         
         # Parse request data
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required", 400)
         
         contribution_id = data.get('contribution_id')
         contribution_data = data.get('contribution_data')
         
         if not contribution_id:
-            return jsonify({
-                "success": False,
-                "error": "Contribution ID is required"
-            }), 400
+            return _err("Contribution ID is required", 400)
+        
+        # Cheap guards before any MeTTa reasoning: the contribution must exist
+        # unless its data is supplied inline, and the caller must be allowed
+        # to verify contributions
+        if not contribution_data and not _contribution_exists(contribution_id):
+            return _err("Contribution not found", 404)
+        
+        user = db.session.get(User, current_uid())
+        if not user or not getattr(user, 'has_verification_permission', lambda: True)():
+            return _err("Unauthorized", 403)
         
         # Perform identity-enhanced contribution verification
         result = metta_integration.verify_contribution_with_identity(
-            contribution_id, contribution_data
+            contribution_id, contribution_data, cache=g.validation_cache
         )
         
         # Log verification attempt
-        logger.info(f"Identity-enhanced contribution verification by user {current_user}: "
-                   f"contrib={contribution_id}, verified={result.get('status') == 'verified'}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Identity-enhanced contribution verification by user %s: "
+                        "contrib=%s, verified=%s",
+                        current_user, contribution_id, result.get('status') == 'verified')
         
-        return jsonify({
-            "success": True,
-            "data": result
-        }), 200
+        return _ok(result)
         
     except MeTTaSecurityError as e:
-        logger.error(f"Security error in contribution verification: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Security validation failed"
-        }), 400
+        logger.error("Security error in contribution verification: %s", e)
+        return _err("Security validation failed", 400)
         
     except Exception as e:
-        logger.error(f"Unexpected error in contribution verification: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        logger.error("Unexpected error in contribution verification: %s", e)
+        return _err("Internal server error", 500)
 
 
 @identity_bp.route('/trust-score/<user_id>', methods=['GET'])
@@ -472,36 +757,18 @@ def get_identity_trust_score(user_id: str):
         # Note: In production, add proper authorization checks
         # For now, users can query any user's trust score
         
-        # Query MeTTa reasoning system for identity trust score
-        from services.metta_runner import run_metta_query
+        # The user ID is bound into MeTTa queries, so only accept identifiers
+        if not _USER_ID_PATTERN.fullmatch(user_id):
+            return _err("Invalid user ID", 400)
         
-        # Check if user has verified DID
-        has_did_query = f'!(HasVerifiedDID "{user_id}")'
-        has_did = run_metta_query(has_did_query)
+        trust = _get_identity_trust(user_id)
+        has_did, trust_score, reputation_bonus, identity_method = trust
         
-        trust_score = 0.0
-        reputation_bonus = 0
-        identity_method = None
-        
-        if has_did:
-            # Get trust score
-            trust_query = f'!(IdentityTrustScore "{user_id}")'
-            trust_result = run_metta_query(trust_query)
-            trust_score = float(trust_result) if trust_result else 0.0
-            
-            # Get reputation bonus
-            bonus_query = f'!(IdentityReputationBonus "{user_id}")'
-            bonus_result = run_metta_query(bonus_query)
-            reputation_bonus = int(bonus_result) if bonus_result else 0
-            
-            # Try to get DID method
-            try:
-                method_query = f'!(DIDVerification "{user_id}" $_ $method)'
-                method_result = run_metta_query(method_query)
-                if method_result:
-                    identity_method = str(method_result).strip('"')
-            except Exception:
-                pass
+        etag = hashlib.blake2b(
+            repr((user_id, current_user, trust)).encode(), digest_size=8
+        ).hexdigest()
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag, int(_TRUST_CACHE.ttl))
         
         result = {
             "user_id": user_id,
@@ -513,17 +780,83 @@ def get_identity_trust_score(user_id: str):
             "query_timestamp": metta_integration._get_current_timestamp()
         }
         
-        return jsonify({
-            "success": True,
-            "data": result
-        }), 200
+        # Clients may reuse the answer for as long as the server caches it
+        return _cacheable(_ok(result), etag, int(_TRUST_CACHE.ttl))
         
     except Exception as e:
-        logger.error(f"Error querying identity trust score: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        logger.error("Error querying identity trust score: %s", e)
+        return _err("Internal server error", 500)
+
+
+def _get_identity_trust(user_id: str):
+    """
+    Cached ``_compute_identity_trust``.
+    
+    Requests that miss together for the same user wait for one computation
+    instead of each running the MeTTa queries.
+    """
+    trust = _TRUST_CACHE.get(user_id)
+    if trust is not None:
+        return trust
+    with _TRUST_LOCKS[hash(user_id) % len(_TRUST_LOCKS)]:
+        trust = _TRUST_CACHE.get(user_id)
+        if trust is None:
+            trust = _compute_identity_trust(user_id)
+            _TRUST_CACHE[user_id] = trust
+    return trust
+
+
+def _compute_identity_trust(user_id: str):
+    """
+    Run the MeTTa identity trust queries for a user.
+    
+    Returns:
+        Tuple of (has_did, trust_score, reputation_bonus, identity_method)
+    """
+    trust_score = 0.0
+    reputation_bonus = 0
+    identity_method = None
+    
+    # Most users never verify a DID, so remember negative answers and
+    # skip the MeTTa round trip entirely for them
+    if user_id in _NO_DID_CACHE:
+        return False, trust_score, reputation_bonus, identity_method
+    
+    # Query MeTTa reasoning system for identity trust score
+    has_did = run_metta_query_prepared('identity_has_did', {'uid': user_id})
+    if not has_did:
+        _NO_DID_CACHE[user_id] = True
+        return False, trust_score, reputation_bonus, identity_method
+    
+    # The remaining queries are independent, so run them side by side
+    trust_future = _metta_pool.submit(run_metta_query_prepared, 'identity_trust_score', {'uid': user_id})
+    bonus_future = _metta_pool.submit(run_metta_query_prepared, 'identity_reputation_bonus', {'uid': user_id})
+    method_future = _metta_pool.submit(run_metta_query_prepared, 'identity_did_method', {'uid': user_id})
+    
+    # Get trust score
+    trust_result = trust_future.result(timeout=_METTA_QUERY_TIMEOUT)
+    trust_score = float(trust_result) if trust_result else 0.0
+    
+    # Get reputation bonus
+    bonus_result = bonus_future.result(timeout=_METTA_QUERY_TIMEOUT)
+    reputation_bonus = int(bonus_result) if bonus_result else 0
+    
+    # Try to get DID method
+    try:
+        method_result = method_future.result(timeout=_METTA_QUERY_TIMEOUT)
+        if method_result:
+            identity_method = str(method_result).strip('"')
+    except Exception:
+        pass
+    
+    return True, trust_score, reputation_bonus, identity_method
+
+
+def _invalidate_identity_trust(user_id: Any) -> None:
+    """Forget cached trust results after a user's identity changes"""
+    user_key = str(user_id)
+    _NO_DID_CACHE.pop(user_key)
+    _TRUST_CACHE.pop(user_key)
 
 
 @identity_bp.route('/supported-methods', methods=['GET'])
@@ -545,44 +878,22 @@ def get_supported_did_methods():
         }
     }
     """
-    try:
-        from services.did_verification import DIDVerifier
-        
-        return jsonify({
-            "success": True,
-            "data": {
-                "supported_methods": DIDVerifier.SUPPORTED_METHODS,
-                "did_resolvers": DIDVerifier.DID_RESOLVERS,
-                "features": [
-                    "DID document resolution",
-                    "ENS name resolution",
-                    "Cryptographic proof validation",
-                    "MeTTa reasoning integration",
-                    "Identity trust scoring"
-                ]
-            }
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting supported DID methods: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+    if request.if_none_match.contains(_SUPPORTED_METHODS_ETAG):
+        return current_app.response_class(status=304, headers=_SUPPORTED_METHODS_HEADERS)
+    
+    return current_app.response_class(
+        _SUPPORTED_METHODS_BODY,
+        mimetype='application/json',
+        headers=_SUPPORTED_METHODS_HEADERS
+    )
 
 
 # Error handlers
 @identity_bp.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        "success": False,
-        "error": "Endpoint not found"
-    }), 404
+    return _err("Endpoint not found", 404)
 
 
 @identity_bp.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
-        "success": False,
-        "error": "Method not allowed"
-    }), 405
\ No newline at end of file
+    return _err("Method not allowed", 405)
\ No newline at end of file
@@ -1,63 +1,122 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
 
 from app import db
+from middleware.auth_middleware import current_uid
 from models.user import Token, TokenTransaction
+from utils.serialization import dumps_bytes
 
 token_bp = Blueprint('token', __name__)
 
-@token_bp.route('/balance', methods=['GET'])
-@jwt_required()
-def get_balance():
-    current_user_id = int(get_jwt_identity())  # Convert string to int
+def _get_or_create_token(user_id):
+    """
+    Return the user's token record, creating an empty one if needed.
     
-    token = Token.query.filter_by(user_id=current_user_id).first()
+    Creation is an INSERT ... ON CONFLICT DO NOTHING RETURNING, so
+    concurrent first requests for the same user cannot fail on the unique
+    user_id, and the new row comes back without a second SELECT; the row
+    is only re-read when another request created it first.
+    """
+    token = Token.query.filter_by(user_id=user_id).first()
+    if token is not None:
+        return token
     
-    if not token:
-        # Initialize token record if it doesn't exist
-        token = Token(user_id=current_user_id, initial_balance=0)
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # No portable upsert; fall back to a plain insert
+        token = Token(user_id=user_id, initial_balance=0)
         db.session.add(token)
         db.session.commit()
+        return token
+    
+    token = db.session.scalars(
+        insert(Token).values(user_id=user_id, balance=0)
+        .on_conflict_do_nothing(index_elements=['user_id'])
+        .returning(Token)
+    ).first()
+    if token is not None:
+        # Detached, so the commit doesn't expire it and force a reload
+        db.session.expunge(token)
+    db.session.commit()
+    if token is None:
+        token = Token.query.filter_by(user_id=user_id).first()
+    return token
+
+
+@token_bp.route('/balance', methods=['GET'])
+@jwt_required()
+def get_balance():
+    current_user_id = current_uid()
+    
+    token = _get_or_create_token(current_user_id)
     
     return jsonify({
         "balance": token.balance,
-        "updated_at": token.updated_at.isoformat()
+        "updated_at": token.updated_at
     }), 200
 
 
 @token_bp.route('/transactions', methods=['GET'])
 @jwt_required()
 def get_transactions():
-    current_user_id = int(get_jwt_identity())  # Convert string to int
+    """
+    List the current user's token transactions, newest first.
+    
+    Query params ``limit`` (default 50, max 500) and ``cursor`` (the
+    ``next_cursor`` from the previous page) page through the history.
+    """
+    current_user_id = current_uid()
     
-    # Get user's token record
-    token = Token.query.filter_by(user_id=current_user_id).first()
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        cursor = request.args.get('cursor', type=int)
+    except ValueError:
+        return jsonify({"error": "limit must be a valid number"}), 400
     
-    if not token:
-        return jsonify({"transactions": []}), 200
+    # One JOIN against the user's token row, projecting only the columns we
+    # return; transaction IDs grow with created_at so they double as a cursor
+    query = db.session.query(
+        TokenTransaction.id,
+        TokenTransaction.amount,
+        TokenTransaction.description,
+        TokenTransaction.transaction_type,
+        TokenTransaction.created_at
+    ).join(Token, Token.id == TokenTransaction.token_id) \
+        .filter(Token.user_id == current_user_id)
+    if cursor is not None:
+        query = query.filter(TokenTransaction.id < cursor)
+    rows = query.order_by(TokenTransaction.id.desc()).limit(limit + 1).yield_per(100)
     
-    # Get transactions
-    transactions = TokenTransaction.query.filter_by(token_id=token.id) \
-        .order_by(TokenTransaction.created_at.desc()).all()
+    def generate():
+        yield b'{"transactions":['
+        next_cursor = None
+        for count, row in enumerate(rows):
+            if count == limit:
+                # One extra row was fetched only to tell whether more remain
+                next_cursor = last_id
+                break
+            yield (b',' if count else b'') + dumps_bytes({
+                "id": row.id,
+                "amount": row.amount,
+                "description": row.description,
+                "type": row.transaction_type,
+                "created_at": row.created_at
+            })
+            last_id = row.id
+        yield b'],"next_cursor":' + dumps_bytes(next_cursor) + b'}'
     
-    return jsonify({
-        "transactions": [
-            {
-                "id": t.id,
-                "amount": t.amount,
-                "description": t.description,
-                "type": t.transaction_type,
-                "created_at": t.created_at.isoformat()
-            } for t in transactions
-        ]
-    }), 200
+    return Response(stream_with_context(generate()), status=200, mimetype='application/json')
 
 
 @token_bp.route('/transfer', methods=['POST'])
 @jwt_required()
 def transfer_tokens():
-    current_user_id = int(get_jwt_identity())  # Convert string to int
-    data = request.get_json()
+    current_user_id = current_uid()
+    data = request.get_json(silent=True) or {}
     
     # Validate required fields
     if not data.get('recipient_id') or not data.get('amount'):
@@ -68,19 +127,28 @@ def transfer_tokens():
         amount = int(data['amount'])
         if amount <= 0:
             return jsonify({"error": "Amount must be positive"}), 400
-    except ValueError:
+    except (TypeError, ValueError):
         return jsonify({"error": "Amount must be a valid number"}), 400
     
-    # Get sender's token record
-    sender_token = Token.query.filter_by(user_id=current_user_id).first()
+    try:
+        recipient_id = int(data['recipient_id'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "Recipient ID must be a valid number"}), 400
+    
+    # Lock both token rows in id order, so the balance check below cannot
+    # race a concurrent transfer and opposite transfers cannot deadlock
+    tokens = Token.query.filter(Token.user_id.in_({current_user_id, recipient_id})) \
+        .order_by(Token.id).with_for_update().all()
+    tokens_by_user = {token.user_id: token for token in tokens}
     
+    sender_token = tokens_by_user.get(current_user_id)
     if not sender_token or sender_token.balance < amount:
+        db.session.rollback()
         return jsonify({"error": "Insufficient token balance"}), 400
     
-    # Get recipient's token record
-    recipient_token = Token.query.filter_by(user_id=data['recipient_id']).first()
-    
+    recipient_token = tokens_by_user.get(recipient_id)
     if not recipient_token:
+        db.session.rollback()
         return jsonify({"error": "Recipient not found"}), 404
     
     try:
@@ -90,9 +158,8 @@ def transfer_tokens():
             token_id=sender_token.id,
             amount=amount,
             transaction_type='debit',
-            description=f"Transfer to user #{data['recipient_id']}"
+            description=f"Transfer to user #{recipient_id}"
         )
-        db.session.add(sender_transaction)
         
         # Add to recipient
         recipient_token.balance += amount
@@ -102,8 +169,8 @@ def transfer_tokens():
             transaction_type='credit',
             description=f"Transfer from user #{current_user_id}"
         )
-        db.session.add(recipient_transaction)
         
+        db.session.bulk_save_objects([sender_transaction, recipient_transaction])
         db.session.commit()
         
         return jsonify({
@@ -113,4 +180,99 @@ def transfer_tokens():
     
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@token_bp.route('/transfer/batch', methods=['POST'])
+@jwt_required()
+def batch_transfer_tokens():
+    """Transfer tokens to several recipients in a single transaction"""
+    current_user_id = current_uid()
+    data = request.get_json(silent=True) or {}
+    
+    transfers = data.get('transfers')
+    if not isinstance(transfers, list) or len(transfers) == 0:
+        return jsonify({"error": "transfers must be a non-empty list"}), 400
+    
+    if len(transfers) > 100:  # Limit batch size
+        return jsonify({"error": "Maximum 100 transfers per batch"}), 400
+    
+    # Validate each item up front; invalid items are reported, not fatal
+    results = []
+    valid_transfers = []
+    for index, item in enumerate(transfers):
+        try:
+            recipient_id = int(item['recipient_id'])
+            amount = int(item['amount'])
+        except (KeyError, TypeError, ValueError):
+            results.append({"index": index, "success": False,
+                            "error": "Recipient ID and a numeric amount are required"})
+            continue
+        
+        if amount <= 0:
+            results.append({"index": index, "success": False, "error": "Amount must be positive"})
+            continue
+        
+        valid_transfers.append((index, recipient_id, amount))
+    
+    # Load and lock every involved token row in one query, in id order so
+    # concurrent batches cannot deadlock on each other
+    user_ids = {current_user_id} | {recipient_id for _, recipient_id, _ in valid_transfers}
+    tokens = Token.query.filter(Token.user_id.in_(user_ids)) \
+        .order_by(Token.id).with_for_update().all()
+    tokens_by_user = {token.user_id: token for token in tokens}
+    
+    sender_token = tokens_by_user.get(current_user_id)
+    
+    payable = []
+    for index, recipient_id, amount in valid_transfers:
+        if recipient_id not in tokens_by_user:
+            results.append({"index": index, "success": False, "error": "Recipient not found"})
+        else:
+            payable.append((index, recipient_id, amount))
+    
+    total_amount = sum(amount for _, _, amount in payable)
+    if not sender_token or sender_token.balance < total_amount:
+        db.session.rollback()
+        return jsonify({"error": "Insufficient token balance"}), 400
+    
+    try:
+        token_transactions = []
+        for index, recipient_id, amount in payable:
+            recipient_token = tokens_by_user[recipient_id]
+            
+            # Deduct from sender
+            sender_token.balance -= amount
+            token_transactions.append(TokenTransaction(
+                token_id=sender_token.id,
+                amount=amount,
+                transaction_type='debit',
+                description=f"Transfer to user #{recipient_id}"
+            ))
+            
+            # Add to recipient
+            recipient_token.balance += amount
+            token_transactions.append(TokenTransaction(
+                token_id=recipient_token.id,
+                amount=amount,
+                transaction_type='credit',
+                description=f"Transfer from user #{current_user_id}"
+            ))
+            
+            results.append({"index": index, "success": True,
+                            "recipient_id": recipient_id, "amount": amount})
+        
+        db.session.bulk_save_objects(token_transactions)
+        db.session.commit()
+        
+        results.sort(key=lambda result: result["index"])
+        return jsonify({
+            "message": "Batch transfer completed",
+            "results": results,
+            "total_transferred": total_amount,
+            "new_balance": sender_token.balance
+        }), 200
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
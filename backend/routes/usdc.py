@@ -5,14 +5,21 @@ These endpoints handle USDC reward calculations, payments, and monitoring.
 """
 
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from decimal import Decimal
 from typing import Dict, Any
 import logging
+import os
+import re
 
-from services.usdc_integration import USDCIntegration
+from services.usdc_integration import get_usdc_integration
 from services.metta_integration_enhanced import get_metta_service
 from app import db
+from middleware.auth_middleware import current_uid
 from models.user import User
+from utils.background import get_job, submit_job
+from utils.cache import TTLCache, persistent_cache
+from utils.serialization import json_response
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,9 +27,96 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 usdc_bp = Blueprint('usdc', __name__, url_prefix='/api/usdc')
 
-# Initialize services
-usdc_integration = USDCIntegration()
-metta_integration = get_metta_service()
+# Hex-format checks for addresses and transaction hashes; malformed input is
+# rejected here instead of costing an RPC round trip
+_is_address = re.compile(r'0x[0-9a-fA-F]{40}').fullmatch
+_is_tx_hash = re.compile(r'0x[0-9a-fA-F]{64}').fullmatch
+
+
+def _err(message: str, status: int = 400):
+    """Build a failed ``{"success": false, "error": ...}`` response"""
+    return json_response({"success": False, "error": message}, status)
+
+
+# Largest USDC amount a single send or estimate may move
+_MAX_USDC_AMOUNT = Decimal(os.environ.get('USDC_MAX_TRANSFER_AMOUNT', '1000000'))
+
+
+def _parse_amount(raw) -> Decimal:
+    """
+    Parse a USDC amount from a JSON string or number into a ``Decimal``.
+    
+    Raises:
+        ValueError: If the amount is malformed, not finite, not positive or
+            above ``USDC_MAX_TRANSFER_AMOUNT``
+    """
+    if isinstance(raw, bool) or not isinstance(raw, (str, int, float)):
+        raise ValueError("Invalid amount format")
+    try:
+        # repr() of a float is its shortest exact decimal form
+        amount = Decimal(raw if isinstance(raw, (str, int)) else repr(raw))
+    except ArithmeticError:
+        raise ValueError("Invalid amount format")
+    if not amount.is_finite():
+        raise ValueError("Invalid amount format")
+    if amount <= 0:
+        raise ValueError("Amount must be greater than 0")
+    if amount > _MAX_USDC_AMOUNT:
+        raise ValueError(f"Amount must not exceed {_MAX_USDC_AMOUNT}")
+    return amount
+
+
+# Fields /send requires in its request body
+_SEND_REQUIRED_FIELDS = ('amount', 'recipient_address')
+
+
+# Network status and service account info change rarely; bursts of status
+# requests share one upstream RPC round trip
+_STATUS_CACHE = TTLCache(maxsize=2, ttl=10)
+
+
+def _cached(key: str, fn):
+    """Return the cached result of ``fn()`` under ``key``, calling it on a miss"""
+    value = _STATUS_CACHE.get(key)
+    if value is None:
+        value = fn()
+        _STATUS_CACHE[key] = value
+    return value
+
+
+# USDC balances by lowercased address, short enough to stay within a block
+# or two while collapsing aggressive wallet/dashboard polling; shared by all
+# workers on the host when NIMO_CACHE_DIR is configured
+_BALANCE_CACHE = persistent_cache('usdc_balances', maxsize=10_000, ttl=4)
+
+
+def _get_usdc_balance(address: str):
+    """Get an address's USDC balance, served from the short-lived cache when possible"""
+    key = address.lower()
+    balance = _BALANCE_CACHE.get(key)
+    if balance is None:
+        balance = get_usdc_integration().get_usdc_balance(address)
+        _BALANCE_CACHE[key] = balance
+    return balance
+
+
+def _send_usdc_job(from_address: str, to_address: str, amount: Decimal, reason: str) -> Dict[str, Any]:
+    """Broadcast a USDC transfer in the background and return its transaction details"""
+    tx_result = get_usdc_integration().send_usdc(
+        from_address=from_address,
+        to_address=to_address,
+        amount=amount,
+        reason=reason
+    )
+    
+    # Both balances just changed
+    _BALANCE_CACHE.pop(from_address.lower())
+    _BALANCE_CACHE.pop(to_address.lower())
+    
+    return {
+        "tx_hash": tx_result.get('tx_hash'),
+        "gas_used": tx_result.get('gas_used', '0')
+    }
 
 
 @usdc_bp.route('/status', methods=['GET'])
@@ -43,8 +137,9 @@ def get_usdc_status():
     }
     """
     try:
-        network_status = usdc_integration.get_network_status()
-        service_account_info = usdc_integration.get_service_account_info()
+        usdc_integration = get_usdc_integration()
+        network_status = _cached('network_status', usdc_integration.get_network_status)
+        service_account_info = _cached('service_account', usdc_integration.get_service_account_info)
         
         return jsonify({
             "success": True,
@@ -62,10 +157,7 @@ def get_usdc_status():
         
     except Exception as e:
         logger.error(f"Error getting USDC status: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        return _err("Internal server error", 500)
 
 
 @usdc_bp.route('/balance/<address>', methods=['GET'])
@@ -85,14 +177,12 @@ def get_usdc_balance(address: str):
     }
     """
     try:
+        usdc_integration = get_usdc_integration()
         # Basic address validation
-        if not address.startswith('0x') or len(address) != 42:
-            return jsonify({
-                "success": False,
-                "error": "Invalid Ethereum address format"
-            }), 400
+        if not _is_address(address):
+            return _err("Invalid Ethereum address format")
         
-        balance = usdc_integration.get_usdc_balance(address)
+        balance = _get_usdc_balance(address)
         
         return jsonify({
             "success": True,
@@ -100,16 +190,13 @@ def get_usdc_balance(address: str):
                 "address": address,
                 "balance_usdc": float(balance),
                 "network": usdc_integration.network,
-                "usdc_contract": usdc_integration.base_config[usdc_integration.network]['usdc_address']
+                "usdc_contract": usdc_integration.usdc_address
             }
         }), 200
         
     except Exception as e:
         logger.error(f"Error getting USDC balance for {address}: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to get balance"
-        }), 500
+        return _err("Failed to get balance", 500)
 
 
 @usdc_bp.route('/calculate-reward', methods=['POST'])
@@ -140,34 +227,23 @@ def calculate_usdc_reward():
     }
     """
     try:
+        usdc_integration = get_usdc_integration()
         data = request.get_json()
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required")
         
         nimo_amount = data.get('nimo_amount')
         confidence = data.get('confidence')
         contribution_type = data.get('contribution_type', 'general')
         
         if nimo_amount is None or confidence is None:
-            return jsonify({
-                "success": False,
-                "error": "nimo_amount and confidence are required"
-            }), 400
+            return _err("nimo_amount and confidence are required")
         
         if not isinstance(nimo_amount, (int, float)) or nimo_amount < 0:
-            return jsonify({
-                "success": False,
-                "error": "nimo_amount must be a positive number"
-            }), 400
+            return _err("nimo_amount must be a positive number")
         
         if not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
-            return jsonify({
-                "success": False,
-                "error": "confidence must be between 0 and 1"
-            }), 400
+            return _err("confidence must be between 0 and 1")
         
         calculation = usdc_integration.get_reward_calculation(
             nimo_amount=int(nimo_amount),
@@ -182,10 +258,7 @@ def calculate_usdc_reward():
         
     except Exception as e:
         logger.error(f"Error calculating USDC reward: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        return _err("Internal server error", 500)
 
 
 @usdc_bp.route('/estimate-gas', methods=['POST'])
@@ -212,40 +285,33 @@ def estimate_gas_for_reward():
     }
     """
     try:
+        usdc_integration = get_usdc_integration()
         data = request.get_json()
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required")
         
         to_address = data.get('to_address')
         usdc_amount = data.get('usdc_amount')
         
         if not to_address or not usdc_amount:
-            return jsonify({
-                "success": False,
-                "error": "to_address and usdc_amount are required"
-            }), 400
+            return _err("to_address and usdc_amount are required")
         
         # Basic address validation
-        if not to_address.startswith('0x') or len(to_address) != 42:
-            return jsonify({
-                "success": False,
-                "error": "Invalid to_address format"
-            }), 400
+        if not isinstance(to_address, str) or not _is_address(to_address):
+            return _err("Invalid to_address format")
+        
+        try:
+            usdc_amount = _parse_amount(usdc_amount)
+        except ValueError as e:
+            return _err(str(e))
         
-        from decimal import Decimal
         estimation = usdc_integration.estimate_gas_for_transfer(
             to_address=to_address,
-            usdc_amount=Decimal(str(usdc_amount))
+            usdc_amount=usdc_amount
         )
         
         if 'error' in estimation:
-            return jsonify({
-                "success": False,
-                "error": estimation['error']
-            }), 400
+            return _err(estimation['error'])
         
         return jsonify({
             "success": True,
@@ -254,10 +320,7 @@ def estimate_gas_for_reward():
         
     except Exception as e:
         logger.error(f"Error estimating gas for USDC transfer: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        return _err("Internal server error", 500)
 
 
 @usdc_bp.route('/verify-payment/<tx_hash>', methods=['GET'])
@@ -282,11 +345,9 @@ def verify_usdc_payment(tx_hash: str):
     }
     """
     try:
-        if not tx_hash.startswith('0x'):
-            return jsonify({
-                "success": False,
-                "error": "Invalid transaction hash format"
-            }), 400
+        usdc_integration = get_usdc_integration()
+        if not _is_tx_hash(tx_hash):
+            return _err("Invalid transaction hash format")
         
         verification_result = usdc_integration.verify_usdc_payment(tx_hash)
         
@@ -297,10 +358,7 @@ def verify_usdc_payment(tx_hash: str):
         
     except Exception as e:
         logger.error(f"Error verifying USDC payment {tx_hash}: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to verify payment"
-        }), 500
+        return _err("Failed to verify payment", 500)
 
 
 @usdc_bp.route('/contribution-reward-preview', methods=['POST'])
@@ -342,24 +400,19 @@ def preview_contribution_reward():
     }
     """
     try:
+        usdc_integration = get_usdc_integration()
         data = request.get_json()
         if not data:
-            return jsonify({
-                "success": False,
-                "error": "Request body is required"
-            }), 400
+            return _err("Request body is required")
         
         contribution_id = data.get('contribution_id')
         contribution_data = data.get('contribution_data')
         
         if not contribution_id:
-            return jsonify({
-                "success": False,
-                "error": "contribution_id is required"
-            }), 400
+            return _err("contribution_id is required")
         
         # Get MeTTa analysis
-        metta_result = metta_integration.validate_contribution(contribution_id, contribution_data)
+        metta_result = get_metta_service().validate_contribution(contribution_id, contribution_data)
         
         if not metta_result.get('verified'):
             return jsonify({
@@ -409,10 +462,7 @@ def preview_contribution_reward():
 
     except Exception as e:
         logger.error(f"Error previewing contribution reward: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Internal server error"
-        }), 500
+        return _err("Internal server error", 500)
 
 
 @usdc_bp.route('/balance', methods=['GET'])
@@ -433,34 +483,30 @@ def get_current_user_usdc_balance():
     }
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        usdc_integration = get_usdc_integration()
+        current_user_id = current_uid()
+        # Only the wallet address is needed, so skip loading the full user
+        wallet_address = db.session.query(User.wallet_address).filter_by(id=current_user_id).scalar()
 
-        if not user or not user.wallet_address:
-            return jsonify({
-                "success": False,
-                "error": "User has no associated wallet address"
-            }), 400
+        if not wallet_address:
+            return _err("User has no associated wallet address")
 
         # Get USDC balance
-        balance_info = usdc_integration.get_balance(user.wallet_address)
+        balance = _get_usdc_balance(wallet_address)
 
         return jsonify({
             "success": True,
             "data": {
-                "balance": balance_info.get('balance', '0'),
-                "formatted_balance": balance_info.get('formatted_balance', '0 USDC'),
-                "wallet_address": user.wallet_address,
+                "balance": str(balance),
+                "formatted_balance": f"{balance} USDC",
+                "wallet_address": wallet_address,
                 "network": usdc_integration.network
             }
         }), 200
 
     except Exception as e:
         logger.error(f"Failed to get USDC balance: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to retrieve USDC balance"
-        }), 500
+        return _err("Failed to retrieve USDC balance", 500)
 
 
 @usdc_bp.route('/send', methods=['POST'])
@@ -476,97 +522,110 @@ def send_usdc():
         "reason": "Contribution reward"
     }
 
-    Response:
+    Response (202):
     {
         "success": true,
         "data": {
-            "tx_hash": "0x...",
+            "job_id": "9f1c...",
+            "status": "pending",
             "amount": "10.50",
             "recipient": "0x...",
-            "gas_used": "21000",
             "network": "base-sepolia"
         }
     }
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        usdc_integration = get_usdc_integration()
+        current_user_id = current_uid()
+        # Only the wallet address is needed, so skip loading the full user
+        wallet_address = db.session.query(User.wallet_address).filter_by(id=current_user_id).scalar()
 
-        if not user or not user.wallet_address:
-            return jsonify({
-                "success": False,
-                "error": "User has no associated wallet address"
-            }), 400
+        if not wallet_address:
+            return _err("User has no associated wallet address")
 
         data = request.get_json()
 
         # Validate required fields
-        required_fields = ['amount', 'recipient_address']
-        for field in required_fields:
+        for field in _SEND_REQUIRED_FIELDS:
             if not data.get(field):
-                return jsonify({
-                    "success": False,
-                    "error": f"Missing required field: {field}"
-                }), 400
+                return _err(f"Missing required field: {field}")
 
-        amount = data['amount']
         recipient_address = data['recipient_address']
         reason = data.get('reason', 'USDC Transfer')
 
-        # Validate amount
+        if not isinstance(recipient_address, str) or not _is_address(recipient_address):
+            return _err("Invalid recipient_address format")
+
+        # Parse the amount once; the Decimal is carried through to the transfer
         try:
-            amount_float = float(amount)
-            if amount_float <= 0:
-                return jsonify({
-                    "success": False,
-                    "error": "Amount must be greater than 0"
-                }), 400
-        except ValueError:
-            return jsonify({
-                "success": False,
-                "error": "Invalid amount format"
-            }), 400
-
-        # Send USDC
-        tx_result = usdc_integration.send_usdc(
-            from_address=user.wallet_address,
-            to_address=recipient_address,
-            amount=amount,
-            reason=reason
-        )
+            amount = _parse_amount(data['amount'])
+        except ValueError as e:
+            return _err(str(e))
+
+        # The transfer is broadcast in the background; poll
+        # /send/status/<job_id> for the transaction hash
+        job_id = submit_job(_send_usdc_job, wallet_address, recipient_address, amount, reason,
+                            job_owner=current_user_id)
+        logger.info("Queued USDC send %s for user %s", job_id, current_user_id)
 
         return jsonify({
             "success": True,
             "data": {
-                "tx_hash": tx_result.get('tx_hash'),
-                "amount": amount,
+                "job_id": job_id,
+                "status": "pending",
+                "amount": str(amount),
                 "recipient": recipient_address,
-                "gas_used": tx_result.get('gas_used', '0'),
                 "network": usdc_integration.network,
                 "reason": reason
             }
-        }), 200
+        }), 202
 
     except Exception as e:
         logger.error(f"Failed to send USDC: {e}")
-        return jsonify({
-            "success": False,
-            "error": "Failed to send USDC"
-        }), 500
+        return _err("Failed to send USDC", 500)
+
+
+@usdc_bp.route('/send/status/<job_id>', methods=['GET'])
+@jwt_required()
+def get_send_status(job_id: str):
+    """
+    Get the state of a background USDC send
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "job_id": "9f1c...",
+            "state": "succeeded",  // pending, running, succeeded or failed
+            "tx_hash": "0x...",
+            "gas_used": "21000",
+            "error": null
+        }
+    }
+    """
+    job = get_job(job_id)
+    if job is None or job["owner"] != current_uid():
+        return _err("Send job not found", 404)
+
+    result = job["result"] or {}
+    return jsonify({
+        "success": True,
+        "data": {
+            "job_id": job_id,
+            "state": job["state"],
+            "tx_hash": result.get("tx_hash"),
+            "gas_used": result.get("gas_used"),
+            "error": job["error"]
+        }
+    }), 200
 
 
 # Error handlers
 @usdc_bp.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        "success": False,
-        "error": "Endpoint not found"
-    }), 404
+    return _err("Endpoint not found", 404)
 
 
 @usdc_bp.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
-        "success": False,
-        "error": "Method not allowed"
-    }), 405
\ No newline at end of file
+    return _err("Method not allowed", 405)
\ No newline at end of file
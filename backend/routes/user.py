@@ -6,13 +6,16 @@ from models.user import User, Skill
 
 user_bp = Blueprint('user', __name__)
 
+# Relationships read by User.to_dict(), loaded up front with the user
+_PROFILE_OPTIONS = [db.selectinload(User.skills), db.joinedload(User.tokens)]
+
 @user_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
     # Check if requesting own profile or has admin permission (could be added later)
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id, options=_PROFILE_OPTIONS)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
@@ -23,7 +26,7 @@ def get_user(user_id):
 @jwt_required()
 def get_current_user():
     current_user_id = int(get_jwt_identity())  # Convert string to int
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id, options=_PROFILE_OPTIONS)
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -52,13 +55,21 @@ def update_user():
     
     # Update skills if provided
     if data.get('skills'):
-        # Remove existing skills
-        Skill.query.filter_by(user_id=user.id).delete()
+        # Only write the skills that actually changed
+        new_skills = dict.fromkeys(data['skills'])  # de-duplicated, input order kept
+        existing_skills = {name for (name,) in db.session.query(Skill.name).filter_by(user_id=user.id)}
+        
+        to_remove = existing_skills - new_skills.keys()
+        if to_remove:
+            Skill.query.filter(
+                Skill.user_id == user.id, Skill.name.in_(to_remove)
+            ).delete(synchronize_session=False)
         
-        # Add new skills
-        for skill_name in data['skills']:
-            skill = Skill(user_id=user.id, name=skill_name)
-            db.session.add(skill)
+        to_add = [name for name in new_skills if name not in existing_skills]
+        if to_add:
+            db.session.bulk_insert_mappings(
+                Skill, [{'user_id': user.id, 'name': name} for name in to_add]
+            )
     
     try:
         db.session.commit()
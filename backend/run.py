@@ -4,23 +4,45 @@ Nimo Backend Server Entry Point
 Properly configures and runs the Flask application with all integrations
 """
 
-from app import create_app
 import os
 
-# Create the Flask application
-app = create_app()
+from app import create_app
+
+
+def _debug_enabled() -> bool:
+    """FLASK_DEBUG parsed the way Flask does, so 0/false/no stay off"""
+    return os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+
 
 if __name__ == '__main__':
-    print("Starting Nimo Backend Server...")
-    print("API will be available at: http://127.0.0.1:5000")
-    print("Frontend should connect to: http://localhost:5000")
-    print("API Documentation: http://127.0.0.1:5000/api")
-    print("Health Check: http://127.0.0.1:5000/api/health")
-    
-    # Run the application
-    app.run(
-        host='127.0.0.1',
-        port=5000,
-        debug=True,
-        use_reloader=True
-    )
\ No newline at end of file
+    if _debug_enabled():
+        # Only the dev server needs the app in this process; gunicorn builds
+        # its own in each worker
+        app = create_app()
+        
+        print("Starting Nimo Backend Server (development mode)...")
+        print("API will be available at: http://127.0.0.1:5000")
+        print("Frontend should connect to: http://localhost:5000")
+        print("API Documentation: http://127.0.0.1:5000/api")
+        print("Health Check: http://127.0.0.1:5000/api/health")
+        
+        # Werkzeug dev server with the reloader, for local development only
+        app.run(
+            host='127.0.0.1',
+            port=5000,
+            debug=True,
+            use_reloader=True,
+            threaded=True
+        )
+    else:
+        # Hand the process over to gunicorn, which reads gunicorn.conf.py
+        # (worker class, worker/thread counts, bind address) from this directory
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            os.execvp('gunicorn', ['gunicorn', 'run:app'])
+        except FileNotFoundError:
+            print("gunicorn is not installed; install it or set FLASK_DEBUG=1 for the dev server")
+            raise SystemExit(1)
+else:
+    # Imported by gunicorn (``gunicorn run:app``)
+    app = create_app()
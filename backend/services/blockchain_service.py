@@ -5,17 +5,165 @@ This service provides integration with Ethereum smart contracts
 and bridges the Flask API with on-chain identity and reputation data.
 """
 
-import json
+import asyncio
+import contextvars
+import functools
+import logging
 import os
-from typing import Dict, List, Optional
+import secrets
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import orjson
 from web3 import Web3
+try:
+    from web3 import AsyncWeb3, WebsocketProviderV2
+except ImportError:  # web3 < 6.15 has no persistent WebSocket provider
+    AsyncWeb3 = WebsocketProviderV2 = None
+from eth_abi import encode as abi_encode
 from eth_account import Account
-from flask import current_app
+from eth_utils import event_abi_to_log_topic, function_signature_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
 from dotenv import load_dotenv
 
+from utils.background import submit_job
+from utils.cache import RedisError, TTLCache, shared_cache, shared_redis_client
+from utils.http import RPC_POOL_SIZE, RPC_TIMEOUT, CircuitBreaker, call_with_retry, get_rpc_session
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+GWEI = 10 ** 9
+
+# Upper bound for estimated fees; Base gas is normally far below this
+MAX_GAS_PRICE = 2 * GWEI
+
+# Multicall3 is deployed at the same address on every supported network
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+# Threads for contract event handlers, so a slow handler (database write,
+# MeTTa call) doesn't hold up the events behind it
+_event_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('EVENT_HANDLER_WORKERS', 8)),
+    thread_name_prefix='nimo-ev'
+)
+
+# Argument types of the fixed-shape contract calls; these are encoded from a
+# precomputed selector instead of through web3 contract function objects
+FIXED_CALL_TYPES = {
+    'verifyContribution': ('uint256', 'uint256'),
+    'executeMeTTaRule': ('string', 'uint256', 'uint256'),
+    'mintForContribution': ('address', 'uint256', 'string', 'string'),
+    'createImpactBond': ('string', 'string', 'uint256', 'uint256', 'string[]'),
+}
+FIXED_CALL_SELECTORS = {
+    name: function_signature_to_4byte_selector(f"{name}({','.join(types)})")
+    for name, types in FIXED_CALL_TYPES.items()
+}
+
+# Most providers cap eth_getLogs ranges; stay well under the usual limits
+MAX_LOG_BLOCK_RANGE = 2000
+
+# Sub-calls per aggregate3 request, to stay under provider gas/response limits
+MULTICALL_BATCH_SIZE = 500
+
+# Receipt lookups per JSON-RPC batch; hosted providers reject batches much
+# larger than a few hundred calls
+RECEIPT_BATCH_SIZE = 100
+
+# Seconds a sender can sit idle before its cached nonce is refetched, in case
+# transactions were sent from the same key by another process meanwhile
+NONCE_IDLE_RESYNC = 300
+
+# Transactions remembered for get_transaction_status, so a long-running
+# worker does not keep every transaction it ever sent
+MAX_TRACKED_TRANSACTIONS = 10_000
+TRACKED_TRANSACTION_TTL = 3600
+
+# Atomically reserve nonces from a shared counter; returns nil when the
+# counter has not been seeded from the chain (or expired after idling)
+_RESERVE_NONCES_LUA = """
+if not redis.call('GET', KEYS[1]) then return false end
+local last = redis.call('INCRBY', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return last
+"""
+
+# Background resends of a batch verification that could not be sent
+BATCH_VERIFY_RETRIES = 3
+
+# Contract address variables for networks missing from base_config
+DEFAULT_CONTRACT_ENV = {'identity': 'NIMO_IDENTITY_CONTRACT', 'token': 'NIMO_TOKEN_CONTRACT'}
+
+# Sample identity contract calls priced by estimate_transaction_cost
+COST_PROBE_CALLS = {
+    'create_identity': ('createIdentity', ["test", "ipfs://test"]),
+    'add_contribution': ('addContribution', ["test", "test", "ipfs://test", "0x123"]),
+    'verify_contribution': ('verifyContribution', [1, 50]),
+}
+
+@functools.lru_cache(maxsize=None)
+def _load_abi(contract_name: str) -> Optional[list]:
+    """
+    Load a contract ABI from the Foundry build output.
+    
+    Cached, so the files are read and parsed once per process no matter how
+    many services are created.
+    """
+    contracts_dir = os.path.join(os.path.dirname(__file__), '../../contracts/out')
+    
+    # Try clean ABI file first, then fall back to original
+    clean_abi_file = os.path.join(contracts_dir, f'{contract_name}.sol', f'{contract_name}_clean.json')
+    original_abi_file = os.path.join(contracts_dir, f'{contract_name}.sol', f'{contract_name}.json')
+    
+    abi_file = clean_abi_file if os.path.exists(clean_abi_file) else original_abi_file
+    if not os.path.exists(abi_file):
+        return None
+    
+    with open(abi_file, 'rb') as f:
+        contract_data = orjson.loads(f.read())
+    
+    # Handle both formats: raw ABI array or object with 'abi' key
+    if isinstance(contract_data, list):
+        return contract_data
+    if isinstance(contract_data, dict) and 'abi' in contract_data:
+        return contract_data['abi']
+    return None
+
+
 class BlockchainService:
     def __init__(self, web3_provider_url: str = None, contract_addresses: Dict = None, network: str = None):
         """Initialize blockchain service with Web3 provider and contract addresses"""
@@ -26,27 +174,49 @@ class BlockchainService:
                 'rpc_url': 'https://sepolia.base.org',
                 'explorer_url': 'https://sepolia.basescan.org',
                 'gas_price_gwei': 1.0,  # Base Sepolia has lower gas costs
-                'gas_limit_multiplier': 1.2
+                'gas_limit_multiplier': 1.2,
+                'contract_env': {
+                    'identity': 'NIMO_IDENTITY_CONTRACT_BASE_SEPOLIA',
+                    'token': 'NIMO_TOKEN_CONTRACT_BASE_SEPOLIA'
+                }
             },
             'base-mainnet': {
                 'chain_id': 8453,
                 'rpc_url': 'https://mainnet.base.org',
                 'explorer_url': 'https://basescan.org',
                 'gas_price_gwei': 0.1,  # Base mainnet has very low gas costs
-                'gas_limit_multiplier': 1.1
+                'gas_limit_multiplier': 1.1,
+                'contract_env': {
+                    'identity': 'NIMO_IDENTITY_CONTRACT_BASE_MAINNET',
+                    'token': 'NIMO_TOKEN_CONTRACT_BASE_MAINNET'
+                }
             },
             'polygon-mumbai': {
                 'chain_id': 80001,
                 'rpc_url': 'https://rpc-mumbai.maticvigil.com',
                 'explorer_url': 'https://mumbai.polygonscan.com',
                 'gas_price_gwei': 1.0,  # Polygon Mumbai gas prices
-                'gas_limit_multiplier': 1.3
+                'gas_limit_multiplier': 1.3,
+                'contract_env': {
+                    'identity': 'NIMO_IDENTITY_CONTRACT_POLYGON_MUMBAI',
+                    'token': 'NIMO_TOKEN_CONTRACT_POLYGON_MUMBAI'
+                }
             }
         }
         
         self.network = network or os.getenv('NETWORK', 'base-sepolia')
+        # Known networks have a fixed chain ID, so signing never has to ask the node
+        self._chain_id = self.base_config.get(self.network, {}).get('chain_id')
         self.web3_provider_url = web3_provider_url or self._get_network_rpc_url()
-        self.web3 = Web3(Web3.HTTPProvider(self.web3_provider_url))
+        self._session = get_rpc_session()
+        # Shared by every RPC this service retries, so a dead endpoint is
+        # skipped quickly instead of stalling each request thread
+        self._breaker = CircuitBreaker()
+        self.web3 = Web3(Web3.HTTPProvider(
+            self.web3_provider_url,
+            request_kwargs={'timeout': RPC_TIMEOUT},
+            session=self._session
+        ))
         
         # Enhanced contract addresses with network support
         self.contract_addresses = contract_addresses or self._get_network_contracts()
@@ -57,38 +227,73 @@ class BlockchainService:
         # Initialize contracts
         self.identity_contract = self._get_contract('identity')
         self.token_contract = self._get_contract('token')
+        self.multicall_contract = self.web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        
+        # Contract functions used on hot paths, resolved once; contracts are
+        # fixed for the lifetime of the service
+        identity_functions = self.identity_contract.functions if self.identity_contract else None
+        token_functions = self.token_contract.functions if self.token_contract else None
+        self._fn_get_identity = getattr(identity_functions, 'getIdentityByUsername', None)
+        self._fn_create_identity = getattr(identity_functions, 'createIdentity', None)
+        self._fn_batch_create_identity = getattr(identity_functions, 'batchCreateIdentity', None)
+        self._fn_add_contribution = getattr(identity_functions, 'addContribution', None)
+        self._fn_batch_verify = getattr(identity_functions, 'batchVerifyContributions', None)
+        self._fn_balance_of = getattr(token_functions, 'balanceOf', None)
+        
+        # Next nonce per sender, seeded from the chain and then incremented
+        # locally so building a transaction costs no RPC round trip
+        # (refetched after NONCE_IDLE_RESYNC seconds without a transaction)
+        self._nonce_cache = TTLCache(maxsize=1024, ttl=NONCE_IDLE_RESYNC)
+        self._nonce_locks = defaultdict(threading.Lock)
+        # With Redis configured the counters are shared, so workers signing
+        # with the same key never hand out the same nonce
+        self._redis = shared_redis_client()
+        self._reserve_shared_nonces = (self._redis.register_script(_RESERVE_NONCES_LUA)
+                                       if self._redis is not None else None)
+        
+        # Whether the node offers eth_sendRawTransactionSync; unknown until
+        # a caller first asks to wait for a receipt
+        self._send_sync_supported = None
+        
+        # Last block whose contract events have been delivered by poll_events
+        self._last_event_block = None
         
-        # Service account for contract interactions
-        self.service_account = self._load_service_account()
+        # Transaction monitoring, shared by all workers through Redis when
+        # REDIS_URL is set; failures are keyed by transaction hash when
+        # signing got far enough to produce one
+        self.pending_transactions = shared_cache(f'tx_pending:{self.network}', maxsize=MAX_TRACKED_TRANSACTIONS,
+                                                 ttl=TRACKED_TRANSACTION_TTL)
+        self.confirmed_transactions = shared_cache(f'tx_confirmed:{self.network}', maxsize=MAX_TRACKED_TRANSACTIONS,
+                                                   ttl=TRACKED_TRANSACTION_TTL)
+        self.failed_transactions = shared_cache(f'tx_failed:{self.network}', maxsize=MAX_TRACKED_TRANSACTIONS,
+                                                ttl=TRACKED_TRANSACTION_TTL)
         
-        # Transaction monitoring
-        self.pending_transactions = {}
-        self.failed_transactions = {}
+        # Balance, identity and connection reads, reused for about a Base block (2s)
+        # since the state they come from cannot change within one; shared by
+        # all workers through Redis when REDIS_URL is set
+        self._read_cache = shared_cache(f'chain_reads:{self.network}', maxsize=4096, ttl=2)
+        
+        # Fee fields for new transactions, refreshed about once per Base block
+        self._fee_cache = TTLCache(maxsize=1, ttl=2)
+        self._network_gas_price = int(self.base_config.get(self.network, {}).get('gas_price_gwei', 20) * GWEI)
+        
+        # Calldata for COST_PROBE_CALLS, encoded on first use
+        self._cost_probe_calldata: Dict[str, str] = {}
         
         # Gas optimization settings
         self.gas_optimization_enabled = True
         self.batch_processing_enabled = True
+        # Some public providers meter each call in a batch separately, so
+        # JSON-RPC batching of reads can be switched off
+        self.batch_rpc_enabled = os.getenv('BLOCKCHAIN_BATCH_RPC', 'true').lower() == 'true'
     
     def _load_contract_abis(self) -> Dict:
         """Load contract ABIs from build files"""
         abis = {}
-        contracts_dir = os.path.join(os.path.dirname(__file__), '../../contracts/out')
-        
         for contract_name in ['NimoIdentity', 'NimoToken']:
-            # Try clean ABI file first, then fall back to original
-            clean_abi_file = os.path.join(contracts_dir, f'{contract_name}.sol', f'{contract_name}_clean.json')
-            original_abi_file = os.path.join(contracts_dir, f'{contract_name}.sol', f'{contract_name}.json')
-            
-            abi_file = clean_abi_file if os.path.exists(clean_abi_file) else original_abi_file
-            
-            if os.path.exists(abi_file):
-                with open(abi_file, 'r') as f:
-                    contract_data = json.load(f)
-                    # Handle both formats: raw ABI array or object with 'abi' key
-                    if isinstance(contract_data, list):
-                        abis[contract_name.lower().replace('nimo', '')] = contract_data
-                    elif isinstance(contract_data, dict) and 'abi' in contract_data:
-                        abis[contract_name.lower().replace('nimo', '')] = contract_data['abi']
+            abi = _load_abi(contract_name)
+            if abi is not None:
+                abis[contract_name.lower().replace('nimo', '')] = abi
         
         return abis
     
@@ -113,27 +318,14 @@ class BlockchainService:
     
     def _get_network_contracts(self) -> Dict[str, str]:
         """Get contract addresses for the current network"""
-        if self.network == 'base-sepolia':
-            return {
-                'identity': os.getenv('NIMO_IDENTITY_CONTRACT_BASE_SEPOLIA'),
-                'token': os.getenv('NIMO_TOKEN_CONTRACT_BASE_SEPOLIA')
-            }
-        elif self.network == 'base-mainnet':
-            return {
-                'identity': os.getenv('NIMO_IDENTITY_CONTRACT_BASE_MAINNET'),
-                'token': os.getenv('NIMO_TOKEN_CONTRACT_BASE_MAINNET')
-            }
-        elif self.network == 'polygon-mumbai':
-            return {
-                'identity': os.getenv('NIMO_IDENTITY_CONTRACT_POLYGON_MUMBAI'),
-                'token': os.getenv('NIMO_TOKEN_CONTRACT_POLYGON_MUMBAI')
-            }
-        else:
-            return {
-                'identity': os.getenv('NIMO_IDENTITY_CONTRACT'),
-                'token': os.getenv('NIMO_TOKEN_CONTRACT')
-            }
+        contract_env = self.base_config.get(self.network, {}).get('contract_env', DEFAULT_CONTRACT_ENV)
+        return {contract_type: os.getenv(env_var) for contract_type, env_var in contract_env.items()}
 
+    @functools.cached_property
+    def service_account(self):
+        """Service account for contract interactions, loaded on first use"""
+        return self._load_service_account()
+    
     def _load_service_account(self):
         """Load service account for contract interactions"""
         private_key = os.getenv('BLOCKCHAIN_SERVICE_PRIVATE_KEY')
@@ -150,29 +342,90 @@ class BlockchainService:
             return None
     
     def is_connected(self) -> bool:
-        """Check if connected to blockchain"""
-        return self.web3.is_connected()
+        """Check if connected to blockchain, reusing the answer for one block"""
+        connected = self._read_cache.get('connected')
+        if connected is None:
+            connected = self.web3.is_connected()
+            self._read_cache['connected'] = connected
+        return connected
+    
+    def get_connection_pool_stats(self) -> Dict:
+        """Report RPC connection pool usage so saturation is observable"""
+        pools = []
+        for prefix, adapter in self._session.adapters.items():
+            pool_manager = adapter.poolmanager
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools[key]
+                pools.append({
+                    'scheme': prefix.rstrip(':/'),
+                    'host': pool.host,
+                    'connections_created': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'idle_connections': pool.pool.qsize() if pool.pool else 0
+                })
+        
+        return {
+            'pool_maxsize': RPC_POOL_SIZE,
+            'pools': pools
+        }
     
     def _estimate_gas_price(self) -> int:
         """Estimate optimal gas price for Base network"""
         if not self.gas_optimization_enabled:
-            return self.web3.to_wei(self.base_config[self.network]['gas_price_gwei'], 'gwei')
+            return self._network_gas_price
         
         try:
             # Get current gas price from network
-            current_gas_price = self.web3.eth.gas_price
-            
-            # For Base network, gas prices are typically very low
-            # Apply a small buffer for faster confirmation
-            optimal_gas_price = int(current_gas_price * 1.1)
-            
-            # Ensure we don't exceed reasonable limits for Base
-            max_gas_price = self.web3.to_wei(2.0, 'gwei')  # 2 gwei max for Base
-            
-            return min(optimal_gas_price, max_gas_price)
+            return self._buffered_gas_price(self.web3.eth.gas_price)
         except Exception as e:
-            current_app.logger.warning(f"Gas price estimation failed, using default: {e}")
-            return self.web3.to_wei(self.base_config[self.network]['gas_price_gwei'], 'gwei')
+            logger.warning("Gas price estimation failed, using default: %s", e)
+            return self._network_gas_price
+    
+    def _buffered_gas_price(self, current_gas_price: int) -> int:
+        """Gas price to offer given the network's current price"""
+        if not self.gas_optimization_enabled:
+            return self._network_gas_price
+        
+        # For Base network, gas prices are typically very low
+        # Apply a small buffer for faster confirmation
+        optimal_gas_price = int(current_gas_price * 1.1)
+        
+        # Ensure we don't exceed reasonable limits for Base
+        return min(optimal_gas_price, MAX_GAS_PRICE)
+    
+    def _fee_fields(self) -> Dict[str, int]:
+        """
+        Fee fields for a new transaction.
+        
+        EIP-1559 chains get ``maxFeePerGas``/``maxPriorityFeePerGas`` from
+        recent fee history, other chains a legacy ``gasPrice``. The result is
+        cached for about a block, so bursts of transactions share one lookup.
+        """
+        fees = self._fee_cache.get('fees')
+        if fees is None:
+            fees = self._compute_fee_fields()
+            self._fee_cache['fees'] = fees
+        return fees
+    
+    def _compute_fee_fields(self) -> Dict[str, int]:
+        """Look up fee fields from the network (see ``_fee_fields``)"""
+        if self.gas_optimization_enabled:
+            try:
+                history = self.web3.eth.fee_history(5, 'latest', [50])
+                # The last entry is the base fee of the next block
+                next_base_fee = history['baseFeePerGas'][-1]
+                if next_base_fee:
+                    tips = sorted(reward[0] for reward in history['reward']) or [0]
+                    priority_fee = tips[len(tips) // 2]
+                    max_fee = min(2 * next_base_fee + priority_fee, MAX_GAS_PRICE)
+                    return {
+                        'maxFeePerGas': max_fee,
+                        'maxPriorityFeePerGas': min(priority_fee, max_fee)
+                    }
+            except Exception as e:
+                logger.warning("Fee history unavailable, using legacy gas price: %s", e)
+        
+        return {'gasPrice': self._estimate_gas_price()}
     
     def _estimate_gas_limit(self, transaction_data: Dict) -> int:
         """Estimate gas limit for transaction with Base network optimization"""
@@ -188,27 +441,291 @@ class BlockchainService:
             
             return min(gas_limit, max_gas_limit)
         except Exception as e:
-            current_app.logger.warning(f"Gas limit estimation failed, using default: {e}")
+            logger.warning("Gas limit estimation failed, using default: %s", e)
             return 300000  # Default gas limit
     
+    def _rpc(self, fn, *args, **kwargs):
+        """Make an RPC call with retries on transient errors, behind the circuit breaker"""
+        try:
+            return call_with_retry(fn, *args, breaker=self._breaker, **kwargs)
+        except Exception:
+            # Don't keep reporting a connection that just failed
+            self._read_cache.pop('connected')
+            raise
+    
+    def _broadcast(self, signed_txn):
+        """
+        Send a signed transaction, retrying transient errors.
+        
+        Resending the same signed transaction is safe: if an earlier attempt
+        did reach the node, it answers "already known" and the hash is kept.
+        """
+        try:
+            return self._rpc(self.web3.eth.send_raw_transaction, signed_txn.rawTransaction)
+        except ValueError as e:
+            if 'already known' in str(e):
+                return signed_txn.hash
+            raise
+    
+    def _broadcast_sync(self, signed_txn) -> Union[Dict, str, None]:
+        """
+        Send a signed transaction with eth_sendRawTransactionSync and return its receipt.
+        
+        Nodes that support it reply once the transaction is mined, saving
+        the receipt polling round trips. When the node accepted the
+        transaction but gave no receipt (its wait timed out, or it already
+        had the transaction) the transaction hash is returned instead, for
+        the caller to poll. Returns None (and stops trying) when the node
+        does not know the method, so the caller can fall back to ``_broadcast``.
+        """
+        if self._send_sync_supported is False:
+            return None
+        
+        reply = self._rpc(self.web3.provider.make_request, 'eth_sendRawTransactionSync',
+                          [Web3.to_hex(signed_txn.rawTransaction)])
+        if 'result' in reply:
+            self._send_sync_supported = True
+            return reply['result']
+        
+        error = reply.get('error') or {}
+        if error.get('code') == -32601 or 'not found' in str(error.get('message', '')).lower():
+            logger.info("eth_sendRawTransactionSync not supported by node, using eth_sendRawTransaction")
+            self._send_sync_supported = False
+            return None
+        message = str(error.get('message', '')).lower()
+        if error.get('code') == 4 or 'timeout' in message or 'timed out' in message or 'already known' in message:
+            return Web3.to_hex(signed_txn.hash)
+        raise ValueError(error)
+    
+    def _post_batch(self, calls: List[tuple]) -> List[dict]:
+        """
+        Send ``(method, params)`` calls to the node in one JSON-RPC batch request.
+        
+        Returns the raw replies in call order; a call the node did not
+        answer gets an empty dict.
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'id': index, 'method': method, 'params': params}
+            for index, (method, params) in enumerate(calls)
+        ]
+        response = self._rpc(self._session.post, self.web3_provider_url, json=payload, timeout=RPC_TIMEOUT)
+        response.raise_for_status()
+        replies = response.json()
+        if not isinstance(replies, list):
+            raise RuntimeError(f"Batch request failed: {replies.get('error')}")
+        replies_by_id = {reply.get('id'): reply for reply in replies}
+        return [replies_by_id.get(index, {}) for index in range(len(calls))]
+    
+    def _rpc_batch(self, calls: List[tuple]) -> list:
+        """
+        Run independent ``(method, params)`` read calls and return their results.
+        
+        The calls share one HTTP round trip unless ``batch_rpc_enabled`` is
+        off, in which case they are sent one at a time.
+        """
+        if self.batch_rpc_enabled:
+            replies = self._post_batch(calls)
+        else:
+            replies = [self._rpc(self.web3.provider.make_request, method, params)
+                       for method, params in calls]
+        
+        results = []
+        for (method, _), reply in zip(calls, replies):
+            if 'result' not in reply:
+                raise RuntimeError(f"{method} failed: {reply.get('error')}")
+            results.append(reply['result'])
+        return results
+    
+    def _broadcast_many(self, signed_txns: list) -> List[Optional[str]]:
+        """
+        Send several signed transactions in one JSON-RPC batch request.
+        
+        Returns the transaction hashes in order, with None for transactions
+        the node rejected.
+        """
+        replies = self._post_batch([
+            ('eth_sendRawTransaction', [Web3.to_hex(signed_txn.rawTransaction)])
+            for signed_txn in signed_txns
+        ])
+        
+        tx_hashes = []
+        for index, (signed_txn, reply) in enumerate(zip(signed_txns, replies)):
+            if 'result' in reply:
+                tx_hashes.append(reply['result'])
+            elif 'already known' in str(reply.get('error')):
+                tx_hashes.append(Web3.to_hex(signed_txn.hash))
+            else:
+                logger.error("Batched transaction %s rejected: %s", index, reply.get('error'))
+                tx_hashes.append(None)
+        return tx_hashes
+    
+    def _send_pipelined(self, from_address: str, calls: List[tuple]) -> List[Optional[str]]:
+        """
+        Sign and send several contract calls from one sender in a single round trip.
+        
+        Consecutive nonces are reserved up front, every transaction is signed
+        locally, and all of them go out in one batch request; the node accepts
+        them in nonce order.
+        
+        Args:
+            from_address: Sender, signed for with the service account key
+            calls: ``(contract, fn_name, args, gas_limit)`` tuples for
+                ``FIXED_CALL_TYPES`` functions
+        """
+        if not calls:
+            return []
+        
+        first_nonce = self._reserve_nonces(from_address, len(calls))
+        try:
+            signed_txns = []
+            for offset, (contract, fn_name, args, gas) in enumerate(calls):
+                transaction = self._build_fixed_transaction(
+                    contract, fn_name, args, from_address, gas, nonce=first_nonce + offset
+                )
+                signed_txns.append(self.web3.eth.account.sign_transaction(transaction, self.service_account.key))
+            tx_hashes = self._broadcast_many(signed_txns)
+        except Exception:
+            self._reset_nonce(from_address)
+            raise
+        
+        if None in tx_hashes:
+            # A rejected transaction leaves a nonce gap behind it
+            self._reset_nonce(from_address)
+        return [self._track_pending(tx_hash) if tx_hash else None for tx_hash in tx_hashes]
+    
+    def _get_chain_id(self) -> int:
+        """Chain ID for new transactions, asked of the node at most once"""
+        if self._chain_id is None:
+            self._chain_id = self.web3.eth.chain_id
+        return self._chain_id
+    
+    def _next_nonce(self, address: str) -> int:
+        """Reserve the next nonce for ``address``, fetching it from the chain only once"""
+        return self._reserve_nonces(address, 1)
+    
+    def _reserve_nonces(self, address: str, count: int) -> int:
+        """Reserve ``count`` consecutive nonces for ``address`` and return the first"""
+        if self._redis is not None:
+            try:
+                return self._reserve_nonces_shared(address, count)
+            except RedisError as e:
+                logger.warning("Shared nonce counter unavailable, using the local one: %s", e)
+        
+        with self._nonce_locks[address]:
+            nonce = self._nonce_cache.get(address)
+            if nonce is None:
+                # 'pending' also counts transactions still in the mempool
+                nonce = self._rpc(self.web3.eth.get_transaction_count, address, 'pending')
+            self._nonce_cache[address] = nonce + count
+            return nonce
+    
+    def _reserve_nonces_shared(self, address: str, count: int) -> int:
+        """``_reserve_nonces`` backed by a Redis counter shared by every worker"""
+        key = self._nonce_key(address)
+        while True:
+            last = self._reserve_shared_nonces(keys=[key], args=[count, NONCE_IDLE_RESYNC])
+            if last is not None:
+                return int(last) - count
+            # 'pending' also counts transactions still in the mempool; only
+            # the first worker to get here seeds the counter
+            nonce = self._rpc(self.web3.eth.get_transaction_count, address, 'pending')
+            self._redis.set(key, nonce, nx=True, ex=NONCE_IDLE_RESYNC)
+    
+    def _nonce_key(self, address: str) -> str:
+        """Redis key of the shared nonce counter for ``address``"""
+        return f'nimo:nonce:{self.network}:{address.lower()}'
+    
+    def _reset_nonce(self, address: str) -> None:
+        """
+        Forget the cached nonce for ``address`` after a failed transaction.
+        
+        The reserved nonce may never have reached the chain (nonce too low,
+        replacement underpriced, build or signing errors), so the next
+        transaction resyncs from the node instead of leaving a gap.
+        """
+        if self._redis is not None:
+            try:
+                self._redis.delete(self._nonce_key(address))
+            except RedisError as e:
+                logger.warning("Could not reset the shared nonce for %s: %s", address, e)
+        
+        with self._nonce_locks[address]:
+            self._nonce_cache.pop(address)
+    
+    def _build_fixed_transaction(self, contract, fn_name: str, args: list,
+                                 from_address: str, gas: int, nonce: int = None) -> Dict:
+        """
+        Assemble a fixed-gas transaction for one of ``FIXED_CALL_TYPES``.
+        
+        The calldata is the precomputed selector plus ABI-encoded arguments,
+        so no contract function object or ``build_transaction`` is involved.
+        """
+        data = FIXED_CALL_SELECTORS[fn_name] + abi_encode(FIXED_CALL_TYPES[fn_name], args)
+        return {
+            'from': from_address,
+            'to': contract.address,
+            'data': Web3.to_hex(data),
+            'value': 0,
+            'gas': gas,
+            'chainId': self._get_chain_id(),
+            'nonce': self._next_nonce(from_address) if nonce is None else nonce,
+            **self._fee_fields()
+        }
+    
+    def _send_tx(self, contract, fn_name: str, args: list, gas: int,
+                 error_message: str, from_address: str = None, wait: bool = False) -> Optional[str]:
+        """
+        Build, sign and send one of the fixed-gas ``FIXED_CALL_TYPES`` calls.
+        
+        Signs with the service account, which is also the sender unless
+        ``from_address`` is given. With ``wait`` the transaction is sent with
+        eth_sendRawTransactionSync where the node supports it, so it is
+        already confirmed on return. Errors are logged; a transaction the
+        node may already hold is still tracked and its hash returned, and
+        one that was rejected or never sent gives None.
+        """
+        if not contract or not self.service_account:
+            return None
+        
+        from_address = from_address or self.service_account.address
+        signed_txn = None
+        try:
+            transaction = self._build_fixed_transaction(contract, fn_name, args, from_address, gas)
+            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.service_account.key)
+            receipt = self._broadcast_sync(signed_txn) if wait else None
+            if isinstance(receipt, dict):
+                return self._record_receipt(
+                    receipt['transactionHash'], int(receipt['status'], 16) == 1,
+                    int(receipt['blockNumber'], 16), int(receipt['gasUsed'], 16)
+                )['hash']
+            if receipt:
+                # Accepted but not mined yet; the receipt poller takes it from here
+                return self._track_pending(receipt)
+            return self._track_pending(self._broadcast(signed_txn).hex())
+        except Exception as e:
+            logger.error("%s: %s", error_message, e)
+            return self._after_send_error(signed_txn, from_address, e)
+    
     def _build_transaction(self, contract_function, from_address: str, value: int = 0) -> Dict:
         """Build optimized transaction for Base network"""
-        # Build base transaction
+        # Build base transaction; passing the fee fields up front keeps
+        # build_transaction from looking them up again
         transaction = contract_function.build_transaction({
             'from': from_address,
-            'nonce': self.web3.eth.get_transaction_count(from_address),
+            'nonce': self._next_nonce(from_address),
             'value': value,
-            'chainId': self.base_config[self.network]['chain_id']
+            'chainId': self._get_chain_id(),
+            **self._fee_fields()
         })
         
         # Add optimized gas settings
-        transaction['gasPrice'] = self._estimate_gas_price()
         transaction['gas'] = self._estimate_gas_limit(transaction)
         
         return transaction
     
     def _send_transaction(self, transaction: Dict, private_key: str = None) -> Optional[str]:
         """Send transaction with monitoring and retry logic"""
+        signed_txn = None
         try:
             # Use service account key if no private key provided
             key = private_key or self.service_account.key
@@ -217,55 +734,113 @@ class BlockchainService:
             signed_txn = self.web3.eth.account.sign_transaction(transaction, key)
             
             # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            tx_hash_hex = tx_hash.hex()
+            tx_hash_hex = self._track_pending(self._broadcast(signed_txn).hex())
             
-            # Track transaction
-            self.pending_transactions[tx_hash_hex] = {
-                'hash': tx_hash_hex,
-                'timestamp': self._get_current_timestamp(),
-                'status': 'pending'
-            }
-            
-            current_app.logger.info(f"Transaction sent: {tx_hash_hex}")
+            logger.info("Transaction sent: %s", tx_hash_hex)
             return tx_hash_hex
         
         except Exception as e:
-            current_app.logger.error(f"Transaction failed: {e}")
+            logger.error("Transaction failed: %s", e)
+            tx_hash_hex = self._after_send_error(signed_txn, transaction['from'], e)
+            if tx_hash_hex:
+                return tx_hash_hex
             # Track failed transaction
             failed_tx = {
                 'error': str(e),
                 'timestamp': self._get_current_timestamp(),
                 'transaction_data': transaction
             }
-            self.failed_transactions[self._generate_error_id()] = failed_tx
+            failed_id = Web3.to_hex(signed_txn.hash) if signed_txn is not None else self._generate_error_id()
+            self.failed_transactions[failed_id] = failed_tx
+            return None
+    
+    def _after_send_error(self, signed_txn, from_address: str, error: Exception) -> Optional[str]:
+        """
+        Settle a send that raised ``error``, returning the hash to report or None.
+        
+        A rejection from the node (web3 raises ``ValueError`` for JSON-RPC
+        errors) or a failure before signing means the nonce was never used,
+        so it is released. Any other error after signing (a dropped
+        connection or timeout) may have come after the node accepted the
+        transaction: it is tracked as pending instead, so callers don't send
+        it a second time and the receipt poller settles it.
+        """
+        if signed_txn is None or isinstance(error, ValueError):
+            self._reset_nonce(from_address)
             return None
+        return self._track_pending(Web3.to_hex(signed_txn.hash))
+    
+    def _track_pending(self, tx_hash_hex: str) -> str:
+        """Remember a sent transaction until its receipt is seen"""
+        self.pending_transactions[tx_hash_hex] = {
+            'hash': tx_hash_hex,
+            'timestamp': self._get_current_timestamp(),
+            'status': 'pending'
+        }
+        return tx_hash_hex
+    
+    def _record_receipt(self, tx_hash: str, succeeded: bool, block_number: int, gas_used: int) -> Dict:
+        """Move a mined transaction from pending to confirmed and return its status"""
+        status = {
+            'hash': tx_hash,
+            'status': 'success' if succeeded else 'failed',
+            'block_number': block_number,
+            'gas_used': gas_used,
+            'confirmed': True
+        }
+        self.confirmed_transactions[tx_hash] = status
+        self.pending_transactions.pop(tx_hash)
+        return status
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp"""
-        import datetime
-        return datetime.datetime.now().isoformat()
+        return datetime.now().isoformat()
     
     def _generate_error_id(self) -> str:
         """Generate unique error ID"""
-        import uuid
-        return str(uuid.uuid4())[:8]
+        return secrets.token_hex(4)
     
     def create_identity_on_chain(self, username: str, metadata_uri: str, user_address: str) -> Optional[str]:
         """Create identity NFT on blockchain with Base network optimization"""
         if not self.identity_contract or not self.service_account:
             return None
         
+        self.invalidate_reads(username=username)
         try:
             # Build optimized transaction
-            function = self.identity_contract.functions.createIdentity(username, metadata_uri)
+            function = self._fn_create_identity(username, metadata_uri)
             transaction = self._build_transaction(function, user_address)
             
             # Send transaction with monitoring
             return self._send_transaction(transaction)
             
         except Exception as e:
-            current_app.logger.error(f"Error creating identity on-chain: {e}")
+            logger.error("Error creating identity on-chain: %s", e)
+            self._reset_nonce(user_address)
+            return None
+    
+    def batch_create_identity(self,
+                              usernames: List[str],
+                              metadata_uris: List[str],
+                              user_addresses: List[str]) -> Optional[str]:
+        """Create several identity NFTs in one batchCreateIdentity transaction"""
+        if not self.identity_contract or not self.service_account:
+            return None
+        
+        for username in usernames:
+            self.invalidate_reads(username=username)
+        
+        try:
+            owners = [Web3.to_checksum_address(address) for address in user_addresses]
+            function = self._fn_batch_create_identity(
+                usernames, metadata_uris, owners
+            )
+            transaction = self._build_transaction(function, self.service_account.address)
+            return self._send_transaction(transaction)
+            
+        except Exception as e:
+            logger.error("Error batch creating identities on-chain: %s", e)
+            self._reset_nonce(self.service_account.address)
             return None
     
     def add_contribution_on_chain(self, 
@@ -279,7 +854,7 @@ class BlockchainService:
             return None
         
         try:
-            function = self.identity_contract.functions.addContribution(
+            function = self._fn_add_contribution(
                 contribution_type, description, evidence_uri, metta_hash
             )
             
@@ -287,87 +862,78 @@ class BlockchainService:
             return self._send_transaction(transaction)
             
         except Exception as e:
-            current_app.logger.error(f"Error adding contribution on-chain: {e}")
+            logger.error("Error adding contribution on-chain: %s", e)
+            self._reset_nonce(user_address)
             return None
     
-    def verify_contribution_on_chain(self, contribution_id: int, tokens_to_award: int) -> Optional[str]:
+    def verify_contribution_on_chain(self, contribution_id: int, tokens_to_award: int,
+                                     wait: bool = False) -> Optional[str]:
         """Verify contribution and award tokens on blockchain"""
+        return self._send_tx(self.identity_contract, 'verifyContribution',
+                             [contribution_id, tokens_to_award], 150000,
+                             "Error verifying contribution on-chain", wait=wait)
+    
+    def verify_contributions_batch(self, pairs: List[tuple]) -> List[Optional[str]]:
+        """
+        Verify several contributions with one transaction each, sent in a
+        single pipelined round trip.
+        
+        Args:
+            pairs: ``(contribution_id, tokens_to_award)`` pairs
+        """
         if not self.identity_contract or not self.service_account:
-            return None
+            return [None] * len(pairs)
         
         try:
-            function = self.identity_contract.functions.verifyContribution(
-                contribution_id, tokens_to_award
-            )
-            
-            transaction = function.build_transaction({
-                'from': self.service_account.address,
-                'nonce': self.web3.eth.get_transaction_count(self.service_account.address),
-                'gas': 150000,
-                'gasPrice': self.web3.to_wei('20', 'gwei')
-            })
-            
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.service_account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            
-            return tx_hash.hex()
+            return self._send_pipelined(self.service_account.address, [
+                (self.identity_contract, 'verifyContribution', [contribution_id, tokens], 150000)
+                for contribution_id, tokens in pairs
+            ])
         except Exception as e:
-            current_app.logger.error(f"Error verifying contribution on-chain: {e}")
-            return None
+            logger.error("Error verifying contributions on-chain: %s", e)
+            return [None] * len(pairs)
     
-    def execute_metta_rule_on_chain(self, rule: str, identity_id: int, tokens_to_award: int) -> Optional[str]:
+    def execute_metta_rule_on_chain(self, rule: str, identity_id: int, tokens_to_award: int,
+                                    wait: bool = False) -> Optional[str]:
         """Execute MeTTa rule through smart contract"""
-        if not self.identity_contract or not self.service_account:
-            return None
-        
-        try:
-            function = self.identity_contract.functions.executeMeTTaRule(
-                rule, identity_id, tokens_to_award
-            )
-            
-            transaction = function.build_transaction({
-                'from': self.service_account.address,
-                'nonce': self.web3.eth.get_transaction_count(self.service_account.address),
-                'gas': 200000,
-                'gasPrice': self.web3.to_wei('20', 'gwei')
-            })
-            
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.service_account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            
-            return tx_hash.hex()
-        except Exception as e:
-            current_app.logger.error(f"Error executing MeTTa rule on-chain: {e}")
-            return None
+        return self._send_tx(self.identity_contract, 'executeMeTTaRule',
+                             [rule, identity_id, tokens_to_award], 200000,
+                             "Error executing MeTTa rule on-chain", wait=wait)
     
     def mint_tokens_for_contribution(self, 
                                    to_address: str, 
                                    amount: int, 
                                    reason: str, 
-                                   metta_proof: str) -> Optional[str]:
+                                   metta_proof: str,
+                                   wait: bool = False) -> Optional[str]:
         """Mint reputation tokens for verified contributions"""
+        self.invalidate_reads(address=to_address)
+        return self._send_tx(self.token_contract, 'mintForContribution',
+                             [to_address, amount, reason, metta_proof], 150000,
+                             "Error minting tokens", wait=wait)
+    
+    def mint_tokens_batch(self, mints: List[tuple]) -> List[Optional[str]]:
+        """
+        Mint reputation tokens for several contributions, sent in a single
+        pipelined round trip.
+        
+        Args:
+            mints: ``(to_address, amount, reason, metta_proof)`` tuples
+        """
         if not self.token_contract or not self.service_account:
-            return None
+            return [None] * len(mints)
+        
+        for to_address, _, _, _ in mints:
+            self.invalidate_reads(address=to_address)
         
         try:
-            function = self.token_contract.functions.mintForContribution(
-                to_address, amount, reason, metta_proof
-            )
-            
-            transaction = function.build_transaction({
-                'from': self.service_account.address,
-                'nonce': self.web3.eth.get_transaction_count(self.service_account.address),
-                'gas': 150000,
-                'gasPrice': self.web3.to_wei('20', 'gwei')
-            })
-            
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.service_account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            
-            return tx_hash.hex()
+            return self._send_pipelined(self.service_account.address, [
+                (self.token_contract, 'mintForContribution', [to_address, amount, reason, metta_proof], 150000)
+                for to_address, amount, reason, metta_proof in mints
+            ])
         except Exception as e:
-            current_app.logger.error(f"Error minting tokens: {e}")
-            return None
+            logger.error("Error minting tokens: %s", e)
+            return [None] * len(mints)
     
     def create_impact_bond_on_chain(self,
                                   title: str,
@@ -375,61 +941,156 @@ class BlockchainService:
                                   target_amount: int,
                                   maturity_date: int,
                                   milestones: List[str],
-                                  creator_address: str) -> Optional[str]:
+                                  creator_address: str,
+                                  wait: bool = False) -> Optional[str]:
         """Create impact bond on blockchain"""
-        if not self.identity_contract or not self.service_account:
-            return None
+        return self._send_tx(self.identity_contract, 'createImpactBond',
+                             [title, description, target_amount, maturity_date, milestones], 400000,
+                             "Error creating impact bond on-chain", from_address=creator_address, wait=wait)
+    
+    def _multicall(self, contract, fn_name: str, args_list: List[list]) -> List[Optional[tuple]]:
+        """
+        Run the same view function for many argument lists through Multicall3.
         
-        try:
-            function = self.identity_contract.functions.createImpactBond(
-                title, description, target_amount, maturity_date, milestones
-            )
-            
-            transaction = function.build_transaction({
-                'from': creator_address,
-                'nonce': self.web3.eth.get_transaction_count(creator_address),
-                'gas': 400000,
-                'gasPrice': self.web3.to_wei('20', 'gwei')
-            })
-            
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, self.service_account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            
-            return tx_hash.hex()
-        except Exception as e:
-            current_app.logger.error(f"Error creating impact bond on-chain: {e}")
-            return None
+        Returns the decoded outputs in input order, with None for sub-calls
+        that reverted.
+        """
+        fn_abi = contract.get_function_by_name(fn_name).abi
+        output_types = [collapse_if_tuple(output) for output in fn_abi['outputs']]
+        
+        results = []
+        for start in range(0, len(args_list), MULTICALL_BATCH_SIZE):
+            calls = [
+                (contract.address, True, contract.encodeABI(fn_name=fn_name, args=args))
+                for args in args_list[start:start + MULTICALL_BATCH_SIZE]
+            ]
+            for success, return_data in self.multicall_contract.functions.aggregate3(calls).call():
+                results.append(self.web3.codec.decode(output_types, return_data) if success else None)
+        return results
+    
+    @staticmethod
+    def _identity_to_dict(identity_data) -> Dict:
+        """Convert an on-chain Identity struct into the API's dict format"""
+        return {
+            'username': identity_data[0],
+            'metadata_uri': identity_data[1],
+            'reputation_score': identity_data[2],
+            'token_balance': identity_data[3],
+            'is_active': identity_data[4],
+            'created_at': identity_data[5]
+        }
+    
+    def invalidate_reads(self, address: str = None, username: str = None) -> None:
+        """
+        Drop cached reads for a wallet address and/or identity username.
+        
+        Called before writes that change them; callers that know a
+        transaction affected someone (e.g. a verified contribution) can use
+        it too instead of waiting for the cache to expire.
+        """
+        if address:
+            self._read_cache.pop(('balance', address.lower()))
+        if username:
+            self._read_cache.pop(('identity', username))
     
     def get_identity_from_chain(self, username: str) -> Optional[Dict]:
         """Get identity data from blockchain"""
-        if not self.identity_contract:
+        if not self._fn_get_identity:
             return None
         
+        cached = self._read_cache.get(('identity', username))
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            identity_data = self.identity_contract.functions.getIdentityByUsername(username).call()
-            
-            return {
-                'username': identity_data[0],
-                'metadata_uri': identity_data[1],
-                'reputation_score': identity_data[2],
-                'token_balance': identity_data[3],
-                'is_active': identity_data[4],
-                'created_at': identity_data[5]
-            }
+            identity = self._identity_to_dict(self._fn_get_identity(username).call())
         except Exception as e:
-            current_app.logger.error(f"Error getting identity from chain: {e}")
+            logger.error("Error getting identity from chain: %s", e)
             return None
+        
+        self._read_cache[('identity', username)] = identity
+        return dict(identity)
+    
+    def get_identities(self, usernames: List[str]) -> Dict[str, Optional[Dict]]:
+        """Get identity data for many usernames in one Multicall3 request"""
+        if not self.identity_contract or not usernames:
+            return {username: None for username in usernames}
+        
+        identities = {}
+        missing = []
+        for username in usernames:
+            cached = self._read_cache.get(('identity', username))
+            if cached is not None:
+                identities[username] = dict(cached)
+            else:
+                missing.append(username)
+        if not missing:
+            return identities
+        
+        try:
+            outputs = self._multicall(self.identity_contract, 'getIdentityByUsername',
+                                      [[username] for username in missing])
+        except Exception as e:
+            logger.error("Error getting identities from chain: %s", e)
+            return {username: identities.get(username) for username in usernames}
+        
+        for username, output in zip(missing, outputs):
+            identity = self._identity_to_dict(output[0]) if output else None
+            if identity is not None:
+                self._read_cache[('identity', username)] = identity
+                identity = dict(identity)
+            identities[username] = identity
+        return identities
     
     def get_token_balance(self, address: str) -> int:
         """Get token balance for address"""
-        if not self.token_contract:
+        if not self._fn_balance_of:
             return 0
         
+        key = ('balance', address.lower())
+        balance = self._read_cache.get(key)
+        if balance is not None:
+            return balance
+        
         try:
-            return self.token_contract.functions.balanceOf(address).call()
+            balance = self._fn_balance_of(address).call()
         except Exception as e:
-            current_app.logger.error(f"Error getting token balance: {e}")
+            logger.error("Error getting token balance: %s", e)
             return 0
+        
+        self._read_cache[key] = balance
+        return balance
+    
+    def get_token_balances(self, addresses: List[str]) -> Dict[str, int]:
+        """Get token balances for many addresses in one Multicall3 request"""
+        if not self.token_contract or not addresses:
+            return {address: 0 for address in addresses}
+        
+        balances = {}
+        missing = []
+        for address in addresses:
+            balance = self._read_cache.get(('balance', address.lower()))
+            if balance is not None:
+                balances[address] = balance
+            else:
+                missing.append(address)
+        if not missing:
+            return balances
+        
+        try:
+            outputs = self._multicall(self.token_contract, 'balanceOf',
+                                      [[Web3.to_checksum_address(address)] for address in missing])
+        except Exception as e:
+            logger.error("Error getting token balances: %s", e)
+            return {address: balances.get(address, 0) for address in addresses}
+        
+        for address, output in zip(missing, outputs):
+            if output:
+                balances[address] = output[0]
+                self._read_cache[('balance', address.lower())] = output[0]
+            else:
+                balances[address] = 0
+        return balances
     
     def listen_for_events(self, event_filter, callback):
         """Listen for blockchain events"""
@@ -437,50 +1098,79 @@ class BlockchainService:
             for event in event_filter.get_new_entries():
                 callback(event)
         except Exception as e:
-            current_app.logger.error(f"Error listening for events: {e}")
+            logger.error("Error listening for events: %s", e)
     
-    def batch_verify_contributions(self, contributions: List[Dict]) -> List[Optional[str]]:
-        """Batch verify multiple contributions for gas efficiency"""
-        if not self.batch_processing_enabled or not self.identity_contract:
-            # Fall back to individual transactions
-            return [self.verify_contribution_on_chain(c['id'], c['tokens']) for c in contributions]
+    def batch_verify_contributions(self, contributions: List[Dict]) -> Dict:
+        """
+        Verify several contributions in a single batchVerifyContributions transaction.
+        
+        Returns ``batch_tx_hash`` (the one transaction settling every
+        contribution), ``tx_hashes`` (the transactions actually sent),
+        ``count`` and ``retry_job_id``. A batch that cannot be sent is not
+        replayed as one transaction per contribution; it is resent in the
+        background with backoff, and ``retry_job_id`` can be polled with
+        ``utils.background.get_job``.
+        """
+        result = {'batch_tx_hash': None, 'tx_hashes': [], 'count': len(contributions), 'retry_job_id': None}
+        if not self.identity_contract or not self.service_account or not contributions:
+            return result
+        
+        if not self.batch_processing_enabled:
+            # Individual transactions, pipelined in one round trip
+            result['tx_hashes'] = self.verify_contributions_batch(
+                [(c['id'], c['tokens']) for c in contributions]
+            )
+            return result
         
+        tx_hash = self._send_batch_verify(contributions)
+        if tx_hash:
+            result['batch_tx_hash'] = tx_hash
+            result['tx_hashes'] = [tx_hash]
+        else:
+            result['retry_job_id'] = submit_job(self._retry_batch_verify, contributions)
+        return result
+    
+    def _send_batch_verify(self, contributions: List[Dict]) -> Optional[str]:
+        """Send one batchVerifyContributions transaction; None if it failed"""
         try:
-            # Prepare batch data
-            contribution_ids = [c['id'] for c in contributions]
-            token_amounts = [c['tokens'] for c in contributions]
-            
-            function = self.identity_contract.functions.batchVerifyContributions(
-                contribution_ids, token_amounts
+            function = self._fn_batch_verify(
+                [c['id'] for c in contributions], [c['tokens'] for c in contributions]
             )
-            
             transaction = self._build_transaction(function, self.service_account.address)
-            return [self._send_transaction(transaction)] * len(contributions)  # Same tx hash for all
-            
         except Exception as e:
-            current_app.logger.error(f"Batch verification failed, falling back to individual: {e}")
-            # Fall back to individual transactions
-            return [self.verify_contribution_on_chain(c['id'], c['tokens']) for c in contributions]
+            logger.error("Error building batch verification: %s", e)
+            self._reset_nonce(self.service_account.address)
+            return None
+        return self._send_transaction(transaction)
+    
+    def _retry_batch_verify(self, contributions: List[Dict], attempts: int = BATCH_VERIFY_RETRIES,
+                            base_delay: float = 2.0) -> str:
+        """Background job resending a failed batch verification with exponential backoff"""
+        for attempt in range(attempts):
+            time.sleep(base_delay * 2 ** attempt)
+            tx_hash = self._send_batch_verify(contributions)
+            if tx_hash:
+                return tx_hash
+        raise RuntimeError(f"Batch verification of {len(contributions)} contributions "
+                           f"failed after {attempts} retries")
     
     def get_transaction_status(self, tx_hash: str) -> Dict:
         """Get status of a transaction"""
         try:
+            # Receipts already collected by poll_pending_transactions
+            confirmed = self.confirmed_transactions.get(tx_hash)
+            if confirmed is not None:
+                return dict(confirmed)
+            
             # Check if transaction is still pending
             if tx_hash in self.pending_transactions:
                 receipt = self.web3.eth.get_transaction_receipt(tx_hash)
                 
                 if receipt:
                     # Transaction is confirmed
-                    status = 'success' if receipt['status'] == 1 else 'failed'
-                    self.pending_transactions.pop(tx_hash, None)
-                    
-                    return {
-                        'hash': tx_hash,
-                        'status': status,
-                        'block_number': receipt['blockNumber'],
-                        'gas_used': receipt['gasUsed'],
-                        'confirmed': True
-                    }
+                    return dict(self._record_receipt(
+                        tx_hash, receipt['status'] == 1, receipt['blockNumber'], receipt['gasUsed']
+                    ))
                 else:
                     return {
                         'hash': tx_hash,
@@ -489,7 +1179,7 @@ class BlockchainService:
                     }
             
             # Check if it's a failed transaction
-            if any(tx_hash in str(failed) for failed in self.failed_transactions.values()):
+            if tx_hash in self.failed_transactions:
                 return {
                     'hash': tx_hash,
                     'status': 'failed',
@@ -534,30 +1224,262 @@ class BlockchainService:
             }
             
         except Exception as e:
-            current_app.logger.error(f"Error setting up event listeners: {e}")
+            logger.error("Error setting up event listeners: %s", e)
             return {}
     
     def process_contract_events(self, event_filters: Dict, callback_handlers: Dict):
         """Process contract events with callback handlers"""
+        deliveries = []
         for event_name, event_filter in event_filters.items():
+            if event_name not in callback_handlers:
+                continue
+            try:
+                deliveries.extend((event_name, callback_handlers[event_name], event)
+                                  for event in event_filter.get_new_entries())
+            except Exception as e:
+                logger.error("Error processing %s events: %s", event_name, e)
+        self._dispatch_events(deliveries)
+    
+    def _dispatch_events(self, deliveries: List[tuple]) -> int:
+        """
+        Run ``(event_name, handler, event)`` deliveries concurrently on the event thread pool.
+        
+        Each handler runs in a copy of the caller's context. Waits for all
+        of them, so one poll's events are handled before the next poll, and
+        returns how many handlers succeeded.
+        """
+        futures = [
+            (event_name, _event_executor.submit(contextvars.copy_context().run, handler, event))
+            for event_name, handler, event in deliveries
+        ]
+        delivered = 0
+        for event_name, future in futures:
             try:
-                for event in event_filter.get_new_entries():
-                    if event_name in callback_handlers:
-                        callback_handlers[event_name](event)
+                future.result()
+                delivered += 1
             except Exception as e:
-                current_app.logger.error(f"Error processing {event_name} events: {e}")
+                logger.error("Error processing %s event: %s", event_name, e)
+        return delivered
+    
+    def poll_events(self, callback_handlers: Dict) -> int:
+        """
+        Deliver new identity contract events to their handlers.
+        
+        All handled event types since the last poll come back from a single
+        ``eth_getLogs`` call, instead of one ``eth_getFilterChanges`` per
+        filter. The first poll starts from the latest block.
+        
+        Args:
+            callback_handlers: Handler per event name, e.g. ``{'IdentityCreated': fn}``
+            
+        Returns:
+            Number of events delivered
+        """
+        if not self.identity_contract or not callback_handlers:
+            return 0
+        
+        events_by_topic = self._event_topics(callback_handlers)
+        if not events_by_topic:
+            return 0
+        
+        latest_block = self._rpc(lambda: self.web3.eth.block_number)
+        if self._last_event_block is None:
+            self._last_event_block = latest_block - 1
+        from_block = self._last_event_block + 1
+        if from_block > latest_block:
+            return 0
+        to_block = min(latest_block, from_block + MAX_LOG_BLOCK_RANGE - 1)
+        
+        logs = self._rpc(self.web3.eth.get_logs, {
+            'address': self.identity_contract.address,
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'topics': [list(events_by_topic)]
+        })
+        
+        delivered = self._deliver_logs(logs, events_by_topic, callback_handlers)
+        self._last_event_block = to_block
+        return delivered
+    
+    def _event_topics(self, callback_handlers: Dict) -> Dict[str, str]:
+        """Map the topic hash of each handled identity contract event to its name"""
+        return {
+            Web3.to_hex(event_abi_to_log_topic(entry)): entry['name']
+            for entry in self.identity_contract.abi
+            if entry.get('type') == 'event' and entry.get('name') in callback_handlers
+        }
+    
+    def _deliver_logs(self, logs: list, events_by_topic: Dict[str, str], callback_handlers: Dict) -> int:
+        """Decode raw logs and pass each to its event's handler; returns the number delivered"""
+        deliveries = []
+        for log in logs:
+            event_name = events_by_topic.get(Web3.to_hex(log['topics'][0]))
+            if event_name is None:
+                continue
+            try:
+                event = getattr(self.identity_contract.events, event_name)().process_log(log)
+            except Exception as e:
+                logger.error("Error decoding %s event: %s", event_name, e)
+                continue
+            deliveries.append((event_name, callback_handlers[event_name], event))
+        return self._dispatch_events(deliveries)
+    
+    async def stream_events(self, callback_handlers: Dict, ws_url: str = None, interval: float = 3.0):
+        """
+        Deliver identity contract events to their handlers until cancelled.
+        
+        Meant to run as an ``asyncio`` task. With a WebSocket endpoint
+        (``ws_url`` or ``WEB3_WS_URL``) the node pushes matching logs over an
+        ``eth_subscribe`` subscription, reconnecting after errors; otherwise
+        ``poll_events`` runs every ``interval`` seconds.
+        """
+        ws_url = ws_url or os.getenv('WEB3_WS_URL')
+        if ws_url and WebsocketProviderV2 is None:
+            logger.warning("WEB3_WS_URL is set but this web3 version has no WebSocket provider; polling instead")
+            ws_url = None
+        
+        if not ws_url:
+            while True:
+                try:
+                    await asyncio.to_thread(self.poll_events, callback_handlers)
+                except Exception as e:
+                    logger.error("Error polling contract events: %s", e)
+                await asyncio.sleep(interval)
+        
+        if not self.identity_contract:
+            return
+        events_by_topic = self._event_topics(callback_handlers)
+        if not events_by_topic:
+            return
+        
+        while True:
+            try:
+                async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(ws_url)) as ws_web3:
+                    await ws_web3.eth.subscribe('logs', {
+                        'address': self.identity_contract.address,
+                        'topics': [list(events_by_topic)]
+                    })
+                    async for message in ws_web3.ws.process_subscriptions():
+                        # Handlers run off the event loop, so a slow one doesn't
+                        # stop the connection from answering pings
+                        await asyncio.to_thread(self._deliver_logs, [message['result']],
+                                                events_by_topic, callback_handlers)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event subscription failed, reconnecting: %s", e)
+                await asyncio.sleep(interval)
+    
+    def _on_identity_created(self, event) -> None:
+        """Drop the cached read of an identity created elsewhere (another worker or client)"""
+        self.invalidate_reads(username=event['args']['username'])
+    
+    def poll_pending_transactions(self) -> List[Dict]:
+        """
+        Fetch receipts for every pending transaction, ``RECEIPT_BATCH_SIZE`` per batch request.
+        
+        Mined transactions move to ``confirmed_transactions``; their
+        statuses are returned.
+        """
+        tx_hashes = self.pending_transactions.keys()
+        confirmed = []
+        for start in range(0, len(tx_hashes), RECEIPT_BATCH_SIZE):
+            chunk = tx_hashes[start:start + RECEIPT_BATCH_SIZE]
+            replies = self._post_batch([('eth_getTransactionReceipt', [tx_hash]) for tx_hash in chunk])
+            for tx_hash, reply in zip(chunk, replies):
+                receipt = reply.get('result')
+                if receipt:
+                    confirmed.append(self._record_receipt(
+                        tx_hash, int(receipt['status'], 16) == 1,
+                        int(receipt['blockNumber'], 16), int(receipt['gasUsed'], 16)
+                    ))
+        return confirmed
+    
+    def _hold_receipt_poller_lease(self, token: str, ttl: float) -> bool:
+        """
+        Whether this process should poll receipts for the next ``ttl`` seconds.
+        
+        With Redis the pending set is shared, so one worker holds a lease
+        key and polls for everyone; it renews the lease every round and
+        another worker takes over once it lapses. Without Redis each worker
+        polls its own pending set.
+        """
+        if self._redis is None:
+            return True
+        
+        key = f'nimo:receipt_poller:{self.network}'
+        ttl_ms = max(1, int(ttl * 1000))
+        try:
+            if self._redis.set(key, token, nx=True, px=ttl_ms):
+                return True
+            if self._redis.get(key) == token.encode():
+                self._redis.pexpire(key, ttl_ms)
+                return True
+            return False
+        except RedisError as e:
+            logger.warning("Receipt poller lease unavailable, polling locally: %s", e)
+            return True
+    
+    def start_receipt_polling(self, interval: float = 2.0,
+                              stop_event: threading.Event = None) -> threading.Thread:
+        """
+        Run ``poll_pending_transactions`` every ``interval`` seconds on a daemon thread.
+        
+        When the pending set is shared through Redis, only the worker
+        holding the poller lease polls. Set ``stop_event`` to stop the loop.
+        """
+        stop_event = stop_event or threading.Event()
+        token = secrets.token_hex(8)
+        
+        def run():
+            while not stop_event.is_set():
+                try:
+                    if self._hold_receipt_poller_lease(token, interval * 3):
+                        self.poll_pending_transactions()
+                except Exception as e:
+                    logger.error("Error polling transaction receipts: %s", e)
+                stop_event.wait(interval)
+        
+        thread = threading.Thread(target=run, name='nimo-receipts', daemon=True)
+        thread.start()
+        return thread
+    
+    def start_event_polling(self, callback_handlers: Dict, interval: float = 3.0,
+                            stop_event: threading.Event = None) -> threading.Thread:
+        """
+        Run ``poll_events`` every ``interval`` seconds on a daemon thread.
+        
+        Set ``stop_event`` to stop the loop.
+        """
+        stop_event = stop_event or threading.Event()
+        context = contextvars.copy_context()
+        
+        def run():
+            while not stop_event.is_set():
+                try:
+                    self.poll_events(callback_handlers)
+                except Exception as e:
+                    logger.error("Error polling contract events: %s", e)
+                stop_event.wait(interval)
+        
+        thread = threading.Thread(target=context.run, args=(run,), name='nimo-events', daemon=True)
+        thread.start()
+        return thread
     
     def get_network_info(self) -> Dict:
         """Get current network information"""
         try:
-            latest_block = self.web3.eth.get_block('latest')
-            gas_price = self.web3.eth.gas_price
+            block_number, gas_price = (
+                int(result, 16)
+                for result in self._rpc_batch([('eth_blockNumber', []), ('eth_gasPrice', [])])
+            )
             
             return {
                 'network': self.network,
                 'chain_id': self.base_config[self.network]['chain_id'],
-                'connected': self.is_connected(),
-                'latest_block': latest_block['number'],
+                # The node just answered, so no separate handshake is needed
+                'connected': True,
+                'latest_block': block_number,
                 'current_gas_price': gas_price,
                 'current_gas_price_gwei': self.web3.from_wei(gas_price, 'gwei'),
                 'explorer_url': self.base_config[self.network]['explorer_url'],
@@ -572,19 +1494,27 @@ class BlockchainService:
     
     def estimate_transaction_cost(self, operation: str, params: Dict = None) -> Dict:
         """Estimate transaction cost for different operations"""
+        if operation not in COST_PROBE_CALLS:
+            return {'error': 'Unknown operation'}
+        
         try:
-            if operation == 'create_identity':
-                function = self.identity_contract.functions.createIdentity("test", "ipfs://test")
-            elif operation == 'add_contribution':
-                function = self.identity_contract.functions.addContribution("test", "test", "ipfs://test", "0x123")
-            elif operation == 'verify_contribution':
-                function = self.identity_contract.functions.verifyContribution(1, 50)
-            else:
-                return {'error': 'Unknown operation'}
+            calldata = self._cost_probe_calldata.get(operation)
+            if calldata is None:
+                fn_name, args = COST_PROBE_CALLS[operation]
+                calldata = self.identity_contract.encodeABI(fn_name=fn_name, args=args)
+                self._cost_probe_calldata[operation] = calldata
             
-            # Estimate gas
-            gas_estimate = function.estimate_gas({'from': self.service_account.address})
-            gas_price = self._estimate_gas_price()
+            # Estimate gas and read the gas price in one round trip
+            call = {
+                'from': self.service_account.address,
+                'to': self.identity_contract.address,
+                'data': calldata
+            }
+            gas_estimate, current_gas_price = (
+                int(result, 16)
+                for result in self._rpc_batch([('eth_estimateGas', [call]), ('eth_gasPrice', [])])
+            )
+            gas_price = self._buffered_gas_price(current_gas_price)
             
             # Calculate costs
             gas_cost_wei = gas_estimate * gas_price
@@ -614,7 +1544,65 @@ class BlockchainService:
         try:
             # Get recent events and sync with database
             # This is a placeholder for the actual implementation
-            current_app.logger.info("Syncing blockchain data...")
+            logger.info("Syncing blockchain data...")
             pass
         except Exception as e:
-            current_app.logger.error(f"Error syncing blockchain data: {e}")
\ No newline at end of file
+            logger.error("Error syncing blockchain data: %s", e)
+
+
+# Global service instance, shared by every request in the worker
+_blockchain_service = None
+_blockchain_service_lock = threading.Lock()
+
+
+def get_blockchain_service() -> BlockchainService:
+    """
+    Get the global blockchain service instance.
+    
+    The Web3 provider, contract objects and service account are set up
+    once on first use instead of on every request.
+    
+    Returns:
+        BlockchainService: The service instance
+    """
+    global _blockchain_service
+    
+    if _blockchain_service is None:
+        with _blockchain_service_lock:
+            if _blockchain_service is None:
+                _blockchain_service = BlockchainService()
+    
+    return _blockchain_service
+
+
+_background_tasks_started = False
+
+
+def start_background_tasks() -> None:
+    """
+    Start this worker's receipt poller and identity event listener.
+    
+    Runs once per process, so it is safe to call from every ``create_app``.
+    Pending transactions are settled by the receipt poller instead of by
+    request threads, and ``IdentityCreated`` events drop stale cached
+    identity reads. Events are streamed over ``WEB3_WS_URL`` when it is set
+    and polled otherwise.
+    """
+    global _background_tasks_started
+    
+    with _blockchain_service_lock:
+        if _background_tasks_started:
+            return
+        _background_tasks_started = True
+    
+    service = get_blockchain_service()
+    service.start_receipt_polling()
+    
+    if service.identity_contract is None:
+        return
+    handlers = {'IdentityCreated': service._on_identity_created}
+    if os.getenv('WEB3_WS_URL'):
+        threading.Thread(target=asyncio.run, args=(service.stream_events(handlers),),
+                         name='nimo-event-stream', daemon=True).start()
+    else:
+        service.start_event_polling(handlers)
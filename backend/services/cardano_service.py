@@ -6,8 +6,12 @@ and PyCardano, replacing the previous Ethereum/USDC integration.
 """
 
 import os
-import json
 import logging
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 from dataclasses import dataclass
@@ -48,8 +52,76 @@ except ImportError:
     class Address: pass
     class BlockFrostChainContext: pass
 
+import orjson
+import requests
 from flask import current_app
 
+from utils.cache import TTLCache, shared_cache
+
+# Seconds the chain tip is reused before Blockfrost is asked again
+TIP_CACHE_TTL = 5
+
+# Upper bound on how long an address balance is reused within one tip
+BALANCE_CACHE_TTL = 30
+
+# Policy IDs are 28-byte script hashes
+POLICY_ID_SIZE = 28
+
+# Protocol fee parameters only change at epoch boundaries (every 5 days)
+FEE_PARAMS_CACHE_TTL = 3600
+
+# Typical serialized transaction size in bytes per operation, sized so the
+# linear fee (min_fee_a * size + min_fee_b) matches what they cost on mainnet
+EXPECTED_TX_SIZES = {
+    'send_ada': 330,
+    'send_tokens': 1020,
+    'mint_tokens': 2150,
+    'smart_contract': 7830
+}
+
+# Blockfrost chain contexts per worker, i.e. Blockfrost calls in flight at once
+CHAIN_CONTEXT_POOL_SIZE = int(os.getenv('CARDANO_CONTEXT_POOL_SIZE', 8))
+
+# Fans multi-address balance lookups out over the chain context pool
+_balance_executor = ThreadPoolExecutor(max_workers=CHAIN_CONTEXT_POOL_SIZE,
+                                       thread_name_prefix='cardano-balance')
+
+# Errors after which a chain context's connection may be broken
+_CONNECTION_ERRORS = (ConnectionError, requests.ConnectionError, requests.Timeout)
+
+
+class ChainContextPool:
+    """
+    Fixed-size pool of Blockfrost chain contexts shared by request threads.
+    
+    Contexts are created on first use (the first one up front, to validate
+    the configuration) and handed to one caller at a time, so at most
+    ``size`` Blockfrost calls are in flight and concurrent requests don't
+    queue behind a single client. A context whose call failed with a
+    connection error is dropped and rebuilt by the next caller.
+    """
+    
+    def __init__(self, factory, size: int = CHAIN_CONTEXT_POOL_SIZE):
+        self._factory = factory
+        self._contexts = queue.Queue()
+        self._contexts.put(factory())
+        for _ in range(size - 1):
+            self._contexts.put(None)
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a chain context for the duration of the ``with`` block"""
+        context = self._contexts.get()
+        try:
+            if context is None:
+                context = self._factory()
+            yield context
+        except _CONNECTION_ERRORS:
+            context = None
+            raise
+        finally:
+            self._contexts.put(context)
+
 class CardanoNetwork(Enum):
     """Cardano network types"""
     MAINNET = "mainnet"
@@ -122,10 +194,13 @@ class CardanoService:
         # Initialize chain context
         try:
             cardano_network = Network.MAINNET if self.network_name == 'mainnet' else Network.TESTNET
-            self.chain_context = BlockFrostChainContext(
-                project_id=self.config.blockfrost_project_id,
-                network=cardano_network,
-                base_url=self.config.blockfrost_base_url
+            self._contexts = ChainContextPool(
+                lambda: BlockFrostChainContext(
+                    project_id=self.config.blockfrost_project_id,
+                    network=cardano_network,
+                    base_url=self.config.blockfrost_base_url
+                ),
+                size=CHAIN_CONTEXT_POOL_SIZE
             )
             self.available = True
             self.error = None
@@ -143,6 +218,15 @@ class CardanoService:
         # Logging (initialize first)
         self.logger = logging.getLogger(f'cardano_service_{self.network_name}')
         
+        # Latest block slot, and address balances tagged with the slot they
+        # were read at (shared by all workers through Redis when configured)
+        self._tip_cache = TTLCache(maxsize=1, ttl=TIP_CACHE_TTL)
+        self._tip_lock = threading.Lock()
+        # (min_fee_a, min_fee_b) from the current protocol parameters
+        self._fee_params_cache = TTLCache(maxsize=1, ttl=FEE_PARAMS_CACHE_TTL)
+        self._balance_cache = shared_cache(f'cardano_balances:{self.network_name}',
+                                           maxsize=10_000, ttl=BALANCE_CACHE_TTL)
+        
         # Service wallet (for platform operations)
         self.service_signing_key = self._load_service_key()
         self.service_address = None
@@ -154,6 +238,24 @@ class CardanoService:
         self.nimo_token_policy_id = os.getenv('NIMO_TOKEN_POLICY_ID', '')
         self.nimo_token_asset_name = os.getenv('NIMO_TOKEN_ASSET_NAME', 'NIMO')
         self.ada_to_nimo_rate = Decimal(os.getenv('ADA_TO_NIMO_RATE', '100'))  # 1 ADA = 100 NIMO
+        # Rate as an integer fraction, so reward maths stays in integer Lovelace
+        self._nimo_rate_num, self._nimo_rate_den = self.ada_to_nimo_rate.as_integer_ratio()
+        
+        # Token objects reused by every balance, mint and transfer
+        self._nimo_asset_name = AssetName(self.nimo_token_asset_name.encode())
+        self._nimo_asset_name_hex = self._nimo_asset_name.to_primitive().hex()
+        self._nimo_policy_hash = None
+        if self.nimo_token_policy_id:
+            try:
+                policy_id = bytes.fromhex(self.nimo_token_policy_id)
+            except ValueError as e:
+                self.logger.error(f"Invalid NIMO token policy ID: {e}")
+            else:
+                if len(policy_id) == POLICY_ID_SIZE:
+                    self._nimo_policy_hash = ScriptHash.from_primitive(policy_id)
+                else:
+                    self.logger.error(f"Invalid NIMO token policy ID: expected {POLICY_ID_SIZE} bytes, "
+                                      f"got {len(policy_id)}")
     
     def _load_service_key(self) -> Optional[PaymentSigningKey]:
         """Load service wallet signing key"""
@@ -166,8 +268,8 @@ class CardanoService:
             # Try to load from file
             key_file = os.getenv('CARDANO_SERVICE_KEY_FILE', 'service_key.skey')
             if os.path.exists(key_file):
-                with open(key_file, 'r') as f:
-                    key_data = json.load(f)
+                with open(key_file, 'rb') as f:
+                    key_data = orjson.loads(f.read())
                     return PaymentSigningKey.from_primitive(bytes.fromhex(key_data['cborHex']))
             
             self.logger.warning("Service signing key not configured")
@@ -184,7 +286,7 @@ class CardanoService:
         
         try:
             # Try to get latest block to test connection
-            latest_block = self.chain_context.last_block_slot
+            latest_block = self._last_block_slot()
             return latest_block is not None
         except Exception as e:
             self.logger.error(f"Connection test failed: {e}")
@@ -198,47 +300,89 @@ class CardanoService:
         """Convert ADA to Lovelace"""
         return int(ada * Decimal(10 ** self.ADA_DECIMALS))
     
+    def _last_block_slot(self) -> int:
+        """
+        Latest block slot, asked of Blockfrost at most once per TIP_CACHE_TTL seconds.
+        
+        Threads that miss together wait for a single refresh instead of each
+        querying Blockfrost.
+        """
+        slot = self._tip_cache.get('slot')
+        if slot is not None:
+            return slot
+        with self._tip_lock:
+            slot = self._tip_cache.get('slot')
+            if slot is None:
+                with self._contexts.acquire() as chain_context:
+                    slot = chain_context.last_block_slot
+                self._tip_cache['slot'] = slot
+        return slot
+    
+    def _fee_params(self) -> tuple:
+        """Linear fee coefficients (per byte, constant) in Lovelace, cached per epoch"""
+        fee_params = self._fee_params_cache.get('fee_params')
+        if fee_params is None:
+            with self._contexts.acquire() as chain_context:
+                protocol_param = chain_context.protocol_param
+            fee_params = (protocol_param.min_fee_coefficient, protocol_param.min_fee_constant)
+            self._fee_params_cache['fee_params'] = fee_params
+        return fee_params
+    
+    def _invalidate_balances(self, *addresses: str) -> None:
+        """Drop cached balances for addresses a transaction just changed"""
+        for address in addresses:
+            self._balance_cache.pop(address)
+    
     def get_address_balance(self, address: str) -> Dict[str, Any]:
-        """Get ADA and native token balance for address"""
+        """
+        Get ADA and native token balance for address.
+        
+        Balances are reused until a new block is seen, so repeated reads
+        within a block skip the Blockfrost UTXO query.
+        """
         try:
             if not self.available:
                 return {'error': self.error}
             
+            slot = self._last_block_slot()
+            cached = self._balance_cache.get(address)
+            if cached is not None and cached['slot'] == slot:
+                # Callers may annotate the result, so never hand out the cached dict
+                return dict(cached['balance'])
+            
             # Parse address
             addr = Address.from_bech32(address)
             
             # Get UTXOs for address
-            utxos = self.chain_context.utxos(addr)
+            with self._contexts.acquire() as chain_context:
+                utxos = chain_context.utxos(addr)
             
             # Calculate balances
-            total_ada_lovelace = 0
-            native_tokens = {}
+            total_ada_lovelace = sum(utxo.output.amount.coin for utxo in utxos)
             
+            # Native tokens, summed by raw policy/asset bytes so each distinct
+            # key is hex-encoded once rather than once per UTXO
+            token_sums = defaultdict(lambda: defaultdict(int))
             for utxo in utxos:
-                # ADA balance
-                total_ada_lovelace += utxo.output.amount.coin
-                
-                # Native tokens
-                if utxo.output.amount.multi_asset:
-                    for policy_id, assets in utxo.output.amount.multi_asset.data.items():
-                        policy_hex = policy_id.to_primitive().hex()
-                        if policy_hex not in native_tokens:
-                            native_tokens[policy_hex] = {}
-                        
-                        for asset_name, quantity in assets.data.items():
-                            asset_hex = asset_name.to_primitive().hex()
-                            if asset_hex in native_tokens[policy_hex]:
-                                native_tokens[policy_hex][asset_hex] += quantity
-                            else:
-                                native_tokens[policy_hex][asset_hex] = quantity
+                multi_asset = utxo.output.amount.multi_asset
+                if not multi_asset:
+                    continue
+                for policy_id, assets in multi_asset.data.items():
+                    bucket = token_sums[policy_id.to_primitive()]
+                    for asset_name, quantity in assets.data.items():
+                        bucket[asset_name.to_primitive()] += quantity
+            
+            native_tokens = {
+                policy.hex(): {name.hex(): quantity for name, quantity in assets.items()}
+                for policy, assets in token_sums.items()
+            }
             
             # Get NIMO tokens specifically
             nimo_balance = 0
             if self.nimo_token_policy_id in native_tokens:
-                nimo_asset_name_hex = AssetName(self.nimo_token_asset_name.encode()).to_primitive().hex()
-                nimo_balance = native_tokens[self.nimo_token_policy_id].get(nimo_asset_name_hex, 0)
+                nimo_balance = native_tokens[self.nimo_token_policy_id].get(self._nimo_asset_name_hex, 0)
             
-            return {
+            balance = {
                 'success': True,
                 'address': address,
                 'ada_lovelace': total_ada_lovelace,
@@ -247,11 +391,23 @@ class CardanoService:
                 'native_tokens': native_tokens,
                 'utxo_count': len(utxos)
             }
+            self._balance_cache[address] = {'slot': slot, 'balance': balance}
+            return dict(balance)
             
         except Exception as e:
             self.logger.error(f"Error getting balance for {address}: {e}")
             return {'error': str(e)}
     
+    def get_addresses_balance(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get balances for several addresses, keyed by address.
+        
+        Lookups run concurrently, up to one per pooled chain context, and
+        each distinct address is queried once.
+        """
+        unique = list(dict.fromkeys(addresses))
+        return dict(zip(unique, _balance_executor.map(self.get_address_balance, unique)))
+    
     def send_ada(self, 
                  from_address: str,
                  to_address: str, 
@@ -276,25 +432,27 @@ class CardanoService:
             # Convert ADA to Lovelace
             lovelace_amount = self.ada_to_lovelace(ada_amount)
             
-            # Build transaction
-            builder = TransactionBuilder(self.chain_context)
+            with self._contexts.acquire() as chain_context:
+                # Build transaction
+                builder = TransactionBuilder(chain_context)
             
-            # Add output
-            builder.add_output(
-                TransactionOutput(to_addr, Value(lovelace_amount))
-            )
+                # Add output
+                builder.add_output(
+                    TransactionOutput(to_addr, Value(lovelace_amount))
+                )
             
-            # Add metadata if provided
-            if metadata:
-                builder.auxiliary_data = metadata
+                # Add metadata if provided
+                if metadata:
+                    builder.auxiliary_data = metadata
             
-            # Build and sign transaction
-            transaction = builder.build_and_sign([signing_key], from_addr)
+                # Build and sign transaction
+                transaction = builder.build_and_sign([signing_key], from_addr)
             
-            # Submit transaction
-            tx_hash = self.chain_context.submit_tx(transaction)
+                # Submit transaction
+                tx_hash = chain_context.submit_tx(transaction)
             
             self.logger.info(f"ADA transfer sent: {ada_amount} ADA from {from_address} to {to_address}, tx: {tx_hash}")
+            self._invalidate_balances(from_address, to_address)
             
             return {
                 'success': True,
@@ -320,48 +478,46 @@ class CardanoService:
             if not self.available:
                 return {'error': self.error}
             
-            if not self.service_signing_key or not self.nimo_token_policy_id:
+            if not self.service_signing_key or not self._nimo_policy_hash:
                 return {'error': 'Service key or token policy not configured'}
             
             # Parse recipient address
             to_addr = Address.from_bech32(to_address)
             
-            # Create token asset
-            policy_id = ScriptHash.from_primitive(bytes.fromhex(self.nimo_token_policy_id))
-            asset_name = AssetName(self.nimo_token_asset_name.encode())
-            
             # Create multi-asset for minting
             multi_asset = MultiAsset({
-                policy_id: Asset({asset_name: amount})
+                self._nimo_policy_hash: Asset({self._nimo_asset_name: amount})
             })
             
-            # Build transaction with minting
-            builder = TransactionBuilder(self.chain_context)
+            with self._contexts.acquire() as chain_context:
+                # Build transaction with minting
+                builder = TransactionBuilder(chain_context)
             
-            # Add output with tokens
-            builder.add_output(
-                TransactionOutput(
-                    to_addr, 
-                    Value(self.MIN_ADA_UTXO, multi_asset)
+                # Add output with tokens
+                builder.add_output(
+                    TransactionOutput(
+                        to_addr, 
+                        Value(self.MIN_ADA_UTXO, multi_asset)
+                    )
                 )
-            )
             
-            # Add metadata with proof
-            metadata = {
-                "674": {  # CIP-25 metadata standard
-                    "reason": reason,
-                    "metta_proof": metta_proof,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                # Add metadata with proof
+                metadata = {
+                    "674": {  # CIP-25 metadata standard
+                        "reason": reason,
+                        "metta_proof": metta_proof,
+                        "timestamp": datetime.now(timezone.utc).isoformat()
+                    }
                 }
-            }
             
-            # Build and sign transaction
-            transaction = builder.build_and_sign([self.service_signing_key], self.service_address)
+                # Build and sign transaction
+                transaction = builder.build_and_sign([self.service_signing_key], self.service_address)
             
-            # Submit transaction
-            tx_hash = self.chain_context.submit_tx(transaction)
+                # Submit transaction
+                tx_hash = chain_context.submit_tx(transaction)
             
             self.logger.info(f"NIMO tokens minted: {amount} NIMO to {to_address}, tx: {tx_hash}")
+            self._invalidate_balances(to_address, str(self.service_address))
             
             return {
                 'success': True,
@@ -397,33 +553,34 @@ class CardanoService:
             from_addr = Address.from_bech32(from_address)
             to_addr = Address.from_bech32(to_address)
             
-            # Create token asset
-            policy_id = ScriptHash.from_primitive(bytes.fromhex(self.nimo_token_policy_id))
-            asset_name = AssetName(self.nimo_token_asset_name.encode())
+            if not self._nimo_policy_hash:
+                return {'error': 'Token policy not configured'}
             
             # Create multi-asset for transfer
             multi_asset = MultiAsset({
-                policy_id: Asset({asset_name: amount})
+                self._nimo_policy_hash: Asset({self._nimo_asset_name: amount})
             })
             
-            # Build transaction
-            builder = TransactionBuilder(self.chain_context)
+            with self._contexts.acquire() as chain_context:
+                # Build transaction
+                builder = TransactionBuilder(chain_context)
             
-            # Add output with tokens
-            builder.add_output(
-                TransactionOutput(
-                    to_addr,
-                    Value(self.MIN_ADA_UTXO, multi_asset)
+                # Add output with tokens
+                builder.add_output(
+                    TransactionOutput(
+                        to_addr,
+                        Value(self.MIN_ADA_UTXO, multi_asset)
+                    )
                 )
-            )
             
-            # Build and sign transaction
-            transaction = builder.build_and_sign([signing_key], from_addr)
+                # Build and sign transaction
+                transaction = builder.build_and_sign([signing_key], from_addr)
             
-            # Submit transaction
-            tx_hash = self.chain_context.submit_tx(transaction)
+                # Submit transaction
+                tx_hash = chain_context.submit_tx(transaction)
             
             self.logger.info(f"NIMO tokens sent: {amount} NIMO from {from_address} to {to_address}, tx: {tx_hash}")
+            self._invalidate_balances(from_address, to_address)
             
             return {
                 'success': True,
@@ -444,26 +601,28 @@ class CardanoService:
                              contribution_type: str) -> Dict[str, Any]:
         """Calculate ADA and NIMO reward amounts"""
         
-        # Base ADA reward calculation
-        base_ada_amount = Decimal(nimo_amount) / self.ada_to_nimo_rate
+        lovelace_per_ada = 10 ** self.ADA_DECIMALS
+        
+        # Base ADA reward calculation, in Lovelace
+        base_lovelace = nimo_amount * lovelace_per_ada * self._nimo_rate_den // self._nimo_rate_num
         
-        # Apply confidence multiplier
+        # Apply confidence multiplier, in millionths
         confidence_multiplier = max(0.5, min(2.0, confidence + 0.5))  # 0.5x to 2.0x multiplier
-        final_ada_amount = base_ada_amount * Decimal(str(confidence_multiplier))
+        final_lovelace = base_lovelace * round(confidence_multiplier * 1_000_000) // 1_000_000
         
         # Minimum thresholds
-        min_ada_reward = Decimal('0.1')  # 0.1 ADA minimum
+        min_ada_reward_lovelace = 100_000  # 0.1 ADA minimum
         min_confidence_for_ada = 0.7
         
-        pays_ada = (final_ada_amount >= min_ada_reward and 
+        pays_ada = (final_lovelace >= min_ada_reward_lovelace and 
                    confidence >= min_confidence_for_ada)
         
         return {
             'nimo_amount': nimo_amount,
-            'base_ada_amount': float(base_ada_amount),
+            'base_ada_amount': base_lovelace / lovelace_per_ada,
             'confidence': confidence,
             'confidence_multiplier': confidence_multiplier,
-            'final_ada_amount': float(final_ada_amount),
+            'final_ada_amount': final_lovelace / lovelace_per_ada,
             'pays_ada': pays_ada,
             'min_confidence_required': min_confidence_for_ada,
             'contribution_type': contribution_type,
@@ -477,7 +636,8 @@ class CardanoService:
                 return {'error': self.error}
             
             # Query transaction from Blockfrost
-            tx_data = self.chain_context.api.transaction(tx_hash)
+            with self._contexts.acquire() as chain_context:
+                tx_data = chain_context.api.transaction(tx_hash)
             
             if tx_data:
                 return {
@@ -514,7 +674,7 @@ class CardanoService:
                 }
             
             # Get latest block info
-            latest_block_slot = self.chain_context.last_block_slot
+            latest_block_slot = self._last_block_slot()
             
             return {
                 'network': self.network_name,
@@ -557,20 +717,16 @@ class CardanoService:
             if not self.available:
                 return {'error': self.error}
             
-            # Rough fee estimates based on transaction complexity
-            fee_estimates = {
-                'send_ada': 170000,  # ~0.17 ADA
-                'send_tokens': 200000,  # ~0.20 ADA
-                'mint_tokens': 250000,  # ~0.25 ADA
-                'smart_contract': 500000  # ~0.50 ADA
-            }
-            
-            estimated_fee = fee_estimates.get(operation, 200000)
+            # Linear fee from the current protocol parameters for a typical
+            # transaction of this kind
+            min_fee_a, min_fee_b = self._fee_params()
+            tx_size = EXPECTED_TX_SIZES.get(operation, EXPECTED_TX_SIZES['send_tokens'])
+            estimated_fee = min_fee_a * tx_size + min_fee_b
             
             return {
                 'operation': operation,
                 'estimated_fee_lovelace': estimated_fee,
-                'estimated_fee_ada': float(self.lovelace_to_ada(estimated_fee)),
+                'estimated_fee_ada': estimated_fee / 10 ** self.ADA_DECIMALS,
                 'network': self.network_name,
                 'note': 'Estimates are approximate. Actual fees may vary.'
             }
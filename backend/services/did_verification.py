@@ -61,13 +61,15 @@ class DIDVerifier:
         self.cache_ttl = cache_ttl
         self.request_timestamps = {}  # For rate limiting
         
-    def verify_did(self, did: str, proof: Dict[str, Any] = None) -> Dict[str, Any]:
+    def verify_did(self, did: str, proof: Dict[str, Any] = None,
+                   resolver: 'MemoizedResolver' = None) -> Dict[str, Any]:
         """
         Verify a DID and return verification result
         
         Args:
             did: Decentralized Identifier string
             proof: Optional cryptographic proof
+            resolver: Optional request-scoped resolver used to fetch DID documents
             
         Returns:
             Verification result dictionary
@@ -94,7 +96,8 @@ class DIDVerifier:
             verification_result = self._verify_by_method(method, identifier, proof)
             
             # Add DID document resolution
-            did_document = self._resolve_did_document(sanitized_did)
+            resolve = resolver.resolve if resolver else self._resolve_did_document
+            did_document = resolve(sanitized_did)
             
             # Combine results
             result = {
@@ -398,6 +401,26 @@ class DIDVerifier:
                 del self.cache[key]
 
 
+class MemoizedResolver:
+    """
+    Request-scoped DID document resolver.
+    
+    Wraps a DIDVerifier so each DID is fetched at most once for the lifetime
+    of the instance. Create one per HTTP request and discard it afterwards;
+    it holds no cross-request state.
+    """
+    
+    def __init__(self, did_verifier: DIDVerifier):
+        self.did_verifier = did_verifier
+        self._documents: Dict[str, Optional[Dict[str, Any]]] = {}
+    
+    def resolve(self, did: str) -> Optional[Dict[str, Any]]:
+        """Resolve a DID document, reusing an earlier result for the same DID"""
+        if did not in self._documents:
+            self._documents[did] = self.did_verifier._resolve_did_document(did)
+        return self._documents[did]
+
+
 # Integration with MeTTa reasoning
 class MeTTaDIDIntegration:
     """Integration between DID verification and MeTTa reasoning"""
@@ -411,7 +434,8 @@ class MeTTaDIDIntegration:
         """
         self.did_verifier = did_verifier or DIDVerifier()
     
-    def verify_user_identity(self, user_id: str, did: str, proof: Dict[str, Any] = None) -> Dict[str, Any]:
+    def verify_user_identity(self, user_id: str, did: str, proof: Dict[str, Any] = None,
+                             resolver: MemoizedResolver = None) -> Dict[str, Any]:
         """
         Verify user identity using DID and create MeTTa atoms
         
@@ -419,6 +443,7 @@ class MeTTaDIDIntegration:
             user_id: Nimo user ID
             did: Decentralized identifier
             proof: Optional cryptographic proof
+            resolver: Optional request-scoped DID document resolver
             
         Returns:
             Verification result with MeTTa atoms
@@ -428,7 +453,7 @@ class MeTTaDIDIntegration:
             sanitized_user_id = MeTTaSanitizer.sanitize_id(user_id, "user_id")
             
             # Verify DID
-            did_result = self.did_verifier.verify_did(did, proof)
+            did_result = self.did_verifier.verify_did(did, proof, resolver=resolver)
             
             # Create MeTTa atoms for verified identity
             metta_atoms = []
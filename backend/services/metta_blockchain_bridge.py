@@ -8,10 +8,11 @@ MeTTa's autonomous decisions.
 
 import json
 import asyncio
+import threading
 from typing import Dict, Any, Optional, List
 from services.metta_integration_enhanced import get_metta_service
-from services.blockchain_service import BlockchainService
-from services.usdc_integration import USDCIntegration
+from services.blockchain_service import BlockchainService, get_blockchain_service
+from services.usdc_integration import get_usdc_integration
 from models.user import User
 from models.contribution import Contribution, Verification
 from models.bond import BlockchainTransaction
@@ -21,7 +22,7 @@ class MeTTaBlockchainBridge:
         """Initialize the bridge between MeTTa and blockchain services"""
         self.metta_service = metta_service if metta_service is not None else get_metta_service()
         self.blockchain_service = blockchain_service
-        self.usdc_integration = USDCIntegration()
+        self.usdc_integration = get_usdc_integration()
     
     async def verify_contribution_on_chain(self, user_id: int, contribution_id: int, 
                                         evidence: Dict[str, Any]) -> Dict[str, Any]:
@@ -82,22 +83,6 @@ class MeTTaBlockchainBridge:
         
         # Execute verification on blockchain
         try:
-            # Record verification on blockchain
-            tx_hash = await self.blockchain_service.verify_contribution_on_chain(
-                contribution_id=contribution_id,
-                user_address=blockchain_address,
-                tokens_to_award=result['tokens'],
-                proof_hash=result['metta_proof']
-            )
-            
-            # Mint tokens for the verified contribution
-            token_tx = await self.blockchain_service.mint_tokens_for_contribution(
-                to_address=blockchain_address,
-                amount=result['tokens'],
-                reason=f"Verified contribution: {contribution.title}",
-                metta_proof=result['metta_proof']
-            )
-            
             # Calculate USDC reward based on MeTTa confidence and token amount
             usdc_calculation = self.usdc_integration.get_reward_calculation(
                 nimo_amount=result['tokens'],
@@ -105,15 +90,33 @@ class MeTTaBlockchainBridge:
                 contribution_type=contribution.contribution_type
             )
             
-            # Send USDC reward if conditions are met
-            usdc_tx_hash = None
+            # Record the verification, mint tokens and send the USDC reward
+            # (if conditions are met) concurrently; none depends on another
+            calls = [
+                asyncio.to_thread(
+                    self.blockchain_service.verify_contribution_on_chain,
+                    contribution_id=contribution_id,
+                    tokens_to_award=result['tokens']
+                ),
+                asyncio.to_thread(
+                    self.blockchain_service.mint_tokens_for_contribution,
+                    to_address=blockchain_address,
+                    amount=result['tokens'],
+                    reason=f"Verified contribution: {contribution.title}",
+                    metta_proof=result['metta_proof']
+                )
+            ]
             if usdc_calculation['pays_usdc']:
-                usdc_tx_hash = self.usdc_integration.send_usdc_reward(
+                calls.append(asyncio.to_thread(
+                    self.usdc_integration.send_usdc_reward,
                     to_address=blockchain_address,
                     nimo_amount=result['tokens'],
                     contribution_id=str(contribution_id),
                     metta_proof=result['metta_proof']
-                )
+                ))
+            
+            tx_hash, token_tx, *usdc_tx = await asyncio.gather(*calls)
+            usdc_tx_hash = usdc_tx[0] if usdc_tx else None
             
             return {
                 'status': 'verified',
@@ -278,17 +281,28 @@ class MeTTaBlockchainBridge:
         # Execute batch blockchain verification if available
         if verified_contributions:
             try:
-                blockchain_tx_hashes = await self.blockchain_service.batch_verify_contributions(
+                batch = await asyncio.to_thread(
+                    self.blockchain_service.batch_verify_contributions,
                     verified_contributions
                 )
                 
-                # Combine results
-                for i, result in enumerate(metta_results):
+                # One batch transaction settles every verified contribution;
+                # without batching each has its own transaction
+                tx_hashes = iter(batch['tx_hashes'])
+                for result in metta_results:
                     if result.get('verified'):
+                        tx_hash = batch['batch_tx_hash'] or next(tx_hashes, None)
+                        if tx_hash:
+                            status = 'pending'
+                        elif batch['retry_job_id']:
+                            status = 'queued'
+                        else:
+                            status = 'error'
                         blockchain_results.append({
                             **result,
-                            'blockchain_status': 'pending',
-                            'transaction_hash': blockchain_tx_hashes[i] if i < len(blockchain_tx_hashes) else None
+                            'blockchain_status': status,
+                            'transaction_hash': tx_hash,
+                            'retry_job_id': batch['retry_job_id']
                         })
                     else:
                         blockchain_results.append({
@@ -354,7 +368,7 @@ class MeTTaBlockchainBridge:
             # This would query the database for unverified contributions
             
             # Sync blockchain data
-            await self.blockchain_service.sync_blockchain_data()
+            await asyncio.to_thread(self.blockchain_service.sync_blockchain_data)
             
             # Update reputation scores for all users
             # This would iterate through users and update their reputation
@@ -465,4 +479,29 @@ class MeTTaBlockchainBridge:
             'blockchain_service': blockchain_status,
             'network': getattr(self.blockchain_service, 'network', 'unknown'),
             'checked_at': self._get_current_timestamp()
-        }
\ No newline at end of file
+        }
+
+
+# Global bridge instance, shared by every request in the worker
+_metta_blockchain_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def get_metta_blockchain_bridge() -> MeTTaBlockchainBridge:
+    """
+    Get the global MeTTa blockchain bridge instance.
+    
+    Returns:
+        MeTTaBlockchainBridge: The bridge, wired to the shared blockchain
+        and MeTTa services
+    """
+    global _metta_blockchain_bridge
+    
+    if _metta_blockchain_bridge is None:
+        with _bridge_lock:
+            if _metta_blockchain_bridge is None:
+                _metta_blockchain_bridge = MeTTaBlockchainBridge(
+                    get_blockchain_service(), get_metta_service()
+                )
+    
+    return _metta_blockchain_bridge
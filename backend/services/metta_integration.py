@@ -259,7 +259,8 @@ class MeTTaIntegration(BaseMeTTaIntegration):
         import datetime
         return datetime.datetime.now().isoformat()
     
-    def verify_user_did(self, user_id: str, did: str, proof: Dict[str, Any] = None) -> Dict[str, Any]:
+    def verify_user_did(self, user_id: str, did: str, proof: Dict[str, Any] = None,
+                        resolver=None) -> Dict[str, Any]:
         """
         Verify user's decentralized identity and integrate with MeTTa reasoning
         
@@ -267,13 +268,16 @@ class MeTTaIntegration(BaseMeTTaIntegration):
             user_id (str): User ID
             did (str): Decentralized identifier
             proof (Dict[str, Any], optional): Cryptographic proof
+            resolver (MemoizedResolver, optional): Request-scoped DID resolver
             
         Returns:
             Dict[str, Any]: DID verification result with MeTTa integration
         """
         try:
             # Perform DID verification and MeTTa integration
-            result = self.did_integration.verify_user_identity(user_id, did, proof)
+            result = self.did_integration.verify_user_identity(
+                user_id, did, proof, resolver=resolver
+            )
             
             # Add MeTTa atoms to the reasoning space
             for atom in result['metta_atoms']:
@@ -303,13 +307,15 @@ class MeTTaIntegration(BaseMeTTaIntegration):
                 'verification_timestamp': self._get_current_timestamp()
             }
     
-    def verify_contribution_with_identity(self, contribution_id: str, contribution_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    def verify_contribution_with_identity(self, contribution_id: str, contribution_data: Dict[str, Any] = None,
+                                          cache=None) -> Dict[str, Any]:
         """
         Enhanced contribution verification that considers user's verified identity
         
         Args:
             contribution_id (str): Contribution ID
             contribution_data (Dict[str, Any], optional): Contribution data
+            cache (ValidationCache, optional): Request-scoped cache of identity query results
             
         Returns:
             Dict[str, Any]: Enhanced verification result considering identity
@@ -319,8 +325,14 @@ class MeTTaIntegration(BaseMeTTaIntegration):
         
         # Add identity-enhanced verification
         try:
-            identity_verification_query = f'!(VerifyWithIdentity "{contribution_id}")'
-            identity_result = run_metta_query(identity_verification_query)
+            cache_key = ('identity', contribution_id)
+            if cache is not None and cache_key in cache:
+                identity_result = cache.get(cache_key)
+            else:
+                identity_verification_query = f'!(VerifyWithIdentity "{contribution_id}")'
+                identity_result = run_metta_query(identity_verification_query)
+                if cache is not None:
+                    cache.put(cache_key, identity_result)
             
             if identity_result:
                 # Identity verification enhances confidence
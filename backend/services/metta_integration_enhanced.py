@@ -46,7 +46,7 @@ class MeTTaIntegrationService:
             self.is_mock = False
             logger.info("Successfully initialized real MeTTa service")
         except Exception as e:
-            logger.warning(f"Failed to initialize real MeTTa service: {e}")
+            logger.warning("Failed to initialize real MeTTa service: %s", e)
             self._use_mock_service()
     
     def _use_mock_service(self):
@@ -57,7 +57,7 @@ class MeTTaIntegrationService:
             self.is_mock = True
             logger.info("Successfully initialized mock MeTTa service")
         except Exception as e:
-            logger.error(f"Failed to initialize mock MeTTa service: {e}")
+            logger.error("Failed to initialize mock MeTTa service: %s", e)
             raise RuntimeError("Could not initialize any MeTTa service")
     
     def health_check(self) -> Dict[str, Any]:
@@ -77,7 +77,7 @@ class MeTTaIntegrationService:
                     "connected": self.is_connected()
                 }
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             return {
                 "status": "error",
                 "mode": "mock" if self.is_mock else "real",
@@ -92,7 +92,7 @@ class MeTTaIntegrationService:
                 return self.service.is_connected()
             return self.service is not None
         except Exception as e:
-            logger.error(f"Connection check failed: {e}")
+            logger.error("Connection check failed: %s", e)
             return False
     
     def define_user(self, user_id: Union[str, int], username: Optional[str] = None) -> str:
@@ -101,7 +101,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.define_user(user_id_str, username)
         except Exception as e:
-            logger.error(f"Failed to define user {user_id}: {e}")
+            logger.error("Failed to define user %s: %s", user_id, e)
             if not self.is_mock:
                 logger.info("Attempting fallback to mock service")
                 self._use_mock_service()
@@ -114,7 +114,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.add_skill(user_id_str, skill, level)
         except Exception as e:
-            logger.error(f"Failed to add skill for user {user_id}: {e}")
+            logger.error("Failed to add skill for user %s: %s", user_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.add_skill(str(user_id), skill, level)
@@ -133,7 +133,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.add_contribution(contribution_id_str, user_id_str, category, title)
         except Exception as e:
-            logger.error(f"Failed to add contribution {contribution_id}: {e}")
+            logger.error("Failed to add contribution %s: %s", contribution_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.add_contribution(str(contribution_id), str(user_id), category, title)
@@ -152,7 +152,7 @@ class MeTTaIntegrationService:
             evidence_id_str = str(evidence_id) if evidence_id else None
             return self.service.add_evidence(contribution_id_str, evidence_type, evidence_url, evidence_id_str)
         except Exception as e:
-            logger.error(f"Failed to add evidence for contribution {contribution_id}: {e}")
+            logger.error("Failed to add evidence for contribution %s: %s", contribution_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.add_evidence(str(contribution_id), evidence_type, evidence_url, str(evidence_id) if evidence_id else None)
@@ -170,7 +170,7 @@ class MeTTaIntegrationService:
             verifier_id_str = str(verifier_id) if verifier_id else None
             return self.service.verify_contribution(contribution_id_str, organization, verifier_id_str)
         except Exception as e:
-            logger.error(f"Failed to verify contribution {contribution_id}: {e}")
+            logger.error("Failed to verify contribution %s: %s", contribution_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.verify_contribution(str(contribution_id), organization, str(verifier_id) if verifier_id else None)
@@ -182,7 +182,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.set_token_balance(user_id_str, balance)
         except Exception as e:
-            logger.error(f"Failed to set token balance for user {user_id}: {e}")
+            logger.error("Failed to set token balance for user %s: %s", user_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.set_token_balance(str(user_id), balance)
@@ -194,7 +194,7 @@ class MeTTaIntegrationService:
             contribution_id_str = str(contribution_id)
             return self.service.calculate_contribution_confidence(contribution_id_str)
         except Exception as e:
-            logger.error(f"Failed to calculate confidence for contribution {contribution_id}: {e}")
+            logger.error("Failed to calculate confidence for contribution %s: %s", contribution_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.calculate_contribution_confidence(str(contribution_id))
@@ -233,7 +233,7 @@ class MeTTaIntegrationService:
                 return default_result
                 
         except Exception as e:
-            logger.error(f"Failed to validate contribution {contribution_id}: {e}")
+            logger.error("Failed to validate contribution %s: %s", contribution_id, e)
             
             if not self.is_mock:
                 logger.info("Attempting fallback to mock service")
@@ -288,7 +288,7 @@ class MeTTaIntegrationService:
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to auto award for user {user_id}, contribution {contribution_id}: {e}")
+            logger.error("Failed to auto award for user %s, contribution %s: %s", user_id, contribution_id, e)
             
             if not self.is_mock:
                 self._use_mock_service()
@@ -302,7 +302,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.query_user_contributions(user_id_str)
         except Exception as e:
-            logger.error(f"Failed to query contributions for user {user_id}: {e}")
+            logger.error("Failed to query contributions for user %s: %s", user_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.query_user_contributions(str(user_id))
@@ -314,7 +314,7 @@ class MeTTaIntegrationService:
             user_id_str = str(user_id)
             return self.service.query_token_balance(user_id_str)
         except Exception as e:
-            logger.error(f"Failed to query token balance for user {user_id}: {e}")
+            logger.error("Failed to query token balance for user %s: %s", user_id, e)
             if not self.is_mock:
                 self._use_mock_service()
                 return self.service.query_token_balance(str(user_id))
@@ -371,7 +371,7 @@ class MeTTaIntegrationService:
                 self.set_token_balance(user_id, token_balance)
                 
         except Exception as e:
-            logger.error(f"Failed to sync user to MeTTa: {e}")
+            logger.error("Failed to sync user to MeTTa: %s", e)
             if not self.is_mock:
                 self._use_mock_service()
                 self.sync_user_to_metta(user_data)
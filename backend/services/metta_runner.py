@@ -3,6 +3,7 @@ MeTTa Runner for Nimo Project
 This script allows running MeTTa scripts using the Rust REPL without needing the Python bindings.
 """
 import os
+import re
 import sys
 import subprocess
 import json
@@ -110,6 +111,48 @@ def run_metta_query(metta_code):
             except Exception:
                 pass  # If cleanup fails, the temp directory will eventually clean itself
 
+# Prepared query templates by name, compiled once into ``str.format`` callables
+_PREPARED_QUERIES = {}
+
+# Values bound into prepared queries: identifiers only, never MeTTa syntax
+_PARAM_PATTERN = re.compile(r'[\w:.-]{1,128}')
+
+
+def prepare_query(name, template, params):
+    """
+    Register a MeTTa query template for ``run_metta_query_prepared``
+    
+    Args:
+        name: Name the template is run under
+        template: MeTTa code where ``$param`` marks each bound parameter;
+            other ``$variables`` are left to MeTTa
+        params: Names of the bound parameters
+    """
+    fmt = template.replace('{', '{{').replace('}', '}}')
+    for param in params:
+        fmt = re.sub(r'\$%s\b' % re.escape(param), '"{%s}"' % param, fmt)
+    _PREPARED_QUERIES[name] = fmt.format
+
+
+def run_metta_query_prepared(name, params):
+    """
+    Run a query registered with ``prepare_query``
+    
+    Args:
+        name: Name of the prepared template
+        params: Values for the template's bound parameters
+        
+    Returns:
+        The output of the MeTTa query
+        
+    Raises:
+        ValueError: If a value is not a plain identifier
+    """
+    for key, value in params.items():
+        if not _PARAM_PATTERN.fullmatch(str(value)):
+            raise ValueError(f"Invalid value for MeTTa query parameter '{key}'")
+    return run_metta_query(_PREPARED_QUERIES[name](**params))
+
 if __name__ == "__main__":
     # Example usage
     if len(sys.argv) > 1:
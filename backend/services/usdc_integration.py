@@ -5,20 +5,28 @@ This service handles USDC token interactions on Base network,
 integrating with MeTTa reasoning for automated reward payments.
 """
 
+import functools
 import os
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from decimal import Decimal
+import threading
 from web3 import Web3
 from eth_account import Account
 from flask import current_app
 
+from utils.cache import persistent_cache
+from utils.http import RPC_TIMEOUT, get_rpc_session
+
 class USDCIntegration:
     """Service for integrating USDC payments with MeTTa rewards system"""
     
     # USDC has 6 decimals (not 18 like ETH)
     USDC_DECIMALS = 6
     
+    # keccak256("Transfer(address,address,uint256)"), topic0 of ERC20 transfers
+    TRANSFER_TOPIC = bytes.fromhex('ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef')
+    
     # Standard USDC ERC20 ABI (minimal required functions)
     USDC_ABI = [
         {
@@ -128,13 +136,19 @@ class USDCIntegration:
             }
         }
         
-        # Initialize Web3
-        self.web3 = Web3(Web3.HTTPProvider(self.base_config[self.network]['rpc_url']))
+        # Initialize Web3 over a pooled session shared with batched RPC calls
+        self.rpc_url = self.base_config[self.network]['rpc_url']
+        self._session = get_rpc_session()
+        self.web3 = Web3(Web3.HTTPProvider(
+            self.rpc_url,
+            request_kwargs={'timeout': RPC_TIMEOUT},
+            session=self._session
+        ))
         
         # Initialize USDC contract
-        usdc_address = self.base_config[self.network]['usdc_address']
+        self.usdc_address = self.base_config[self.network]['usdc_address']
         self.usdc_contract = self.web3.eth.contract(
-            address=usdc_address,
+            address=self.usdc_address,
             abi=self.USDC_ABI
         )
         
@@ -143,9 +157,15 @@ class USDCIntegration:
         
         # Conversion rates and thresholds
         self.nimo_to_usdc_rate = Decimal('0.01')  # 1 NIMO token = $0.01 USDC
+        # Same rate in micro-USDC (smallest USDC unit) for integer reward math
+        self.nimo_to_usdc_rate_micro = int(self.nimo_to_usdc_rate * 10 ** self.USDC_DECIMALS)
         self.min_confidence_for_usdc = float(os.getenv('METTA_MIN_CONFIDENCE_FOR_USDC', '0.8'))
         self.usdc_enabled = os.getenv('METTA_ENABLE_USDC_PAYMENTS', 'False').lower() == 'true'
         
+        # Mined transactions never change, so verifications are kept until
+        # evicted, on disk when NIMO_CACHE_DIR is configured
+        self._verified_payments = persistent_cache('usdc_payments', maxsize=10_000, ttl=float('inf'))
+        
     def _load_service_account(self):
         """Load service account for USDC payments"""
         private_key = os.getenv('BLOCKCHAIN_SERVICE_PRIVATE_KEY')
@@ -157,6 +177,44 @@ class USDCIntegration:
         """Check if connected to blockchain network"""
         return self.web3.is_connected()
     
+    def batch_rpc(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """
+        Send several JSON-RPC requests to the node in one HTTP round trip
+        
+        Args:
+            calls: (method, params) pairs
+            
+        Returns:
+            Raw ``result`` values in the same order as ``calls``
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'id': index, 'method': method, 'params': params}
+            for index, (method, params) in enumerate(calls)
+        ]
+        response = self._session.post(self.rpc_url, json=payload, timeout=RPC_TIMEOUT)
+        response.raise_for_status()
+        
+        replies = {reply.get('id'): reply for reply in response.json()}
+        results = []
+        for index, (method, _) in enumerate(calls):
+            reply = replies.get(index)
+            if reply is None or 'error' in reply:
+                error = reply.get('error') if reply else 'no response'
+                raise RuntimeError(f"Batched {method} call failed: {error}")
+            results.append(reply['result'])
+        return results
+    
+    def batch_eth_call(self, calls: List[Dict]) -> List[str]:
+        """Run several read-only ``eth_call``s against the latest block in one round trip"""
+        return self.batch_rpc([('eth_call', [call, 'latest']) for call in calls])
+    
+    def _balance_of_call(self, address: str) -> Dict:
+        """Build the ``eth_call`` descriptor for USDC ``balanceOf(address)``"""
+        return {
+            'to': self.usdc_contract.address,
+            'data': self.usdc_contract.encodeABI(fn_name='balanceOf', args=[Web3.to_checksum_address(address)])
+        }
+    
     def get_usdc_balance(self, address: str) -> Decimal:
         """Get USDC balance for address in human-readable format"""
         try:
@@ -289,25 +347,33 @@ class USDCIntegration:
     
     def verify_usdc_payment(self, tx_hash: str) -> Dict:
         """Verify USDC payment transaction"""
+        cache_key = tx_hash.lower()
+        cached = self._verified_payments.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         try:
             receipt = self.web3.eth.get_transaction_receipt(tx_hash)
             
             if receipt['status'] == 1:
-                # Parse transfer event
+                # Find the USDC Transfer log by address and topic, and decode
+                # its fixed layout directly instead of through the contract ABI
+                usdc_address = self.usdc_contract.address.lower()
                 transfer_event = None
                 for log in receipt['logs']:
-                    if log['address'].lower() == self.usdc_contract.address.lower():
-                        # This is a USDC transfer event
-                        decoded = self.usdc_contract.events.Transfer().process_log(log)
+                    topics = log['topics']
+                    if (log['address'].lower() == usdc_address and len(topics) == 3
+                            and bytes(topics[0]) == self.TRANSFER_TOPIC):
+                        value_wei = int.from_bytes(bytes(log['data']), 'big')
                         transfer_event = {
-                            'from': decoded['args']['from'],
-                            'to': decoded['args']['to'],
-                            'value_wei': decoded['args']['value'],
-                            'value_usdc': float(Decimal(decoded['args']['value']) / Decimal(10 ** self.USDC_DECIMALS))
+                            'from': Web3.to_checksum_address(bytes(topics[1])[-20:]),
+                            'to': Web3.to_checksum_address(bytes(topics[2])[-20:]),
+                            'value_wei': value_wei,
+                            'value_usdc': float(Decimal(value_wei) / Decimal(10 ** self.USDC_DECIMALS))
                         }
                         break
                 
-                return {
+                result = {
                     'success': True,
                     'tx_hash': tx_hash,
                     'block_number': receipt['blockNumber'],
@@ -316,11 +382,15 @@ class USDCIntegration:
                     'explorer_url': f"{self.base_config[self.network]['explorer_url']}/tx/{tx_hash}"
                 }
             else:
-                return {
+                result = {
                     'success': False,
                     'tx_hash': tx_hash,
                     'error': 'Transaction failed'
                 }
+            
+            # Only mined transactions get here; pending or unknown ones raise
+            self._verified_payments[cache_key] = result
+            return dict(result)
         except Exception as e:
             return {
                 'success': False,
@@ -333,36 +403,26 @@ class USDCIntegration:
                              confidence: float, 
                              contribution_type: str) -> Dict:
         """Calculate reward amounts including USDC conversion"""
-        # Base USDC amount from NIMO tokens
-        base_usdc_amount = self.convert_nimo_to_usdc_amount(nimo_amount)
-        
-        # Apply confidence multiplier for USDC rewards
-        if confidence >= self.min_confidence_for_usdc:
-            # High confidence contributions get full USDC reward
-            usdc_multiplier = min(1.5, confidence + 0.2)  # Cap at 1.5x, min confidence boost
-        else:
-            # Low confidence contributions get reduced/no USDC reward
-            usdc_multiplier = max(0.1, confidence - 0.2)  # Minimum 10% if very low confidence
-        
-        final_usdc_amount = base_usdc_amount * Decimal(str(usdc_multiplier))
-        
-        # Minimum USDC payout threshold
-        min_usdc_payout = Decimal('0.01')  # $0.01 minimum
-        pays_usdc = (final_usdc_amount >= min_usdc_payout and 
-                    confidence >= self.min_confidence_for_usdc and 
-                    self.usdc_enabled)
-        
-        return {
-            'nimo_amount': nimo_amount,
-            'base_usdc_amount': float(base_usdc_amount),
-            'confidence': confidence,
-            'confidence_multiplier': usdc_multiplier,
-            'final_usdc_amount': float(final_usdc_amount),
-            'pays_usdc': pays_usdc,
-            'min_confidence_required': self.min_confidence_for_usdc,
-            'usdc_enabled': self.usdc_enabled,
-            'contribution_type': contribution_type
-        }
+        # Confidence is bucketed to 3 decimals so repeated previews hit the
+        # cache; the rounded USDC amounts hide the sub-0.1% difference. The
+        # payout threshold is checked on the exact value, so rounding can
+        # never lift a contribution over it.
+        confidence = float(confidence)
+        # Part of the cache key, so it must be hashable; other JSON values
+        # (lists, objects) are reported in their string form
+        if contribution_type is not None and not isinstance(contribution_type, str):
+            contribution_type = str(contribution_type)
+        calculation = _compute_reward_calculation(
+            int(nimo_amount),
+            round(confidence, 3),
+            confidence >= self.min_confidence_for_usdc,
+            contribution_type,
+            self.nimo_to_usdc_rate_micro,
+            self.min_confidence_for_usdc,
+            self.usdc_enabled
+        )
+        # Callers may annotate the result, so never hand out the cached dict
+        return {**calculation, 'confidence': confidence}
     
     def get_service_account_info(self) -> Dict:
         """Get service account information"""
@@ -370,8 +430,14 @@ class USDCIntegration:
             return {'error': 'Service account not configured'}
         
         try:
-            eth_balance = self.web3.eth.get_balance(self.service_account.address)
-            usdc_balance = self.get_usdc_balance(self.service_account.address)
+            # ETH and USDC balances in a single batched round trip
+            address = self.service_account.address
+            eth_balance_hex, usdc_balance_hex = self.batch_rpc([
+                ('eth_getBalance', [address, 'latest']),
+                ('eth_call', [self._balance_of_call(address), 'latest'])
+            ])
+            eth_balance = int(eth_balance_hex, 16)
+            usdc_balance = Decimal(int(usdc_balance_hex, 16)) / Decimal(10 ** self.USDC_DECIMALS)
             
             return {
                 'address': self.service_account.address,
@@ -388,14 +454,19 @@ class USDCIntegration:
     def get_network_status(self) -> Dict:
         """Get network status and configuration"""
         try:
-            latest_block = self.web3.eth.get_block('latest')
-            gas_price = self.web3.eth.gas_price
+            # Block number and gas price in a single batched round trip; a
+            # successful reply also proves the node is reachable
+            latest_block_hex, gas_price_hex = self.batch_rpc([
+                ('eth_blockNumber', []),
+                ('eth_gasPrice', [])
+            ])
+            gas_price = int(gas_price_hex, 16)
             
             return {
                 'network': self.network,
-                'connected': self.is_connected(),
+                'connected': True,
                 'chain_id': self.base_config[self.network]['chain_id'],
-                'latest_block': latest_block['number'],
+                'latest_block': int(latest_block_hex, 16),
                 'gas_price_wei': gas_price,
                 'gas_price_gwei': float(self.web3.from_wei(gas_price, 'gwei')),
                 'usdc_contract': self.base_config[self.network]['usdc_address'],
@@ -411,5 +482,76 @@ class USDCIntegration:
                 'error': str(e)
             }
 
-# Global instance
-usdc_integration = USDCIntegration()
\ No newline at end of file
+_MICRO_USDC = 10 ** USDCIntegration.USDC_DECIMALS
+_MIN_USDC_PAYOUT_MICRO = _MICRO_USDC // 100
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_reward_calculation(nimo_amount: int,
+                                confidence: float,
+                                meets_min_confidence: bool,
+                                contribution_type: str,
+                                nimo_to_usdc_rate_micro: int,
+                                min_confidence_for_usdc: float,
+                                usdc_enabled: bool) -> Dict:
+    """
+    Pure reward calculation behind ``USDCIntegration.get_reward_calculation``.
+    
+    The service configuration is part of the cache key, so a config reload
+    never serves stale results; call ``cache_clear()`` to drop them early.
+    ``confidence`` may be rounded and only sizes the reward;
+    ``meets_min_confidence`` decides eligibility from the exact value.
+    """
+    # Amounts are fixed-point integers in micro-USDC (6 decimals), which is
+    # exact for these values and much cheaper than Decimal arithmetic
+    base_usdc_micro = nimo_amount * nimo_to_usdc_rate_micro
+    
+    # Apply confidence multiplier for USDC rewards
+    if meets_min_confidence:
+        # High confidence contributions get full USDC reward
+        usdc_multiplier = min(1.5, confidence + 0.2)  # Cap at 1.5x, min confidence boost
+    else:
+        # Low confidence contributions get reduced/no USDC reward
+        usdc_multiplier = max(0.1, confidence - 0.2)  # Minimum 10% if very low confidence
+    
+    final_usdc_micro = base_usdc_micro * round(usdc_multiplier * _MICRO_USDC) // _MICRO_USDC
+    
+    # Minimum USDC payout threshold of $0.01
+    pays_usdc = (final_usdc_micro >= _MIN_USDC_PAYOUT_MICRO and 
+                meets_min_confidence and 
+                usdc_enabled)
+    
+    return {
+        'nimo_amount': nimo_amount,
+        'base_usdc_amount': base_usdc_micro / _MICRO_USDC,
+        'confidence': confidence,
+        'confidence_multiplier': usdc_multiplier,
+        'final_usdc_amount': final_usdc_micro / _MICRO_USDC,
+        'pays_usdc': pays_usdc,
+        'min_confidence_required': min_confidence_for_usdc,
+        'usdc_enabled': usdc_enabled,
+        'contribution_type': contribution_type
+    }
+
+
+# Global service instance, created on first use so importing this module
+# never opens network connections
+_usdc_integration = None
+_usdc_integration_lock = threading.Lock()
+
+
+def get_usdc_integration() -> USDCIntegration:
+    """
+    Get the global USDC integration instance.
+    
+    Returns:
+        USDCIntegration: The service instance
+    """
+    global _usdc_integration
+    
+    if _usdc_integration is None:
+        with _usdc_integration_lock:
+            if _usdc_integration is None:
+                _usdc_integration = USDCIntegration()
+    
+    return _usdc_integration
\ No newline at end of file
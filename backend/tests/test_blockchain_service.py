@@ -16,6 +16,7 @@ from web3 import Web3
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from services.blockchain_service import BlockchainService
+from utils.cache import RedisError
 
 
 class MockWeb3:
@@ -53,7 +54,7 @@ class MockEth:
     def __init__(self):
         self.gas_price = 1000000000
     
-    def get_transaction_count(self, address):
+    def get_transaction_count(self, address, block_identifier='latest'):
         return 42
     
     def estimate_gas(self, transaction):
@@ -160,23 +161,11 @@ class MockFunction:
         return 1000  # Mock return value
 
 
-# Mock current_app at module level to avoid Flask context issues
-mock_current_app = Mock()
-mock_current_app.logger = Mock()
-mock_current_app.config = {'USE_METTA_REASONING': False}
-
-with patch('services.blockchain_service.current_app', mock_current_app):
-    pass  # This ensures the patch is applied before class definition
-
 class TestBlockchainService(unittest.TestCase):
     """Test the Blockchain Service"""
     
     def setUp(self):
         """Set up test environment"""
-        # Start Flask current_app patch
-        self.current_app_patcher = patch('services.blockchain_service.current_app', mock_current_app)
-        self.current_app_patcher.start()
-        
         # Mock environment variables
         self.env_patcher = patch.dict(os.environ, {
             'NETWORK': 'base-sepolia',
@@ -239,7 +228,6 @@ class TestBlockchainService(unittest.TestCase):
         self.env_patcher.stop()
         self.web3_patcher.stop()
         self.account_patcher.stop()
-        self.current_app_patcher.stop()
     
     def test_initialization(self):
         """Test blockchain service initialization"""
@@ -261,8 +249,12 @@ class TestBlockchainService(unittest.TestCase):
         """Test blockchain connection status"""
         self.assertTrue(self.blockchain_service.is_connected())
         
-        # Test disconnected state
+        # The result is reused for one block before the node is asked again
         self.mock_web3.is_connected_value = False
+        self.assertTrue(self.blockchain_service.is_connected())
+        
+        # Test disconnected state
+        self.blockchain_service._read_cache.pop('connected')
         self.assertFalse(self.blockchain_service.is_connected())
     
     def test_gas_price_estimation(self):
@@ -273,6 +265,24 @@ class TestBlockchainService(unittest.TestCase):
         self.assertGreater(gas_price, 0)
         self.assertLessEqual(gas_price, self.blockchain_service.web3.to_wei(2.0, 'gwei'))
     
+    def test_fee_fields_eip1559(self):
+        """Test EIP-1559 fee fields are derived from fee history and cached"""
+        fee_history = Mock(return_value={
+            'baseFeePerGas': [50_000_000] * 5 + [60_000_000],
+            'reward': [[1_000_000], [3_000_000], [2_000_000], [2_000_000], [5_000_000]]
+        })
+        self.mock_web3.eth.fee_history = fee_history
+        
+        fees = self.blockchain_service._fee_fields()
+        
+        self.assertEqual(fees['maxPriorityFeePerGas'], 2_000_000)
+        self.assertEqual(fees['maxFeePerGas'], 2 * 60_000_000 + 2_000_000)
+        self.assertNotIn('gasPrice', fees)
+        
+        # A second transaction in the same block reuses the lookup
+        self.blockchain_service._fee_fields()
+        fee_history.assert_called_once()
+    
     def test_gas_limit_estimation(self):
         """Test gas limit estimation"""
         transaction_data = {
@@ -347,13 +357,39 @@ class TestBlockchainService(unittest.TestCase):
             {'id': 3, 'tokens': 100}
         ]
         
-        tx_hashes = self.blockchain_service.batch_verify_contributions(contributions)
+        result = self.blockchain_service.batch_verify_contributions(contributions)
+        
+        # One transaction settles the whole batch
+        self.blockchain_service._send_transaction.assert_called_once()
+        self.assertEqual(result['count'], 3)
+        self.assertEqual(result['tx_hashes'], [result['batch_tx_hash']])
+        self.assertIsNone(result['retry_job_id'])
+    
+    def test_batch_verify_failure_is_queued(self):
+        """Test a failed batch is retried in the background, not sent one by one"""
+        self.blockchain_service._send_transaction = Mock(return_value=None)
+        self.blockchain_service.verify_contributions_batch = Mock()
+        
+        with patch('services.blockchain_service.submit_job', return_value='job-1') as submit:
+            result = self.blockchain_service.batch_verify_contributions([{'id': 1, 'tokens': 50}])
+        
+        submit.assert_called_once()
+        self.blockchain_service.verify_contributions_batch.assert_not_called()
+        self.assertIsNone(result['batch_tx_hash'])
+        self.assertEqual(result['retry_job_id'], 'job-1')
+    
+    def test_verify_contributions_batch(self):
+        """Test pipelined verification reserves consecutive nonces"""
+        self.mock_web3.account.sign_transaction = Mock(side_effect=lambda transaction, key: transaction)
+        
+        with patch.object(self.blockchain_service, '_broadcast_many',
+                          side_effect=lambda signed: ['0x%064x' % tx['nonce'] for tx in signed]) as broadcast:
+            tx_hashes = self.blockchain_service.verify_contributions_batch([(1, 50), (2, 75), (3, 100)])
         
-        # Should return transaction hashes for all contributions
-        self.assertEqual(len(tx_hashes), 3)
-        for tx_hash in tx_hashes:
-            if tx_hash:  # Some might be None if batch processing is disabled
-                self.assertIsNotNone(tx_hash)
+        # All three go out in one batch with nonces 42, 43, 44
+        broadcast.assert_called_once()
+        self.assertEqual([int(tx_hash, 16) for tx_hash in tx_hashes], [42, 43, 44])
+        self.assertEqual(self.blockchain_service._next_nonce(self.mock_account.address), 45)
     
     def test_get_token_balance(self):
         """Test getting token balance"""
@@ -363,6 +399,29 @@ class TestBlockchainService(unittest.TestCase):
         # Should return the mocked balance
         self.assertEqual(balance, 1000)
     
+    def test_get_token_balances(self):
+        """Test getting many token balances in one multicall"""
+        addresses = [
+            "0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266",
+            "0x70997970c51812dc3a010c7d01b50e0d17dc79c8"
+        ]
+        with patch.object(self.blockchain_service, '_multicall', return_value=[(1000,), None]) as multicall:
+            balances = self.blockchain_service.get_token_balances(addresses)
+        
+        # One aggregated request; reverted sub-calls count as zero
+        multicall.assert_called_once()
+        self.assertEqual(balances, {addresses[0]: 1000, addresses[1]: 0})
+    
+    def test_get_identities(self):
+        """Test getting many identities in one multicall"""
+        identity = ("alice", "ipfs://alice", 10, 100, True, 1700000000)
+        with patch.object(self.blockchain_service, '_multicall', return_value=[(identity,), None]):
+            identities = self.blockchain_service.get_identities(["alice", "bob"])
+        
+        self.assertEqual(identities["alice"]["metadata_uri"], "ipfs://alice")
+        self.assertEqual(identities["alice"]["reputation_score"], 10)
+        self.assertIsNone(identities["bob"])
+    
     def test_transaction_status_monitoring(self):
         """Test transaction status monitoring"""
         # Create a test transaction
@@ -375,10 +434,137 @@ class TestBlockchainService(unittest.TestCase):
         self.assertEqual(status['status'], 'success')  # Mock returns success immediately
         self.assertTrue(status['confirmed'])
     
+    def test_poll_pending_transactions(self):
+        """Test receipts for pending transactions are fetched in one batch"""
+        mined, waiting = '0x' + 'ab' * 32, '0x' + 'cd' * 32
+        self.blockchain_service.pending_transactions.clear()
+        self.blockchain_service._track_pending(mined)
+        self.blockchain_service._track_pending(waiting)
+        self.blockchain_service._post_batch = Mock(return_value=[
+            {'result': {'status': '0x1', 'blockNumber': '0x10', 'gasUsed': '0x5208'}},
+            {'result': None}
+        ])
+        
+        confirmed = self.blockchain_service.poll_pending_transactions()
+        
+        self.blockchain_service._post_batch.assert_called_once()
+        self.assertEqual([status['hash'] for status in confirmed], [mined])
+        self.assertEqual(self.blockchain_service.get_transaction_status(mined)['gas_used'], 21000)
+        self.assertEqual(self.blockchain_service.pending_transactions.keys(), [waiting])
+    
+    def test_poll_pending_transactions_in_chunks(self):
+        """Test large pending sets are split into provider-sized batches"""
+        self.blockchain_service.pending_transactions.clear()
+        for index in range(250):
+            self.blockchain_service._track_pending('0x%064x' % index)
+        self.blockchain_service._post_batch = Mock(side_effect=lambda calls: [{'result': None}] * len(calls))
+        
+        self.blockchain_service.poll_pending_transactions()
+        
+        self.assertEqual([len(call.args[0]) for call in self.blockchain_service._post_batch.call_args_list],
+                         [100, 100, 50])
+    
+    def test_receipt_poller_lease(self):
+        """Test only the worker holding the Redis lease polls the shared pending set"""
+        service = self.blockchain_service
+        self.assertTrue(service._hold_receipt_poller_lease('a', 6))
+        
+        service._redis = Mock()
+        service._redis.set.return_value = None
+        service._redis.get.return_value = b'other'
+        self.assertFalse(service._hold_receipt_poller_lease('mine', 6))
+        
+        service._redis.get.return_value = b'mine'
+        self.assertTrue(service._hold_receipt_poller_lease('mine', 6))
+        service._redis.pexpire.assert_called_once_with('nimo:receipt_poller:base-sepolia', 6000)
+    
+    def test_send_sync_falls_back_when_unsupported(self):
+        """Test eth_sendRawTransactionSync is given up after method-not-found"""
+        make_request = Mock(return_value={'error': {'code': -32601, 'message': 'method not found'}})
+        self.blockchain_service.web3.provider = Mock(make_request=make_request)
+        signed_txn = Mock(rawTransaction=b'\x01')
+        
+        self.assertIsNone(self.blockchain_service._broadcast_sync(signed_txn))
+        self.assertIsNone(self.blockchain_service._broadcast_sync(signed_txn))
+        make_request.assert_called_once()
+    
+    def test_send_sync_timeout_is_tracked_as_pending(self):
+        """Test a transaction the node accepted is polled for, not failed"""
+        make_request = Mock(return_value={'error': {'code': 4, 'message': 'wait for receipt timed out'}})
+        self.blockchain_service.web3.provider = Mock(make_request=make_request)
+        signed_txn = Mock(rawTransaction=b'\x01', hash=b'\xab' * 32)
+        tx_hash = '0x' + 'ab' * 32
+        
+        self.assertEqual(self.blockchain_service._broadcast_sync(signed_txn), tx_hash)
+        
+        # A transport error after sending keeps the nonce and tracks the hash
+        self.blockchain_service._reset_nonce = Mock()
+        self.assertEqual(
+            self.blockchain_service._after_send_error(signed_txn, '0xabc', TimeoutError()), tx_hash
+        )
+        self.assertIn(tx_hash, self.blockchain_service.pending_transactions)
+        self.blockchain_service._reset_nonce.assert_not_called()
+        
+        # A rejection from the node releases the nonce
+        self.assertIsNone(self.blockchain_service._after_send_error(signed_txn, '0xabc', ValueError()))
+        self.blockchain_service._reset_nonce.assert_called_once_with('0xabc')
+    
+    def test_shared_nonces_seeded_once(self):
+        """Test nonces come from a Redis counter seeded from the pending count"""
+        service = self.blockchain_service
+        service._redis = Mock()
+        service._reserve_shared_nonces = Mock(side_effect=[None, 45])
+        address = '0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266'
+        
+        self.assertEqual(service._reserve_nonces(address, 3), 42)
+        service._redis.set.assert_called_once_with(
+            'nimo:nonce:base-sepolia:' + address, 42, nx=True, ex=300
+        )
+        
+        service._reset_nonce(address)
+        service._redis.delete.assert_called_once_with('nimo:nonce:base-sepolia:' + address)
+    
+    def test_shared_nonces_fall_back_when_redis_fails(self):
+        """Test a Redis outage falls back to the in-process nonce cache"""
+        service = self.blockchain_service
+        service._redis = Mock()
+        service._redis.delete.side_effect = RedisError('connection refused')
+        service._reserve_shared_nonces = Mock(side_effect=RedisError('connection refused'))
+        address = '0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266'
+        
+        self.assertEqual(service._reserve_nonces(address, 1), 42)
+        self.assertEqual(service._reserve_nonces(address, 1), 43)
+        
+        # Resetting must not replace the transaction error being handled
+        service._reset_nonce(address)
+        self.assertIsNone(service._nonce_cache.get(address))
+    
+    def test_read_cache(self):
+        """Test balance reads are reused until invalidated"""
+        balance_of = Mock(return_value=MockFunction())
+        self.blockchain_service._fn_balance_of = balance_of
+        address = '0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266'
+        
+        self.assertEqual(self.blockchain_service.get_token_balance(address), 1000)
+        self.assertEqual(self.blockchain_service.get_token_balance(address.upper()), 1000)
+        self.assertEqual(balance_of.call_count, 1)
+        
+        self.blockchain_service.invalidate_reads(address=address)
+        self.blockchain_service.get_token_balance(address)
+        self.assertEqual(balance_of.call_count, 2)
+    
     def test_network_info(self):
         """Test getting network information"""
+        self.blockchain_service._post_batch = Mock(return_value=[
+            {'result': '0x3039'}, {'result': '0x3b9aca00'}
+        ])
         network_info = self.blockchain_service.get_network_info()
         
+        # Block number and gas price come back from a single batch request
+        self.blockchain_service._post_batch.assert_called_once()
+        self.assertEqual(network_info['latest_block'], 12345)
+        self.assertEqual(network_info['current_gas_price'], 10 ** 9)
+        
         # Check network info structure
         self.assertEqual(network_info['network'], 'base-sepolia')
         self.assertEqual(network_info['chain_id'], 84532)
@@ -391,6 +577,9 @@ class TestBlockchainService(unittest.TestCase):
         """Test transaction cost estimation"""
         # Test different operations
         operations = ['create_identity', 'add_contribution', 'verify_contribution']
+        self.blockchain_service._post_batch = Mock(return_value=[
+            {'result': '0x30d40'}, {'result': '0x3b9aca00'}
+        ])
         
         for operation in operations:
             cost_estimate = self.blockchain_service.estimate_transaction_cost(operation)
@@ -401,6 +590,7 @@ class TestBlockchainService(unittest.TestCase):
             self.assertIn('gas_price_wei', cost_estimate)
             self.assertIn('total_cost_eth', cost_estimate)
             self.assertEqual(cost_estimate['operation'], operation)
+            self.assertEqual(cost_estimate['gas_estimate'], 200000)
     
     def test_event_listeners_setup(self):
         """Test setting up blockchain event listeners"""
@@ -0,0 +1,195 @@
+"""
+Tests for the in-process TTL cache used by routes and services.
+"""
+
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import cache as cache_module
+from utils.cache import RedisTTLCache, TTLCache, ValidationCache, persistent_cache, shared_cache
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test TTLCache expiry and eviction"""
+
+    def test_set_and_get(self):
+        """Stored values are returned until they expire"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache['user-1'] = True
+
+        self.assertIn('user-1', cache)
+        self.assertTrue(cache.get('user-1'))
+        self.assertIsNone(cache.get('user-2'))
+
+    def test_entries_expire(self):
+        """Entries are dropped once their TTL elapses"""
+        cache = TTLCache(maxsize=10, ttl=5)
+
+        with patch('utils.cache.time.monotonic', return_value=100.0):
+            cache.set('key', 'value')
+        with patch('utils.cache.time.monotonic', return_value=104.0):
+            self.assertEqual(cache.get('key'), 'value')
+        with patch('utils.cache.time.monotonic', return_value=106.0):
+            self.assertIsNone(cache.get('key'))
+            self.assertEqual(len(cache), 0)
+
+    def test_per_entry_ttl_override(self):
+        """An explicit ttl takes precedence over the cache default"""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        with patch('utils.cache.time.monotonic', return_value=0.0):
+            cache.set('short', 1, ttl=1)
+        with patch('utils.cache.time.monotonic', return_value=2.0):
+            self.assertNotIn('short', cache)
+
+    def test_keys_skip_expired(self):
+        """keys() lists only entries that have not expired"""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        with patch('utils.cache.time.monotonic', return_value=0.0):
+            cache.set('short', 1, ttl=1)
+            cache.set('long', 2)
+        with patch('utils.cache.time.monotonic', return_value=2.0):
+            self.assertEqual(cache.keys(), ['long'])
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted at maxsize"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_pop_and_clear(self):
+        """Entries can be invalidated individually or all at once"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache['a'] = 1
+        cache['b'] = 2
+
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+
+class TestValidationCache(unittest.TestCase):
+    """Test the request-scoped validation cache"""
+
+    def test_keeps_most_recent_results(self):
+        """Only the maxsize most recently used results are kept"""
+        cache = ValidationCache(maxsize=2)
+        cache.put(('identity', '1'), True)
+        cache.put(('identity', '2'), False)
+        cache.get(('identity', '1'))
+        cache.put(('identity', '3'), True)
+
+        self.assertIn(('identity', '1'), cache)
+        self.assertNotIn(('identity', '2'), cache)
+        self.assertFalse(cache.get(('identity', '2'), False))
+        self.assertEqual(len(cache), 2)
+
+    def test_caches_falsy_results(self):
+        """A falsy result is still a cache hit"""
+        cache = ValidationCache()
+        cache.put(('identity', '1'), None)
+
+        self.assertIn(('identity', '1'), cache)
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Test the choice between on-disk and in-memory caches"""
+
+    def test_in_memory_without_cache_dir(self):
+        """Without NIMO_CACHE_DIR the cache stays in process memory"""
+        with patch.object(cache_module, 'CACHE_DIR', None):
+            cache = persistent_cache('payments', maxsize=5, ttl=30)
+
+        self.assertIsInstance(cache, TTLCache)
+        self.assertEqual(cache.maxsize, 5)
+
+    def test_in_memory_without_diskcache(self):
+        """A configured directory is ignored when diskcache is missing"""
+        with patch.object(cache_module, 'CACHE_DIR', '/tmp/nimo-cache'), \
+                patch.object(cache_module, 'diskcache', None):
+            cache = persistent_cache('payments')
+
+        self.assertIsInstance(cache, TTLCache)
+
+    @unittest.skipIf(cache_module.diskcache is None, "diskcache not installed")
+    def test_on_disk_with_cache_dir(self):
+        """Entries survive reopening the cache directory"""
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(cache_module, 'CACHE_DIR', directory):
+            persistent_cache('payments', ttl=float('inf'))['0xabc'] = {'success': True}
+            reopened = persistent_cache('payments', ttl=float('inf'))
+
+            self.assertEqual(reopened.get('0xabc'), {'success': True})
+
+
+
+class TestSharedCache(unittest.TestCase):
+    """Test the Redis-backed cache and its in-memory fallback"""
+
+    def test_in_memory_without_redis_url(self):
+        """Without REDIS_URL the cache stays in process memory"""
+        with patch.object(cache_module, 'REDIS_URL', None):
+            cache = shared_cache('chain_reads', maxsize=5, ttl=2)
+
+        self.assertIsInstance(cache, TTLCache)
+        self.assertEqual(cache.maxsize, 5)
+
+    def test_in_memory_without_redis(self):
+        """A configured server is ignored when the redis client is missing"""
+        with patch.object(cache_module, 'REDIS_URL', 'redis://localhost:6379/0'), \
+                patch.object(cache_module, 'redis', None):
+            cache = shared_cache('chain_reads')
+
+        self.assertIsInstance(cache, TTLCache)
+
+    def test_redis_entries_are_namespaced_json(self):
+        """Keys are prefixed with the namespace and values stored as JSON with a TTL"""
+        client = Mock()
+        cache = RedisTTLCache(client, 'nimo:chain_reads', ttl=2)
+        balance = 1500 * 10 ** 18
+
+        cache[('balance', '0xabc')] = balance
+        client.set.assert_called_once_with('nimo:chain_reads:balance:0xabc', str(balance), px=2000)
+
+        client.get.return_value = str(balance).encode()
+        self.assertEqual(cache.get(('balance', '0xabc')), balance)
+
+        client.get.return_value = None
+        self.assertIsNone(cache.get(('balance', '0xdef')))
+
+
+    def test_redis_keys_strip_namespace(self):
+        """keys() returns entry keys without the namespace prefix"""
+        client = Mock()
+        client.scan_iter.return_value = [b'nimo:tx_pending:base-sepolia:0xab']
+        cache = RedisTTLCache(client, 'nimo:tx_pending:base-sepolia')
+
+        self.assertEqual(cache.keys(), ['0xab'])
+        client.scan_iter.assert_called_once_with(match='nimo:tx_pending:base-sepolia:*')
+
+    def test_redis_scan_errors_degrade(self):
+        """keys() and len() report an empty cache while Redis is unreachable"""
+        client = Mock()
+        client.scan_iter.side_effect = cache_module.RedisError('connection refused')
+        cache = RedisTTLCache(client, 'nimo:tx_pending:base-sepolia')
+
+        self.assertEqual(cache.keys(), [])
+        self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the RPC retry and circuit breaker helpers.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import requests
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.http import CircuitBreaker, RPCUnavailableError, call_with_retry
+
+
+def _http_error(status):
+    response = Mock(status_code=status)
+    return requests.HTTPError(response=response)
+
+
+@patch('utils.http.time.sleep')
+class TestCallWithRetry(unittest.TestCase):
+    """Test retrying transient RPC errors"""
+
+    def test_retries_transient_errors(self, sleep):
+        """Rate limits and connection errors are retried until success"""
+        fn = Mock(side_effect=[_http_error(429), requests.ConnectionError(), 42])
+
+        self.assertEqual(call_with_retry(fn, 'arg', max_attempts=3), 42)
+        self.assertEqual(fn.call_count, 3)
+        fn.assert_called_with('arg')
+
+    def test_raises_other_errors_immediately(self, sleep):
+        """Errors such as reverts or bad nonces are not retried"""
+        fn = Mock(side_effect=ValueError('nonce too low'))
+
+        with self.assertRaises(ValueError):
+            call_with_retry(fn)
+        fn.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self, sleep):
+        """The last transient error is raised once attempts run out"""
+        fn = Mock(side_effect=_http_error(503))
+
+        with self.assertRaises(requests.HTTPError):
+            call_with_retry(fn, max_attempts=2)
+        self.assertEqual(fn.call_count, 2)
+
+    def test_open_breaker_refuses_calls(self, sleep):
+        """Repeated failures open the breaker and later calls are refused"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        fn = Mock(side_effect=requests.Timeout())
+
+        with self.assertRaises(RPCUnavailableError):
+            call_with_retry(fn, breaker=breaker, max_attempts=3)
+        self.assertEqual(fn.call_count, 2)
+
+        with self.assertRaises(RPCUnavailableError):
+            call_with_retry(Mock(return_value=1), breaker=breaker)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test circuit breaker state changes"""
+
+    def test_success_closes_breaker(self):
+        """A successful probe after the timeout closes the breaker"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        with patch('utils.http.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+
+        with patch('utils.http.time.monotonic', return_value=131.0):
+            self.assertTrue(breaker.allow())
+            breaker.record_success()
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Background job runner for Nimo Platform.
+Runs slow, blocking work (blockchain transactions, RPC calls) on a shared
+thread pool so request handlers can return immediately, and keeps a short
+record of each job's state for status polling. Only the thread pool is
+per-process: job records live in the shared cache, so with REDIS_URL set
+any worker can answer a status poll and records survive a restart.
+"""
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app
+
+from utils.cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('BACKGROUND_WORKERS', 4)),
+    thread_name_prefix='nimo-job'
+)
+
+# Job records are kept for an hour after submission, which is plenty of
+# time for clients to poll for the outcome
+_jobs = shared_cache('jobs', maxsize=10_000, ttl=3600)
+
+
+def submit_job(func: Callable[..., Any], *args: Any, job_owner: Any = None, **kwargs: Any) -> str:
+    """
+    Run ``func(*args, **kwargs)`` in the background inside an app context.
+
+    Args:
+        job_owner: Optional owner (e.g. user ID) stored on the job record,
+            so status routes can check who may see it
+
+    Returns:
+        Job ID that can be passed to ``get_job``
+    """
+    app = current_app._get_current_object()
+    job_id = uuid.uuid4().hex
+
+    def record(state, result=None, error=None):
+        _jobs[job_id] = {"job_id": job_id, "owner": job_owner, "state": state,
+                         "result": result, "error": error}
+
+    record("pending")
+
+    def run():
+        record("running")
+        try:
+            with app.app_context():
+                result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error("Background job %s failed: %s", job_id, e)
+            record("failed", error=str(e))
+        else:
+            record("succeeded", result=result)
+
+    _executor.submit(run)
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return the status record for a job, or None if unknown or expired"""
+    return _jobs.get(job_id)
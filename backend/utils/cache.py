@@ -0,0 +1,313 @@
+"""
+In-process caching utilities for Nimo Platform.
+Provides a bounded, thread-safe TTL cache for memoizing expensive lookups
+(MeTTa queries, RPC reads) across requests within a worker process, an
+optional on-disk variant that survives worker restarts, and an optional
+Redis variant shared by every worker.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import redis
+    from redis import RedisError
+except ImportError:
+    redis = None
+
+    class RedisError(Exception):
+        """Stand-in so ``except RedisError`` works without redis installed"""
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Directory for caches that should survive restarts; unset keeps them in memory
+CACHE_DIR = os.environ.get('NIMO_CACHE_DIR')
+
+# Redis server for caches shared across workers; unset keeps them in memory
+REDIS_URL = os.environ.get('REDIS_URL')
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion.
+
+    When ``maxsize`` is reached the least recently used entry is evicted.
+    All operations are guarded by a lock so one instance can be shared by
+    every request thread in a worker.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, optionally overriding the default TTL"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value (expired or not)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def keys(self) -> list:
+        """Snapshot of the keys that have not expired yet"""
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, (_, expires_at) in self._data.items() if expires_at > now]
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class ValidationCache:
+    """Small LRU of recent validation results, scoped to a single request.
+
+    Keys are ``(entity, context)`` tuples such as ``('identity', contribution_id)``.
+    Only the ``maxsize`` most recently used results are kept, and nothing is
+    shared between requests, so no locking or expiry is needed.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached result for ``key`` or ``default``"""
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a result, evicting the least recently used one at capacity"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskTTLCache:
+    """``TTLCache`` lookalike stored with ``diskcache`` in a SQLite file.
+
+    Entries outlive worker restarts and are shared by every worker process
+    on the host. ``diskcache`` handles its own locking and culls entries once
+    the size limit is reached.
+    """
+
+    def __init__(self, directory: str, ttl: float = 60.0):
+        self.ttl = ttl
+        self._cache = diskcache.Cache(directory)
+
+    def _expire(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return None if ttl == float('inf') else ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired"""
+        return self._cache.get(key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, optionally overriding the default TTL"""
+        self._cache.set(key, value, expire=self._expire(ttl))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value"""
+        return self._cache.pop(key, default)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._cache.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._cache
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def persistent_cache(name: str, maxsize: int = 1024, ttl: float = 60.0):
+    """
+    Build a cache that survives restarts when possible.
+    
+    Uses a ``DiskTTLCache`` under ``NIMO_CACHE_DIR/<name>`` when that variable
+    is set and ``diskcache`` is installed, otherwise an in-memory ``TTLCache``.
+    """
+    if CACHE_DIR:
+        if diskcache is not None:
+            return DiskTTLCache(os.path.join(CACHE_DIR, name), ttl=ttl)
+        logger.warning("NIMO_CACHE_DIR is set but diskcache is not installed; "
+                       "keeping the %s cache in memory", name)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
+
+
+class RedisTTLCache:
+    """``TTLCache`` lookalike stored in Redis under ``<namespace>:<key>``.
+
+    Entries are shared by every worker and host pointed at the same server,
+    so one worker's read or invalidation is seen by all of them. Values are
+    stored as JSON (stdlib ``json``, since token amounts overflow the 64-bit
+    integers ``orjson`` supports). Redis errors are logged and treated as
+    cache misses so an outage only costs the cache, never the request.
+    """
+
+    def __init__(self, client, namespace: str, ttl: float = 60.0):
+        self.ttl = ttl
+        self.namespace = namespace
+        self._client = client
+
+    def _key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ':'.join([self.namespace, *map(str, parts)])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired"""
+        try:
+            raw = self._client.get(self._key(key))
+        except RedisError as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return default
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, optionally overriding the default TTL"""
+        ttl = self.ttl if ttl is None else ttl
+        expire_ms = None if ttl == float('inf') else max(1, int(ttl * 1000))
+        try:
+            self._client.set(self._key(key), json.dumps(value), px=expire_ms)
+        except RedisError as e:
+            logger.warning("Redis cache write failed: %s", e)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value"""
+        try:
+            pipe = self._client.pipeline()
+            pipe.get(self._key(key))
+            pipe.delete(self._key(key))
+            raw, _ = pipe.execute()
+        except RedisError as e:
+            logger.warning("Redis cache delete failed: %s", e)
+            return default
+        return default if raw is None else json.loads(raw)
+
+    def clear(self) -> None:
+        """Drop every entry in this cache's namespace"""
+        try:
+            keys = list(self._client.scan_iter(match=f'{self.namespace}:*'))
+            if keys:
+                self._client.delete(*keys)
+        except RedisError as e:
+            logger.warning("Redis cache clear failed: %s", e)
+
+    def keys(self) -> list:
+        """Keys currently stored in this cache's namespace (single-part keys as strings)"""
+        prefix = len(self.namespace) + 1
+        try:
+            return [key.decode()[prefix:] for key in self._client.scan_iter(match=f'{self.namespace}:*')]
+        except RedisError as e:
+            logger.warning("Redis cache scan failed: %s", e)
+            return []
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self._client.scan_iter(match=f'{self.namespace}:*'))
+        except RedisError as e:
+            logger.warning("Redis cache scan failed: %s", e)
+            return 0
+
+
+_redis_client = None
+_redis_client_lock = threading.Lock()
+
+
+def get_redis_client():
+    """Process-wide Redis client for ``REDIS_URL`` (connections are pooled)"""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
+
+def shared_redis_client():
+    """Redis client when ``REDIS_URL`` is set and ``redis`` is installed, else None"""
+    if REDIS_URL and redis is not None:
+        return get_redis_client()
+    return None
+
+
+def shared_cache(name: str, maxsize: int = 1024, ttl: float = 60.0):
+    """
+    Build a cache shared by every worker when possible.
+    
+    Uses a ``RedisTTLCache`` in the ``nimo:<name>`` namespace when
+    ``REDIS_URL`` is set and ``redis`` is installed, otherwise an in-memory
+    ``TTLCache``.
+    """
+    if REDIS_URL:
+        if redis is not None:
+            return RedisTTLCache(get_redis_client(), f'nimo:{name}', ttl=ttl)
+        logger.warning("REDIS_URL is set but redis is not installed; "
+                       "keeping the %s cache in memory", name)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
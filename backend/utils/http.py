@@ -0,0 +1,144 @@
+"""
+HTTP utilities for Nimo Platform.
+Builds pooled ``requests`` sessions shared by the Web3 providers and raw
+JSON-RPC calls, so RPC traffic reuses keep-alive connections, and retries
+transient RPC failures behind a circuit breaker.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive connections kept open to each RPC endpoint
+RPC_POOL_SIZE = int(os.getenv('RPC_POOL_SIZE', 32))
+
+# Seconds to wait for an RPC response; public Base endpoints can be slow
+RPC_TIMEOUT = int(os.getenv('RPC_TIMEOUT', 15))
+
+
+def create_rpc_session(pool_size: int = RPC_POOL_SIZE) -> requests.Session:
+    """Create a pooled HTTP session with retries for RPC calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # JSON-RPC is all POSTs, so let gateway errors be retried for them too
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'}
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Process-wide session, so every RPC client in a worker shares one pool
+_rpc_session = None
+_rpc_session_lock = threading.Lock()
+
+
+def get_rpc_session() -> requests.Session:
+    """
+    Get the shared RPC session for this process.
+    
+    Use one session (and so one Web3 ``HTTPProvider`` connection pool) per
+    process rather than one per client, so connections to an endpoint are
+    reused by every service instead of each paying its own TLS handshakes.
+    """
+    global _rpc_session
+    
+    if _rpc_session is None:
+        with _rpc_session_lock:
+            if _rpc_session is None:
+                _rpc_session = create_rpc_session()
+    
+    return _rpc_session
+
+
+class RPCUnavailableError(RuntimeError):
+    """Raised instead of calling an RPC endpoint whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint for ``reset_timeout`` seconds after repeated failures.
+
+    Once ``failure_threshold`` consecutive calls fail, the breaker opens and
+    calls are refused until the timeout passes; the next call is then let
+    through as a probe, and a success closes the breaker again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through right now"""
+        return time.monotonic() >= self._open_until
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.reset_timeout
+                logger.warning("RPC circuit open for %ss after %d failures",
+                               self.reset_timeout, self._failures)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an RPC error is worth retrying (network trouble, 429 or 5xx)"""
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status == 429 or (status is not None and status >= 500)
+    return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              ConnectionError, TimeoutError))
+
+
+def call_with_retry(fn: Callable[..., Any], *args: Any,
+                    breaker: CircuitBreaker = None,
+                    max_attempts: int = 3,
+                    base_delay: float = 0.1,
+                    **kwargs: Any) -> Any:
+    """
+    Call ``fn(*args, **kwargs)``, retrying transient RPC errors with
+    exponential backoff and jitter.
+    
+    Non-transient errors are raised at once. With a ``breaker``, calls are
+    refused with ``RPCUnavailableError`` while it is open.
+    """
+    for attempt in range(max_attempts):
+        if breaker is not None and not breaker.allow():
+            raise RPCUnavailableError("RPC endpoint is failing; try again shortly")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if not _is_transient(e):
+                raise
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(base_delay * (2 ** attempt) * (1 + random.random()))
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
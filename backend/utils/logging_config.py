@@ -3,14 +3,46 @@ Comprehensive logging configuration for Nimo Platform.
 Sets up structured logging with proper levels, formatting, and handlers.
 """
 
+import atexit
+import copy
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
 from typing import Dict, Any
 import json
 
+# Background listener draining the root logger's queue (see setup_logging)
+_queue_listener = None
+
+
+def _stop_queue_listener():
+    """Flush queued log records on interpreter shutdown"""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+
+atexit.register(_stop_queue_listener)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves exception formatting to the listener's handlers.
+    
+    The stock ``prepare()`` renders the record into ``msg`` and clears
+    ``exc_info``, so ``JSONFormatter`` would lose its ``exception`` field.
+    Only the message arguments are merged here, since they could change
+    before the listener thread formats the record.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
@@ -105,6 +137,9 @@ def setup_logging(
     if enable_file_logging:
         os.makedirs(log_dir, exist_ok=True)
     
+    # Never let a failing handler raise into request code
+    logging.raiseExceptions = False
+    
     # Root logger configuration
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
@@ -113,6 +148,16 @@ def setup_logging(
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
+    # Stop the listener from a previous setup_logging() call
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    
+    # Output handlers are written to from a background thread; request
+    # threads only enqueue records (see QueueHandler below)
+    root_handlers = []
+    
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
@@ -123,7 +168,7 @@ def setup_logging(
         console_formatter = ContextualFormatter()
     
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    root_handlers.append(console_handler)
     
     # File handlers
     if enable_file_logging:
@@ -135,7 +180,7 @@ def setup_logging(
         )
         app_handler.setLevel(numeric_level)
         app_handler.setFormatter(console_formatter)
-        root_logger.addHandler(app_handler)
+        root_handlers.append(app_handler)
         
         # Error log (ERROR and CRITICAL only)
         error_handler = logging.handlers.RotatingFileHandler(
@@ -145,7 +190,7 @@ def setup_logging(
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(console_formatter)
-        root_logger.addHandler(error_handler)
+        root_handlers.append(error_handler)
         
         # Security log
         security_handler = logging.handlers.RotatingFileHandler(
@@ -162,6 +207,14 @@ def setup_logging(
         security_logger.addHandler(security_handler)
         security_logger.setLevel(logging.WARNING)
     
+    # Hand records to a queue so console/file I/O never blocks a request thread
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(_QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *root_handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    
     # Configure specific logger levels
     logger_configs = {
         'nimo': numeric_level,
@@ -179,7 +232,8 @@ def setup_logging(
         logger = logging.getLogger(logger_name)
         logger.setLevel(level)
     
-    logging.info(f"Logging configured - Level: {log_level}, File logging: {enable_file_logging}, JSON: {enable_json_logging}")
+    logging.info("Logging configured - Level: %s, File logging: %s, JSON: %s",
+                 log_level, enable_file_logging, enable_json_logging)
 
 class LogContext:
     """Context manager for adding contextual information to logs"""
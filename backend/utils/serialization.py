@@ -0,0 +1,39 @@
+"""
+orjson-based JSON encoding helpers for Nimo Platform.
+Builds JSON responses directly from encoded bytes instead of going
+through the stdlib ``json`` module and ``jsonify``.
+"""
+
+import decimal
+from typing import Any
+
+import orjson
+from flask import current_app
+
+# Allow integer dict keys (e.g. ``{user_id: ...}``) the way stdlib json does.
+# datetime/date/UUID values are encoded natively (ISO 8601 for datetimes), so
+# routes can return them without calling ``.isoformat()`` first.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Convert the types orjson does not handle natively, like Flask does"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` to JSON bytes"""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+def json_response(payload: Any, status: int = 200):
+    """Build a JSON response without going through ``jsonify``"""
+    return current_app.response_class(
+        dumps_bytes(payload),
+        status=status,
+        mimetype='application/json'
+    )
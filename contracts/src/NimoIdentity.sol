@@ -66,6 +66,7 @@ contract NimoIdentity is ERC721, AccessControl, ReentrancyGuard {
     
     // Events
     event IdentityCreated(uint256 indexed tokenId, string username, address owner);
+    event IdentitiesCreated(address[] owners, uint256[] tokenIds);
     event ContributionAdded(uint256 indexed contributionId, uint256 indexed identityId, string contributionType);
     event ContributionVerified(uint256 indexed contributionId, address verifier, uint256 tokensAwarded);
     event TokensAwarded(uint256 indexed identityId, uint256 amount, string reason);
@@ -86,10 +87,41 @@ contract NimoIdentity is ERC721, AccessControl, ReentrancyGuard {
      * @param metadataURI IPFS URI containing identity metadata
      */
     function createIdentity(string memory username, string memory metadataURI) external {
+        _createIdentity(username, metadataURI, msg.sender);
+    }
+    
+    /**
+     * @dev Create identities for several users in one transaction (only MeTTa agents can call)
+     * @param usernames Unique usernames for the identities
+     * @param metadataURIs IPFS URIs containing identity metadata
+     * @param owners Addresses that receive the identity NFTs
+     */
+    function batchCreateIdentity(
+        string[] calldata usernames,
+        string[] calldata metadataURIs,
+        address[] calldata owners
+    ) external onlyRole(METTA_AGENT_ROLE) {
+        uint256 count = usernames.length;
+        require(metadataURIs.length == count && owners.length == count, "Array length mismatch");
+        
+        uint256[] memory tokenIds = new uint256[](count);
+        for (uint256 i = 0; i < count; ) {
+            tokenIds[i] = _createIdentity(usernames[i], metadataURIs[i], owners[i]);
+            unchecked { ++i; }
+        }
+        
+        emit IdentitiesCreated(owners, tokenIds);
+    }
+    
+    function _createIdentity(
+        string memory username,
+        string memory metadataURI,
+        address owner
+    ) internal returns (uint256 tokenId) {
         require(usernameToTokenId[username] == 0, "Username already exists");
-        require(addressToTokenId[msg.sender] == 0, "Address already has identity");
+        require(addressToTokenId[owner] == 0, "Address already has identity");
         
-        uint256 tokenId = _nextTokenId++;
+        tokenId = _nextTokenId++;
         
         identities[tokenId] = Identity({
             username: username,
@@ -101,11 +133,11 @@ contract NimoIdentity is ERC721, AccessControl, ReentrancyGuard {
         });
         
         usernameToTokenId[username] = tokenId;
-        addressToTokenId[msg.sender] = tokenId;
+        addressToTokenId[owner] = tokenId;
         
-        _safeMint(msg.sender, tokenId);
+        _safeMint(owner, tokenId);
         
-        emit IdentityCreated(tokenId, username, msg.sender);
+        emit IdentityCreated(tokenId, username, owner);
     }
     
     /**
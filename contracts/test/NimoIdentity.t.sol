@@ -89,6 +89,45 @@ contract NimoIdentityTest is Test {
         vm.stopPrank();
     }
     
+    function testBatchIdentityCreation() public {
+        string[] memory usernames = new string[](2);
+        usernames[0] = "batchuser1";
+        usernames[1] = "batchuser2";
+        string[] memory uris = new string[](2);
+        uris[0] = "ipfs://batch-1";
+        uris[1] = "ipfs://batch-2";
+        address[] memory owners = new address[](2);
+        owners[0] = user1;
+        owners[1] = user2;
+        
+        // Every batch-created identity is announced like a single one
+        vm.expectEmit(true, true, true, true);
+        emit IdentityCreated(1, "batchuser1", user1);
+        vm.expectEmit(true, true, true, true);
+        emit IdentityCreated(2, "batchuser2", user2);
+        
+        vm.prank(mettaAgent);
+        nimoIdentity.batchCreateIdentity(usernames, uris, owners);
+        
+        assertEq(nimoIdentity.ownerOf(1), user1);
+        assertEq(nimoIdentity.ownerOf(2), user2);
+        assertEq(nimoIdentity.addressToTokenId(user2), 2);
+        assertEq(nimoIdentity.getIdentity(2).username, "batchuser2");
+    }
+    
+    function testOnlyMeTTaAgentCanBatchCreateIdentities() public {
+        string[] memory usernames = new string[](1);
+        usernames[0] = "batchuser";
+        string[] memory uris = new string[](1);
+        uris[0] = "ipfs://batch";
+        address[] memory owners = new address[](1);
+        owners[0] = user1;
+        
+        vm.prank(user1);
+        vm.expectRevert();
+        nimoIdentity.batchCreateIdentity(usernames, uris, owners);
+    }
+    
     function testContributionSubmission() public {
         // Create identity first
         vm.prank(user1);